@@ -1,12 +1,22 @@
 # car.py
 import pygame
-import numpy as np
 from constants import (
     CAR_LENGTH, CAR_WIDTH, MAX_VELOCITY, MIN_VELOCITY,
     MAX_ACCELERATION, MAX_DECELERATION, NPC_COLOR
 )
 
 class Car:
+    # Fixed attribute layout: no per-car __dict__, and attribute access
+    # stays cheap for populations of hundreds of cars. Subclasses list
+    # their own attributes the same way.
+    __slots__ = (
+        'x', 'relative_x', 'y', 'target_y',
+        'left_boundary', 'right_boundary', 'top_boundary', 'bottom_boundary',
+        'velocity', 'acceleration',
+        'is_changing_lanes', 'collision', 'is_active',
+        'color', 'width', 'length', '_rect'
+    )
+
     def __init__(self, x, y):
         """
         Initialize a car with position and physics properties.
@@ -40,6 +50,9 @@ class Car:
         self.color = NPC_COLOR
         self.width = CAR_WIDTH
         self.length = CAR_LENGTH
+        
+        # Collision rectangle, reused by every get_rect call
+        self._rect = pygame.Rect(0, 0, 0, 0)
 
     def check_boundaries(self):
         """Check if car is outside screen boundaries"""
@@ -58,9 +71,9 @@ class Car:
         Args:
             world_offset (float): Current world offset for position calculations
         """
-        # Update velocity with acceleration
-        self.velocity += self.acceleration
-        self.velocity = np.clip(self.velocity, MIN_VELOCITY, MAX_VELOCITY)
+        # Update velocity with acceleration; plain float clamping, np.clip
+        # costs far more than the arithmetic on a single value
+        self.velocity = min(max(self.velocity + self.acceleration, MIN_VELOCITY), MAX_VELOCITY)
         
         # Update relative position (actual position in world)
         self.relative_x += self.velocity
@@ -79,7 +92,7 @@ class Car:
             amount (float): Acceleration amount (-1 to 1)
         """
         # Clamp acceleration input
-        amount = np.clip(amount, -1, 1)
+        amount = min(max(amount, -1), 1)
         
         # Apply acceleration based on whether we're speeding up or slowing down
         if amount >= 0:
@@ -106,20 +119,25 @@ class Car:
                 self.y = target_y  # Snap to exact position
                 self.is_changing_lanes = False
             else:
-                direction = np.sign(diff)
-                self.y += direction * speed
+                self.y += speed if diff > 0 else -speed
         else:
             self.y = target_y  # Ensure exact positioning
             self.is_changing_lanes = False
                 
     def get_rect(self):
-        """Get collision rectangle"""
-        return pygame.Rect(
+        """
+        Get collision rectangle.
+        
+        The car's one rectangle is updated in place, so it only holds the
+        current position until the car moves again.
+        """
+        self._rect.update(
             self.x - self.length/2,  # Center the rectangle on the car's screen position
             self.y - self.width/2,
             self.length,
             self.width
         )
+        return self._rect
         
     def draw(self, screen):
         """Draw the car on the screen"""
@@ -0,0 +1,327 @@
+# champion_eval.py
+import os
+import sys
+
+# Champions are always evaluated without a window
+os.environ['FREEWAY_HEADLESS'] = '1'
+
+import csv
+import hashlib
+import multiprocessing
+import pickle
+import sqlite3
+import neat
+import numpy as np
+from constants import SCREEN_HEIGHT, SHOULDER_WIDTH, SIM_DT
+from traffic_manager import TrafficManager
+from ai_input_processor import BatchInputProcessor
+from evaluation import create_ai_cars, step_world, load_config, _init_worker, MAX_FRAMES
+from telemetry import CAUSES
+
+DEFAULT_CACHE_PATH = 'champion_cache.sqlite'
+DEFAULT_LEADERBOARD_PATH = 'leaderboard.csv'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scenario_results (
+    genome_hash TEXT NOT NULL,
+    seed INTEGER NOT NULL,
+    max_frames INTEGER NOT NULL,
+    survived INTEGER NOT NULL,
+    distance REAL NOT NULL,
+    frames_alive INTEGER NOT NULL,
+    cause TEXT,
+    PRIMARY KEY (genome_hash, seed, max_frames)
+);
+"""
+
+def genome_hash(genome):
+    """
+    Fingerprint of a genome's network, independent of its id and fitness.
+
+    Returns:
+        str: sha1 hex digest of the node and connection genes
+    """
+    digest = hashlib.sha1()
+    for key in sorted(genome.nodes):
+        node = genome.nodes[key]
+        digest.update(repr((key, node.bias, node.response, node.activation,
+                            node.aggregation)).encode())
+    for key in sorted(genome.connections):
+        connection = genome.connections[key]
+        digest.update(repr((key, connection.weight, connection.enabled)).encode())
+    return digest.hexdigest()
+
+def scenario_seeds(num_scenarios, bank_seed=0):
+    """
+    The scenario bank, one traffic seed per scenario.
+
+    Growing num_scenarios keeps the earlier seeds, so cached results stay
+    usable when the bank is extended.
+    """
+    return [int(seed) for seed in np.random.SeedSequence(bank_seed).generate_state(num_scenarios)]
+
+def run_scenario(genome, config, seed, max_frames=MAX_FRAMES):
+    """
+    Drive one genome alone through one seeded traffic world.
+
+    Args:
+        genome: NEAT genome
+        config: NEAT config
+        seed (int): Traffic seed of the scenario
+        max_frames (int): Frames the car has to survive
+
+    Returns:
+        dict: survived, distance, frames_alive and cause of death (None if
+        the car survived)
+    """
+    road_top = SHOULDER_WIDTH
+    road_bottom = SCREEN_HEIGHT - SHOULDER_WIDTH
+
+    ai_cars = create_ai_cars([(0, genome)], config, road_top, road_bottom)
+    car = ai_cars[0]
+    traffic_manager = TrafficManager(road_top, road_bottom, seed=seed)
+    traffic_manager.spawn_initial_traffic()
+    input_processor = BatchInputProcessor(1)
+
+    best_car = None
+    frames_alive = 0
+    for frame in range(max_frames):
+        best_car, active = step_world(ai_cars, traffic_manager, input_processor, SIM_DT, best_car)
+        if not active:
+            break
+        frames_alive += 1
+
+    return {
+        'survived': car.is_active,
+        'distance': float(car.total_distance),
+        'frames_alive': frames_alive,
+        'cause': None if car.is_active else car.death_cause
+    }
+
+def _run_scenario_task(task):
+    """Pool entry point, unpacks the arguments for run_scenario"""
+    key, genome, config, seed, max_frames = task
+    return key, seed, run_scenario(genome, config, seed, max_frames)
+
+class ChampionCache:
+    """
+    SQLite cache of scenario results keyed by (genome hash, seed, max_frames),
+    so re-running a comparison only simulates new pairs.
+    """
+    def __init__(self, path=DEFAULT_CACHE_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        with self.conn:
+            self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def lookup(self, key, seeds, max_frames):
+        """
+        Returns:
+            dict: seed -> result for the seeds already simulated
+        """
+        rows = self.conn.execute(
+            'SELECT seed, survived, distance, frames_alive, cause FROM scenario_results '
+            'WHERE genome_hash = ? AND max_frames = ?',
+            (key, max_frames)
+        )
+        wanted = set(seeds)
+        return {
+            row['seed']: {
+                'survived': bool(row['survived']),
+                'distance': row['distance'],
+                'frames_alive': row['frames_alive'],
+                'cause': row['cause']
+            }
+            for row in rows if row['seed'] in wanted
+        }
+
+    def store(self, results, max_frames):
+        """Write many (genome hash, seed, result) triples in one transaction"""
+        with self.conn:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO scenario_results '
+                '(genome_hash, seed, max_frames, survived, distance, frames_alive, cause) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                [(key, seed, max_frames, int(result['survived']), result['distance'],
+                  result['frames_alive'], result['cause']) for key, seed, result in results]
+            )
+
+def load_champion(path, config_path):
+    """
+    Load a genome to evaluate.
+
+    A checkpoint contributes its fittest genome and its own config; any
+    other file is read as a pickled genome such as winner.pkl, run with the
+    config at config_path.
+
+    Returns:
+        tuple: (genome, NEAT config)
+    """
+    with open(path, 'rb') as f:
+        is_checkpoint = f.read(2) == b'\x1f\x8b'  # Checkpoints are gzipped
+
+    if is_checkpoint:
+        population = neat.Checkpointer.restore_checkpoint(path)
+        genomes = list(population.population.values())
+        scored = [genome for genome in genomes if genome.fitness is not None]
+        genome = max(scored, key=lambda genome: genome.fitness) if scored else genomes[0]
+        return genome, population.config
+
+    with open(path, 'rb') as f:
+        genome = pickle.load(f)
+    config, _ = load_config(config_path)
+    return genome, config
+
+def summarize(name, key, results):
+    """
+    Aggregate one champion's scenario results into a leaderboard row.
+
+    Average speed is distance per frame alive, in pixels per frame.
+    """
+    distance = np.array([result['distance'] for result in results], dtype=float)
+    frames_alive = np.array([result['frames_alive'] for result in results], dtype=float)
+    survived = np.array([result['survived'] for result in results], dtype=bool)
+
+    row = {
+        'name': name,
+        'genome_hash': key[:12],
+        'scenarios': len(results),
+        'survival_rate': float(survived.mean()),
+        'mean_distance': float(distance.mean()),
+        'p10_distance': float(np.percentile(distance, 10)),
+        'median_distance': float(np.percentile(distance, 50)),
+        'p90_distance': float(np.percentile(distance, 90)),
+        'avg_speed': float(distance.sum() / max(frames_alive.sum(), 1))
+    }
+    for cause in CAUSES:
+        row[cause] = sum(1 for result in results if result['cause'] == cause)
+    return row
+
+def evaluate_champions(paths, config_path, num_scenarios=100, num_workers=None,
+                       max_frames=MAX_FRAMES, bank_seed=0, cache_path=DEFAULT_CACHE_PATH):
+    """
+    Run every champion over the scenario bank and rank them.
+
+    Args:
+        paths (list): winner.pkl style genome files and/or checkpoints
+        config_path (str): Config for plain genome files
+        num_scenarios (int): Size of the scenario bank
+        num_workers (int): Worker processes, defaults to the CPU count
+        max_frames (int): Frames a car has to survive in each scenario
+        bank_seed (int): Seed the scenario bank is derived from
+        cache_path (str): SQLite file caching scenario results
+
+    Returns:
+        list: Leaderboard rows, best first
+    """
+    seeds = scenario_seeds(num_scenarios, bank_seed)
+    champions = []
+    for path in paths:
+        genome, config = load_champion(path, config_path)
+        champions.append((os.path.basename(path), genome_hash(genome), genome, config))
+
+    with ChampionCache(cache_path) as cache:
+        results = {}
+        tasks = []
+        queued = set()
+        for name, key, genome, config in champions:
+            if key in results:
+                continue
+            results[key] = cache.lookup(key, seeds, max_frames)
+            for seed in seeds:
+                if seed not in results[key] and (key, seed) not in queued:
+                    queued.add((key, seed))
+                    tasks.append((key, genome, config, seed, max_frames))
+
+        cached = sum(len(seed_results) for seed_results in results.values())
+        print(f"Simulating {len(tasks)} scenarios ({cached} cached)")
+
+        if tasks:
+            num_workers = num_workers or multiprocessing.cpu_count()
+            if num_workers > 1:
+                pool = multiprocessing.Pool(num_workers, initializer=_init_worker)
+                new_results = pool.map(_run_scenario_task, tasks)
+                pool.close()
+                pool.join()
+            else:
+                _init_worker()
+                new_results = [_run_scenario_task(task) for task in tasks]
+
+            cache.store(new_results, max_frames)
+            for key, seed, result in new_results:
+                results[key][seed] = result
+
+    leaderboard = [summarize(name, key, [results[key][seed] for seed in seeds])
+                   for name, key, genome, config in champions]
+    leaderboard.sort(key=lambda row: (row['survival_rate'], row['mean_distance']), reverse=True)
+    return leaderboard
+
+def write_leaderboard(leaderboard, path=DEFAULT_LEADERBOARD_PATH):
+    """Write the leaderboard to a CSV file, one row per champion"""
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=['rank'] + list(leaderboard[0]))
+        writer.writeheader()
+        for rank, row in enumerate(leaderboard, 1):
+            writer.writerow({'rank': rank, **row})
+
+def print_leaderboard(leaderboard):
+    print(f"\n{'#':>3}  {'Champion':<24} {'Survival':>8} {'Mean':>9} {'P10':>9} "
+          f"{'P90':>9} {'Speed':>6}  Deaths")
+    for rank, row in enumerate(leaderboard, 1):
+        deaths = ', '.join(f"{cause}={row[cause]}" for cause in CAUSES if row[cause])
+        print(f"{rank:>3}  {row['name']:<24} {row['survival_rate']:>8.1%} "
+              f"{row['mean_distance']:>9.0f} {row['p10_distance']:>9.0f} "
+              f"{row['p90_distance']:>9.0f} {row['avg_speed']:>6.2f}  {deaths or '-'}")
+
+if __name__ == '__main__':
+    # Setup paths
+    local_dir = os.path.dirname(__file__)
+    config_path = os.path.join(local_dir, "config.txt")
+
+    # Genome files and checkpoints to compare, followed by any options
+    # e.g. winner.pkl freeway-checkpoint-* -scenarios 200 -workers 8 -out leaderboard.csv
+    # -frames 2000 sets how long a car has to survive, -seed picks the scenario bank
+    # -cache champion_cache.sqlite keeps results so only new pairs are simulated
+    num_scenarios = 100
+    num_workers = None
+    max_frames = MAX_FRAMES
+    bank_seed = 0
+    out_path = DEFAULT_LEADERBOARD_PATH
+    cache_path = DEFAULT_CACHE_PATH
+    args = sys.argv[1:]
+    first_flag = next((i for i, arg in enumerate(args) if arg.startswith('-')), len(args))
+    paths, args = args[:first_flag], args[first_flag:]
+    for flag, value in zip(args[::2], args[1::2]):
+        if flag == '-scenarios':
+            num_scenarios = int(value)
+        elif flag == '-workers':
+            num_workers = int(value)
+        elif flag == '-frames':
+            max_frames = int(value)
+        elif flag == '-seed':
+            bank_seed = int(value)
+        elif flag == '-out':
+            out_path = value
+        elif flag == '-cache':
+            cache_path = value
+        elif flag == '-config':
+            config_path = value
+
+    if not paths:
+        paths = [os.path.join(local_dir, 'winner.pkl')]
+
+    leaderboard = evaluate_champions(paths, config_path, num_scenarios, num_workers,
+                                     max_frames, bank_seed, cache_path)
+    print_leaderboard(leaderboard)
+    write_leaderboard(leaderboard, out_path)
+    print(f"\nLeaderboard written to {out_path}")
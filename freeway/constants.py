@@ -1,33 +1,45 @@
 # constants.py
 # Base/reference resolution with widescreen aspect ratio for better forward visibility
+import os
 import pygame
+
+# Headless runs (FREEWAY_HEADLESS=1) never open a window and always use the
+# base resolution, so the world is the same size on every machine
+HEADLESS = os.environ.get('FREEWAY_HEADLESS') == '1'
+if HEADLESS:
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
 pygame.init()
 
-# Get current screen info
-screen_info = pygame.display.Info()
 MARGIN = 100  # Margin from screen edges
 
 # Base resolution targets (widescreen for better forward visibility)
 BASE_WIDTH = 1920
 BASE_HEIGHT = 1080
 
-# Calculate available space
-available_width = screen_info.current_w - MARGIN
-available_height = screen_info.current_h - MARGIN
-
-# Use whichever is smaller: base size or available space
-SCREEN_WIDTH = min(BASE_WIDTH, available_width)
-SCREEN_HEIGHT = min(BASE_HEIGHT, available_height)
-
 # Window title
 GAME_TITLE = "AutoDrive"
 
-# Center the window
-os_x_pos = (screen_info.current_w - SCREEN_WIDTH) // 2
-os_y_pos = (screen_info.current_h - SCREEN_HEIGHT) // 2
-import os
-os.environ['SDL_VIDEO_WINDOW_POS'] = f"{os_x_pos},{os_y_pos}"
-SCREEN = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+if HEADLESS:
+    SCREEN_WIDTH = BASE_WIDTH
+    SCREEN_HEIGHT = BASE_HEIGHT
+    SCREEN = None
+else:
+    # Get current screen info
+    screen_info = pygame.display.Info()
+    
+    # Calculate available space
+    available_width = screen_info.current_w - MARGIN
+    available_height = screen_info.current_h - MARGIN
+    
+    # Use whichever is smaller: base size or available space
+    SCREEN_WIDTH = min(BASE_WIDTH, available_width)
+    SCREEN_HEIGHT = min(BASE_HEIGHT, available_height)
+    
+    # Center the window
+    os_x_pos = (screen_info.current_w - SCREEN_WIDTH) // 2
+    os_y_pos = (screen_info.current_h - SCREEN_HEIGHT) // 2
+    os.environ['SDL_VIDEO_WINDOW_POS'] = f"{os_x_pos},{os_y_pos}"
+    SCREEN = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 
 # Colors
 ROAD_COLOR = (40, 40, 40)        # Dark grey
@@ -38,9 +50,12 @@ SHOULDER_COLOR = (150, 150, 150) # Light grey
 
 # Game settings
 FPS = 60
+SIM_DT = 1 / FPS  # Seconds per simulation frame; velocities are in pixels per frame
 
 # Road configuration
-NUM_LANES = 4
+# FREEWAY_NUM_LANES overrides the lane count, e.g. for traffic_benchmark.py's
+# lane sweep. Trained networks expect the default of 4.
+NUM_LANES = int(os.environ.get('FREEWAY_NUM_LANES', 4))
 LANE_WIDTH = SCREEN_HEIGHT // (NUM_LANES + 1)  # Extra space for shoulders
 SHOULDER_WIDTH = LANE_WIDTH
 
@@ -78,6 +93,12 @@ REWARD_SPEED_MULTIPLIER = 1.0  # This will multiply by current_speed / MAX_VELOC
 
 # Input preprocessing
 MAX_VISION_DISTANCE = SCREEN_WIDTH * 0.8  # How far ahead AI can see
+
+# NPCs further than this along the road from every AI car coast at constant
+# velocity with their decisions frozen; None runs full behaviour everywhere.
+# Covers the vision range plus the widest NPC following reach, so cars are
+# already driving normally by the time an AI car can see them.
+NPC_LOD_RADIUS = MAX_VISION_DISTANCE + MIN_NPC_FOLLOWING_DISTANCE * 3
 DISTANCE_BUCKETS = 10  # Number of distance divisions for input normalization
 
 # Debug visualization
@@ -0,0 +1,351 @@
+# dashboard.py
+import asyncio
+import base64
+import collections
+import hashlib
+import json
+import struct
+import threading
+import time
+
+# Magic string every WebSocket handshake hashes the client key with (RFC 6455)
+WEBSOCKET_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Freeway training</title>
+<style>
+  body { background: #1e1e1e; color: #ddd; font-family: sans-serif; margin: 20px; }
+  .charts { display: grid; grid-template-columns: repeat(auto-fit, minmax(460px, 1fr)); gap: 16px; }
+  .chart { background: #2a2a2a; padding: 10px; }
+  h1 { font-size: 20px; } h2 { font-size: 14px; margin: 0 0 6px 0; }
+  #status { color: #8c8; }
+  canvas { width: 100%; height: 220px; }
+</style>
+</head>
+<body>
+<h1>Freeway training <span id="status">connecting...</span></h1>
+<div class="charts">
+  <div class="chart"><h2>Fitness per generation (max, mean)</h2><canvas id="fitness"></canvas></div>
+  <div class="chart"><h2>Distance per generation (max, mean)</h2><canvas id="distance"></canvas></div>
+  <div class="chart"><h2>Species sizes</h2><canvas id="species"></canvas></div>
+  <div class="chart"><h2>Cars alive this generation</h2><canvas id="alive"></canvas></div>
+  <div class="chart"><h2>World frames per second (all workers)</h2><canvas id="fps"></canvas></div>
+</div>
+<script>
+const COLORS = ['#4fc3f7', '#ffb74d', '#81c784', '#e57373', '#ba68c8', '#fff176', '#90a4ae'];
+const generations = [];
+let frames = [];
+
+function drawChart(id, xs, series) {
+  const canvas = document.getElementById(id);
+  const width = canvas.width = canvas.clientWidth;
+  const height = canvas.height = canvas.clientHeight;
+  const ctx = canvas.getContext('2d');
+  ctx.clearRect(0, 0, width, height);
+  const values = series.flat().filter(v => v !== undefined);
+  if (xs.length < 1 || values.length < 1) return;
+  const minX = xs[0], maxX = Math.max(xs[xs.length - 1], minX + 1);
+  const minY = Math.min(0, ...values), maxY = Math.max(...values, minY + 1e-9);
+  const px = x => 40 + (x - minX) / (maxX - minX) * (width - 50);
+  const py = y => height - 20 - (y - minY) / (maxY - minY) * (height - 30);
+  ctx.fillStyle = '#888';
+  ctx.fillText(maxY.toFixed(2), 2, 12);
+  ctx.fillText(minY.toFixed(2), 2, height - 20);
+  ctx.fillText(String(minX), 40, height - 5);
+  ctx.fillText(String(maxX), width - 40, height - 5);
+  series.forEach((ys, i) => {
+    ctx.strokeStyle = COLORS[i % COLORS.length];
+    ctx.beginPath();
+    ys.forEach((y, j) => {
+      if (y === undefined) return;
+      if (j === 0) ctx.moveTo(px(xs[j]), py(y)); else ctx.lineTo(px(xs[j]), py(y));
+    });
+    ctx.stroke();
+  });
+}
+
+function render() {
+  const xs = generations.map(g => g.generation);
+  drawChart('fitness', xs, [generations.map(g => g.max_fitness), generations.map(g => g.mean_fitness)]);
+  drawChart('distance', xs, [generations.map(g => g.max_distance), generations.map(g => g.mean_distance)]);
+  const numSpecies = Math.max(0, ...generations.map(g => g.species_sizes.length));
+  const species = [];
+  for (let i = 0; i < numSpecies; i++) species.push(generations.map(g => g.species_sizes[i]));
+  drawChart('species', xs, species);
+  const fxs = frames.map(f => f.frame);
+  drawChart('alive', fxs, [frames.map(f => f.alive)]);
+  drawChart('fps', fxs, [frames.map(f => f.fps)]);
+}
+
+function connect() {
+  const socket = new WebSocket(`ws://${location.host}/ws`);
+  socket.onopen = () => document.getElementById('status').textContent = 'live';
+  socket.onclose = () => {
+    document.getElementById('status').textContent = 'disconnected, retrying...';
+    setTimeout(connect, 2000);
+  };
+  socket.onmessage = event => {
+    for (const message of JSON.parse(event.data)) {
+      if (message.type === 'generation') {
+        generations.push(message);
+      } else if (message.type === 'history') {
+        generations.length = 0;
+        generations.push(...message.generations);
+        frames = message.frames;
+      } else if (message.type === 'frame') {
+        if (frames.length && message.frame < frames[frames.length - 1].frame) frames = [];
+        frames.push(message);
+      }
+    }
+    render();
+  };
+}
+connect();
+window.onresize = render;
+</script>
+</body>
+</html>
+"""
+
+class Dashboard:
+    def __init__(self, port=8765, host='127.0.0.1', sample_hz=4, queue_size=4096):
+        """
+        Live training dashboard served over HTTP and WebSocket from a
+        background asyncio thread.
+
+        The trainer only appends messages to a bounded deque, whose append
+        and popleft are atomic, so the hot path never waits on a lock or on
+        the network. The server thread drains the deque a few times per
+        second and broadcasts to every open page. Bound to localhost unless
+        host says otherwise, e.g. '0.0.0.0' to watch from the LAN.
+
+        Args:
+            port (int): Port to serve on
+            host (str): Interface to bind
+            sample_hz (float): Per-frame counters sent per second
+            queue_size (int): Messages buffered before the oldest are dropped
+        """
+        self.port = port
+        self.host = host
+        self.sample_interval = 1.0 / sample_hz
+        self.queue = collections.deque(maxlen=queue_size)
+
+        # Frame rate between samples, measured on the trainer thread
+        self._last_sample_time = time.perf_counter()
+        self._last_sample_frame = 0
+
+        # Owned by the server thread
+        self._generations = []
+        self._frames = collections.deque(maxlen=2000)
+        self._clients = set()
+        self._handlers = set()
+        self._loop = None
+        self._stop = None
+        self._thread = None
+
+    def start(self):
+        """Start serving in a daemon thread"""
+        started = threading.Event()
+        self._thread = threading.Thread(target=self._serve, args=(started,), daemon=True)
+        self._thread.start()
+        started.wait()
+        if self._stop is None:
+            print(f"Dashboard could not start on {self.host}:{self.port}, training without it")
+        else:
+            print(f"Dashboard on http://{self.host}:{self.port}/")
+
+    def stop(self):
+        """Stop the server thread"""
+        if self._loop and self._stop:
+            self._loop.call_soon_threadsafe(self._stop.set)
+            self._thread.join(timeout=2)
+
+    def sample_frame(self, frame, alive):
+        """
+        Offer the per-frame counters; only a few per second are sent.
+
+        Args:
+            frame (int): Frame of the current generation
+            alive (int): AI cars still driving
+        """
+        now = time.perf_counter()
+        if frame < self._last_sample_frame:
+            # New generation
+            self._last_sample_frame = 0
+        elapsed = now - self._last_sample_time
+        if elapsed < self.sample_interval:
+            return
+        fps = (frame - self._last_sample_frame) / elapsed
+        self._last_sample_time = now
+        self._last_sample_frame = frame
+        self.queue.append({'type': 'frame', 'frame': frame, 'alive': alive, 'fps': round(fps, 1)})
+
+    def record_frames(self, alive, fps, max_points=200):
+        """
+        Queue a whole generation's per-frame counters at once, for trainers
+        that only see them after the generation, e.g. from worker processes.
+
+        Args:
+            alive (list): AI cars still driving in every frame
+            fps (float): World frames run per second over the generation,
+                summed over every world and worker
+            max_points (int): Frames sent at most, evenly spaced
+        """
+        step = max(1, -(-len(alive) // max_points))
+        for index in range(0, len(alive), step):
+            self.queue.append({'type': 'frame', 'frame': index + 1, 'alive': int(alive[index]),
+                               'fps': round(fps, 1)})
+
+    def record_generation(self, generation, fitness, distance, species_sizes):
+        """
+        Queue one generation's stats.
+
+        Args:
+            generation (int): Generation number
+            fitness (list): Final fitness of every genome
+            distance (list): Distance driven by every genome
+            species_sizes (list): Members of each species
+        """
+        self.queue.append({
+            'type': 'generation',
+            'generation': generation,
+            'max_fitness': max(fitness),
+            'mean_fitness': sum(fitness) / len(fitness),
+            'max_distance': max(distance),
+            'mean_distance': sum(distance) / len(distance),
+            'species_sizes': list(species_sizes)
+        })
+
+    def _serve(self, started):
+        asyncio.run(self._main(started))
+
+    async def _main(self, started):
+        try:
+            server = await asyncio.start_server(self._handle, self.host, self.port)
+        except OSError:
+            started.set()
+            return
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        started.set()
+        async with server:
+            while not self._stop.is_set():
+                await self._broadcast()
+                try:
+                    await asyncio.wait_for(self._stop.wait(), self.sample_interval)
+                except asyncio.TimeoutError:
+                    pass
+        # Send what is left, then hang up on open pages and let their handlers finish
+        await self._broadcast()
+        for writer in list(self._clients):
+            writer.close()
+        if self._handlers:
+            await asyncio.wait(self._handlers, timeout=1)
+
+    async def _broadcast(self):
+        """Drain the queue into the history and send it to every client"""
+        messages = []
+        while self.queue:
+            message = self.queue.popleft()
+            if message['type'] == 'generation':
+                self._generations.append(message)
+            else:
+                # New pages only get the current generation's frames
+                if self._frames and message['frame'] < self._frames[-1]['frame']:
+                    self._frames.clear()
+                self._frames.append(message)
+            messages.append(message)
+        if messages and self._clients:
+            frame = _websocket_frame(json.dumps(messages))
+            for writer in list(self._clients):
+                await self._send(writer, frame)
+
+    async def _send(self, writer, data):
+        try:
+            writer.write(data)
+            await writer.drain()
+        except (ConnectionError, RuntimeError):
+            self._clients.discard(writer)
+
+    async def _handle(self, reader, writer):
+        """Serve the page, or upgrade /ws requests to a WebSocket"""
+        task = asyncio.current_task()
+        self._handlers.add(task)
+        task.add_done_callback(self._handlers.discard)
+        try:
+            request = await reader.readuntil(b'\r\n\r\n')
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            writer.close()
+            return
+        lines = request.decode('latin-1').split('\r\n')
+        path = lines[0].split(' ')[1] if len(lines[0].split(' ')) > 1 else '/'
+        headers = {}
+        for line in lines[1:]:
+            if ':' in line:
+                name, value = line.split(':', 1)
+                headers[name.strip().lower()] = value.strip()
+
+        if path == '/ws' and 'sec-websocket-key' in headers:
+            await self._handle_websocket(reader, writer, headers['sec-websocket-key'])
+            return
+
+        if path == '/':
+            body = PAGE.encode()
+            status = '200 OK'
+            content_type = 'text/html; charset=utf-8'
+        else:
+            body = b'Not found'
+            status = '404 Not Found'
+            content_type = 'text/plain'
+        writer.write(f'HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n'
+                     f'Content-Length: {len(body)}\r\nConnection: close\r\n\r\n'.encode() + body)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+        writer.close()
+
+    async def _handle_websocket(self, reader, writer, key):
+        accept = base64.b64encode(hashlib.sha1((key + WEBSOCKET_GUID).encode()).digest()).decode()
+        writer.write(('HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\n'
+                      f'Connection: Upgrade\r\nSec-WebSocket-Accept: {accept}\r\n\r\n').encode())
+
+        # Catch the new page up before it joins the broadcast
+        history = {'type': 'history', 'generations': self._generations, 'frames': list(self._frames)}
+        await self._send(writer, _websocket_frame(json.dumps([history])))
+        self._clients.add(writer)
+
+        # Pages never send anything we need; read until they close
+        try:
+            while True:
+                header = await reader.readexactly(2)
+                opcode = header[0] & 0x0F
+                length = header[1] & 0x7F
+                if length == 126:
+                    length = struct.unpack('!H', await reader.readexactly(2))[0]
+                elif length == 127:
+                    length = struct.unpack('!Q', await reader.readexactly(8))[0]
+                if header[1] & 0x80:
+                    length += 4  # Masking key
+                await reader.readexactly(length)
+                if opcode == 0x8:  # Close
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        self._clients.discard(writer)
+        writer.close()
+
+def _websocket_frame(text):
+    """Encode text as a single unmasked WebSocket text frame"""
+    payload = text.encode()
+    length = len(payload)
+    if length < 126:
+        header = struct.pack('!BB', 0x81, length)
+    elif length < 1 << 16:
+        header = struct.pack('!BBH', 0x81, 126, length)
+    else:
+        header = struct.pack('!BBQ', 0x81, 127, length)
+    return header + payload
@@ -0,0 +1,369 @@
+# evaluation.py
+import configparser
+import multiprocessing
+import os
+import shutil
+import time
+import neat
+import numpy as np
+from constants import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, SHOULDER_WIDTH, NUM_LANES,
+    BASE_REWARD_PER_FRAME, MAX_VELOCITY, SIM_DT
+)
+from player_car import PlayerCar
+from traffic_manager import TrafficManager
+from ai_input_processor import BatchInputProcessor, get_input_size, get_output_size
+from population_network import PopulationNetwork
+from telemetry import telemetry
+from traffic_tape import TrafficTape, TapeTraffic, ensure_tape, tape_path
+
+MAX_FRAMES = 2000  # Frames a generation is allowed to run for
+
+SEED_SCHEDULES = ('fixed', 'per_generation', 'per_world')
+
+class SeedSchedule:
+    def __init__(self, mode='per_generation', seed=None):
+        """
+        Picks the traffic seed of every world in every generation.
+
+        fixed: every world in every generation replays the same traffic
+        per_generation: new traffic each generation, shared by all of its
+            worlds, so every genome faces the same cars (common random numbers)
+        per_world: every world gets its own traffic
+
+        Args:
+            mode (str): One of SEED_SCHEDULES
+            seed (int): Root seed. A random one is drawn and printed if None
+                so the run can be repeated.
+        """
+        if mode not in SEED_SCHEDULES:
+            raise ValueError(f"Unknown seed schedule: {mode}")
+        if seed is None:
+            seed = np.random.SeedSequence().entropy % 2**32
+            print(f"Traffic seed: {seed}")
+        self.mode = mode
+        self.seed = seed
+
+    @classmethod
+    def from_config(cls, section):
+        """
+        Build a schedule from the [Traffic] section of the config file.
+
+        Args:
+            section: configparser section, or None for the defaults
+        """
+        if section is None:
+            return cls()
+        seed = section.get('seed', 'none').strip().lower()
+        return cls(
+            section.get('seed_schedule', 'per_generation').strip(),
+            None if seed == 'none' else int(seed)
+        )
+
+    def world_seeds(self, generation, num_worlds):
+        """
+        Args:
+            generation (int): Generation being evaluated
+            num_worlds (int): Traffic worlds in the generation
+
+        Returns:
+            list: One seed per world
+        """
+        if self.mode == 'fixed':
+            return [self.seed] * num_worlds
+        sequence = np.random.SeedSequence([self.seed, generation])
+        if self.mode == 'per_generation':
+            return [int(sequence.generate_state(1)[0])] * num_worlds
+        return [int(child.generate_state(1)[0]) for child in sequence.spawn(num_worlds)]
+
+def load_config(config_path):
+    """
+    Read a freeway config file.
+
+    The [Traffic] section is split off for the seed schedule and the genome
+    input and output sizes are filled in from the sensor layout before NEAT
+    parses the rest.
+
+    Args:
+        config_path (str): NEAT config file
+
+    Returns:
+        tuple: (NEAT config, SeedSchedule)
+    """
+    config = configparser.ConfigParser()
+    config.read(config_path)
+
+    # Traffic settings are ours, not NEAT's
+    seed_schedule = SeedSchedule.from_config(
+        config['Traffic'] if config.has_section('Traffic') else None
+    )
+    config.remove_section('Traffic')
+
+    # Update the DefaultGenome section with calculated sizes
+    config['DefaultGenome']['num_inputs'] = str(get_input_size())
+    config['DefaultGenome']['num_outputs'] = str(get_output_size())
+
+    # Write the modified config to a temporary file
+    temp_config_path = f'temp_config_{os.getpid()}.txt'
+    with open(temp_config_path, 'w') as temp_config:
+        config.write(temp_config)
+
+    try:
+        neat_config = neat.Config(
+            neat.DefaultGenome,
+            neat.DefaultReproduction,
+            neat.DefaultSpeciesSet,
+            neat.DefaultStagnation,
+            temp_config_path
+        )
+    finally:
+        os.remove(temp_config_path)
+
+    return neat_config, seed_schedule
+
+def create_ai_cars(genomes, config, road_top, road_bottom):
+    """
+    Create AI cars with proper boundary initialization.
+
+    Args:
+        genomes (list): (genome_id, genome) pairs
+        config: NEAT config
+        road_top (float): Top edge of road
+        road_bottom (float): Bottom edge of road
+
+    Returns:
+        list: One PlayerCar per genome, genome fitness reset to 0
+    """
+    ai_cars = []
+
+    road_height = road_bottom - road_top
+    lane_height = road_height / NUM_LANES
+
+    for i, (genome_id, genome) in enumerate(genomes):
+        net = neat.nn.FeedForwardNetwork.create(genome, config)
+
+        # Calculate spawn position
+        lane = i % NUM_LANES
+        start_y = road_top + (lane * lane_height) + (lane_height / 2)
+        start_x = SCREEN_WIDTH * 0.2
+
+        # Create car with proper position
+        car = PlayerCar(start_x, start_y, brain=net)
+
+        # Set proper boundaries immediately
+        car.top_boundary = road_top
+        car.bottom_boundary = road_bottom
+        car.left_boundary = 0
+        car.right_boundary = SCREEN_WIDTH
+
+        # Store additional info
+        car.genome = genome
+        car.genome_id = genome_id
+        car.current_lane = lane
+
+        # Initialize genome fitness to 0
+        genome.fitness = 0.0  # Explicitly set to float
+
+        ai_cars.append(car)
+
+        if telemetry.active['spawn']:
+            telemetry.record('spawn', genome_id, car.x, car.y, car.velocity, lane)
+
+    return ai_cars
+
+def step_world(ai_cars, traffic_manager, input_processor, dt=SIM_DT, best_car=None, network=None):
+    """
+    Advance one traffic world by a single frame.
+
+    Args:
+        ai_cars (list): PlayerCars driving in this world
+        traffic_manager: TrafficManager of this world
+        input_processor: BatchInputProcessor used for the sensor inputs
+        dt (float): Time step in seconds
+        best_car: Best car from previous frames, if any
+        network: PopulationNetwork of the ai_cars' brains, in the same
+            order. Each car activates its own brain if None.
+
+    Returns:
+        tuple: (best car so far, number of cars that were active this frame)
+    """
+    # Update all active AI cars
+    rows = [i for i, car in enumerate(ai_cars) if car.is_active]
+    if not rows:
+        return best_car, 0
+    active_cars = [ai_cars[i] for i in rows]
+    max_fitness = best_car.genome.fitness if best_car else 0
+
+    # Sensor inputs for every active car in one batched pass
+    inputs = input_processor.compute(active_cars, traffic_manager)
+    if network is not None:
+        # Decisions of every active car in one batched pass too, clamped like think
+        controls = np.clip(network.activate(inputs, rows)[:, :2], -1, 1).tolist()
+        inputs = [None] * len(active_cars)
+    else:
+        controls = [None] * len(active_cars)
+        inputs = inputs.tolist()
+
+    for car, car_inputs, car_controls in zip(active_cars, inputs, controls):
+        # Update car
+        car.update(traffic_manager, dt, car_inputs, car_controls)
+
+        # Check for collisions
+        if traffic_manager.check_collision(car):
+            car.handle_collision()
+            car.is_active = False
+        else:
+            # Update genome fitness
+            speed_multiplier = car.velocity / MAX_VELOCITY
+            fitness_gain = BASE_REWARD_PER_FRAME * speed_multiplier * dt
+            car.genome.fitness += fitness_gain
+
+            # Track best performing car
+            if car.genome.fitness > max_fitness:
+                max_fitness = car.genome.fitness
+                best_car = car
+
+    # Use the best performing car as the reference for traffic
+    traffic_manager.update(dt, best_car if best_car else active_cars[0])
+
+    return best_car, len(active_cars)
+
+def run_world(genomes, config, seed=None, max_frames=MAX_FRAMES, tape_dir=None):
+    """
+    Drive a group of genomes through their own headless traffic world.
+
+    Args:
+        genomes (list): (genome_id, genome) pairs sharing the world
+        config: NEAT config
+        seed (int): Seed for the world's traffic
+        max_frames (int): Frames to run for at most
+        tape_dir (str): Replay the seed's recorded traffic tape from this
+            directory instead of simulating traffic that reacts to the cars
+
+    Returns:
+        tuple: (fitness, distance) arrays in the order of genomes, and the
+            number of cars still driving in every frame that was run
+    """
+    road_top = SHOULDER_WIDTH
+    road_bottom = SCREEN_HEIGHT - SHOULDER_WIDTH
+
+    ai_cars = create_ai_cars(genomes, config, road_top, road_bottom)
+    if tape_dir:
+        traffic_manager = TapeTraffic(TrafficTape(tape_path(tape_dir, seed, max_frames)))
+    else:
+        traffic_manager = TrafficManager(road_top, road_bottom, seed=seed)
+        traffic_manager.spawn_initial_traffic()
+    input_processor = BatchInputProcessor(len(ai_cars))
+    network = PopulationNetwork.create([car.brain for car in ai_cars])
+
+    best_car = None
+    alive = []
+    for frame in range(max_frames):
+        best_car, active = step_world(ai_cars, traffic_manager, input_processor, SIM_DT, best_car, network)
+        if not active:
+            break
+        alive.append(active)
+
+    fitness = np.array([car.genome.fitness for car in ai_cars], dtype=float)
+    distance = np.array([car.total_distance for car in ai_cars], dtype=float)
+    return fitness, distance, np.array(alive, dtype=int)
+
+def _run_world_task(task):
+    """Pool entry point, unpacks the arguments for run_world"""
+    genomes, config, seed, max_frames, tape_dir = task
+    return run_world(genomes, config, seed, max_frames, tape_dir)
+
+def _record_tape_task(task):
+    """Pool entry point, records one missing traffic tape"""
+    tape_dir, seed, max_frames = task
+    return ensure_tape(tape_dir, seed, max_frames)
+
+def _init_worker():
+    # Workers would append to the telemetry file concurrently; the parent
+    # keeps recording for the shared-world mode only
+    telemetry.configure(level='off')
+
+class ParallelEvaluator:
+    def __init__(self, num_workers=None, group_size=1, max_frames=MAX_FRAMES, seed_schedule=None,
+                 tape_dir=None):
+        """
+        Evaluates genomes in independent traffic worlds across worker processes.
+
+        Each group of group_size genomes gets its own seeded TrafficManager,
+        so no genome's traffic is anchored to another group's best car.
+
+        Args:
+            num_workers (int): Worker processes, defaults to the CPU count
+            group_size (int): Genomes sharing one traffic world
+            max_frames (int): Frames each world runs for at most
+            seed_schedule (SeedSchedule): Picks each world's traffic seed
+            tape_dir (str): Frozen-traffic mode. Traffic for each seed is
+                simulated once, ignoring the AI cars, and recorded here;
+                every world with that seed replays the memory-mapped tape.
+                Only the fixed seed schedule brings a seed back in later
+                generations, so with the others the tapes a generation
+                recorded are deleted once it has been evaluated.
+        """
+        self.num_workers = num_workers or multiprocessing.cpu_count()
+        self.group_size = max(1, group_size)
+        self.max_frames = max_frames
+        self.seed_schedule = seed_schedule or SeedSchedule()
+        self.tape_dir = tape_dir
+        self.pool = multiprocessing.Pool(self.num_workers, initializer=_init_worker)
+
+        # Per-frame counters of the last evaluate: cars alive summed over its
+        # worlds, and frames run per second summed over its worlds
+        self.alive = np.zeros(0, dtype=int)
+        self.frames_per_second = 0.0
+
+    def evaluate(self, genomes, config, generation=0):
+        """
+        Evaluate every genome and set its fitness.
+
+        Args:
+            genomes (list): (genome_id, genome) pairs
+            config: NEAT config
+            generation (int): Generation being evaluated, for the seed schedule
+
+        Returns:
+            tuple: (fitness, distance) arrays in the order of genomes
+        """
+        groups = [genomes[i:i + self.group_size] for i in range(0, len(genomes), self.group_size)]
+        seeds = self.seed_schedule.world_seeds(generation, len(groups))
+        new_tapes = []
+        if self.tape_dir:
+            # Record each distinct seed's tape once, in parallel
+            tape_seeds = sorted(set(seeds))
+            paths = [tape_path(self.tape_dir, seed, self.max_frames) for seed in tape_seeds]
+            new_tapes = [path for path in paths if not os.path.exists(os.path.join(path, 'meta.json'))]
+            self.pool.map(_record_tape_task, [(self.tape_dir, seed, self.max_frames) for seed in tape_seeds])
+        tasks = [(group, config, seed, self.max_frames, self.tape_dir)
+                 for group, seed in zip(groups, seeds)]
+
+        # Timed without the tape recording, so the frame rate is the evaluation's alone
+        start = time.perf_counter()
+        results = self.pool.map(_run_world_task, tasks)
+        elapsed = time.perf_counter() - start
+        if self.seed_schedule.mode != 'fixed':
+            # This generation's seeds won't come back, so its tapes would only pile up
+            for path in new_tapes:
+                shutil.rmtree(path, ignore_errors=True)
+        fitness = np.concatenate([group_fitness for group_fitness, _, _ in results])
+        distance = np.concatenate([group_distance for _, group_distance, _ in results])
+
+        # Cars alive in every frame across all worlds, and world frames run per second by all workers
+        self.alive = np.zeros(max(len(world_alive) for _, _, world_alive in results), dtype=int)
+        for _, _, world_alive in results:
+            self.alive[:len(world_alive)] += world_alive
+        world_frames = sum(len(world_alive) for _, _, world_alive in results)
+        self.frames_per_second = world_frames / max(elapsed, 1e-9)
+
+        # Workers scored copies of the genomes
+        for (genome_id, genome), genome_fitness in zip(genomes, fitness.tolist()):
+            genome.fitness = genome_fitness
+
+        return fitness, distance
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
@@ -0,0 +1,74 @@
+# event_scheduler.py
+import heapq
+import itertools
+
+class EventScheduler:
+    def __init__(self):
+        """
+        Priority queue of timed events keyed by simulation time.
+
+        Each key has at most one pending event. Rescheduling or cancelling
+        leaves the old heap entry behind; it is skipped when it surfaces, so
+        both stay O(log n) and advancing the clock only touches the events
+        that are due.
+        """
+        self.time = 0.0
+        self._heap = []
+        self._pending = {}  # key -> time of its live event
+        self._order = itertools.count()  # Breaks ties in scheduling order, keys are never compared
+
+    def __contains__(self, key):
+        """Whether key has an event still to come"""
+        return key in self._pending
+
+    def __len__(self):
+        return len(self._pending)
+
+    def due_time(self, key):
+        """Simulation time of key's pending event, or None"""
+        return self._pending.get(key)
+
+    def schedule(self, key, delay):
+        """
+        Schedule key's event delay seconds from now, replacing any pending one.
+
+        Args:
+            key: Hashable event key, e.g. a car or a (direction, lane) pair
+            delay (float): Seconds from the current simulation time
+        """
+        self.schedule_at(key, self.time + delay)
+
+    def schedule_at(self, key, time):
+        """Schedule key's event at an absolute simulation time"""
+        self._pending[key] = time
+        heapq.heappush(self._heap, (time, next(self._order), key))
+
+    def cancel(self, key):
+        """Drop key's pending event, if any"""
+        self._pending.pop(key, None)
+
+    def clear(self):
+        """Drop every event and restart the clock"""
+        self.time = 0.0
+        self._heap.clear()
+        self._pending.clear()
+
+    def advance(self, dt):
+        """
+        Move the clock forward and collect the events now due.
+
+        Args:
+            dt (float): Time step in seconds
+
+        Returns:
+            list: Keys whose events are due, earliest first
+        """
+        self.time += dt
+        due = []
+        heap = self._heap
+        while heap and heap[0][0] <= self.time:
+            time, _, key = heapq.heappop(heap)
+            if self._pending.get(key) == time:
+                del self._pending[key]
+                due.append(key)
+        return due
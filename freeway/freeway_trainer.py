@@ -1,55 +1,60 @@
 # freeway_trainer.py
+import os
+import sys
+
+# Headless mode has to be chosen before constants.py sets up the display.
+# Parallel evaluation never draws, and spawned workers inherit the setting.
+if '-headless' in sys.argv or '-workers' in sys.argv:
+    os.environ['FREEWAY_HEADLESS'] = '1'
+
 import pygame
 import neat
-import configparser
 import numpy as np
 import pickle
 from constants import (
-    SCREEN_WIDTH, SCREEN_HEIGHT, FPS, GAME_TITLE,
-    BASE_REWARD_PER_FRAME, COLLISION_PENALTY, MAX_VELOCITY,
-    NUM_LANES
+    SCREEN_WIDTH, SCREEN_HEIGHT, GAME_TITLE,
+    SHOULDER_WIDTH, SIM_DT, HEADLESS
 )
-from player_car import PlayerCar
 from traffic_manager import TrafficManager
 from game_visualizer import GameVisualizer
-from ai_input_processor import get_car_inputs, get_input_size, get_output_size
-import os
-import sys
+from ai_input_processor import BatchInputProcessor
+from evaluation import (
+    create_ai_cars, step_world, ParallelEvaluator, load_config, MAX_FRAMES
+)
+from telemetry import telemetry
+from dashboard import Dashboard
+from population_network import PopulationNetwork
 
 class FreewayTrainer:
-    def __init__(self, config_path, checkpoint_file=None):
-        """Initialize the training environment"""
-        pygame.init()
-        pygame.display.set_caption(f"{GAME_TITLE} - AI Training")
-        
-        # Calculate input size dynamically
-        input_size = get_input_size()
-        output_size = get_output_size()
+    def __init__(self, config_path, checkpoint_file=None, headless=HEADLESS,
+                 workers=0, group_size=1, max_drawn_cars=None, render_every=1, tape_dir=None,
+                 dashboard=None):
+        """
+        Initialize the training environment.
         
-        # Read and modify the config file
-        config = configparser.ConfigParser()
-        config.read(config_path)
-        
-        # Update the DefaultGenome section with calculated sizes
-        config['DefaultGenome']['num_inputs'] = str(input_size)
-        config['DefaultGenome']['num_outputs'] = str(output_size)
-        
-        # Write the modified config to a temporary file
-        temp_config_path = 'temp_config.txt'
-        with open(temp_config_path, 'w') as temp_config:
-            config.write(temp_config)
-        
-        # Initialize NEAT with modified config
-        self.config = neat.Config(
-            neat.DefaultGenome,
-            neat.DefaultReproduction,
-            neat.DefaultSpeciesSet,
-            neat.DefaultStagnation,
-            temp_config_path
-        )
+        Args:
+            config_path (str): NEAT config file
+            checkpoint_file (str): Checkpoint to resume from
+            headless (bool): Run without a window or frame limiter. Every
+                frame advances the simulation by SIM_DT either way, so
+                fitness does not depend on how fast the machine is.
+            workers (int): Worker processes for evaluation. With workers,
+                each group of group_size genomes drives in its own seeded
+                traffic world and nothing is drawn.
+            group_size (int): Genomes sharing one traffic world with workers
+            tape_dir (str): With workers, replay frozen traffic tapes kept in
+                this directory instead of traffic that reacts to the cars
+            max_drawn_cars (int): Draw only the fittest few AI cars
+            render_every (int): Draw and limit the frame rate only every Nth
+                frame, simulating the frames in between at full speed
+            dashboard (Dashboard): Live dashboard fed with generation stats
+                and sampled frame counters
+        """
+        pygame.init()
+        self.headless = headless
         
-        # Clean up temporary config file
-        os.remove(temp_config_path)
+        # NEAT config with the sensor layout's input and output sizes
+        self.config, self.seed_schedule = load_config(config_path)
         
         # Load checkpoint or create new population
         if checkpoint_file and os.path.exists(checkpoint_file):
@@ -67,65 +72,40 @@ class FreewayTrainer:
         )
         
         # Initialize game components
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        self.visualizer = GameVisualizer(self.screen)
+        self.road_top = SHOULDER_WIDTH
+        self.road_bottom = SCREEN_HEIGHT - SHOULDER_WIDTH
+        if self.headless:
+            self.screen = None
+            self.visualizer = None
+        else:
+            pygame.display.set_caption(f"{GAME_TITLE} - AI Training")
+            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+            self.visualizer = GameVisualizer(self.screen, max_drawn_cars, render_every)
+        self.input_processor = BatchInputProcessor(self.config.pop_size)
+        self.evaluator = None
+        self.dashboard = dashboard
+        if workers:
+            self.evaluator = ParallelEvaluator(workers, group_size, seed_schedule=self.seed_schedule,
+                                               tape_dir=tape_dir)
         
     def create_ai_cars(self, genomes, config):
         """Create AI cars with proper boundary initialization"""
-        ai_cars = []
-        
-        road_height = self.visualizer.road_bottom - self.visualizer.road_top
-        lane_height = road_height / NUM_LANES
-        
-        for i, (genome_id, genome) in enumerate(genomes):
-            net = neat.nn.FeedForwardNetwork.create(genome, config)
-            
-            # Calculate spawn position
-            lane = i % NUM_LANES
-            start_y = self.visualizer.road_top + (lane * lane_height) + (lane_height / 2)
-            start_x = SCREEN_WIDTH * 0.2
-            
-            # Create car with proper position
-            car = PlayerCar(start_x, start_y, brain=net)
-            
-            # Set proper boundaries immediately
-            car.top_boundary = self.visualizer.road_top
-            car.bottom_boundary = self.visualizer.road_bottom
-            car.left_boundary = 0
-            car.right_boundary = SCREEN_WIDTH
-            
-            # Store additional info
-            car.genome = genome
-            car.genome_id = genome_id
-            car.current_lane = lane
-            
-            # Initialize genome fitness to 0
-            genome.fitness = 0.0  # Explicitly set to float
-            
-            ai_cars.append(car)
-            
-            # Debug output
-            print(f"\nCar {genome_id} created:")
-            print(f"Position: ({car.x}, {car.y})")
-            print(f"Lane: {lane}")
-            print(f"Boundaries: top={car.top_boundary}, bottom={car.bottom_boundary}")
-        
-        return ai_cars
+        return create_ai_cars(genomes, config, self.road_top, self.road_bottom)
     
     def eval_genomes(self, genomes, config):
         """Evaluate all genomes in the current generation"""
+        if self.evaluator:
+            return self.eval_genomes_parallel(genomes, config)
+        
         # Create AI cars for all genomes
         ai_cars = self.create_ai_cars(genomes, config)
         
         # Initialize game state
-        traffic_manager = TrafficManager(
-            self.visualizer.road_top,
-            self.visualizer.road_bottom
-        )
+        seed = self.seed_schedule.world_seeds(self.population.generation, 1)[0]
+        traffic_manager = TrafficManager(self.road_top, self.road_bottom, seed=seed)
         traffic_manager.spawn_initial_traffic()
+        network = PopulationNetwork.create([car.brain for car in ai_cars])
         
-        # Training parameters
-        max_frames = 2000
         frame_count = 0
         
         # Track maximum fitness and distance for visualization
@@ -134,57 +114,45 @@ class FreewayTrainer:
         best_car = None
         
         # Game loop
-        while frame_count < max_frames and any(car.is_active for car in ai_cars):
+        while frame_count < MAX_FRAMES:
             frame_count += 1
+            telemetry.set_frame(frame_count)
             
-            # Get delta time
-            dt = self.visualizer.update_fps() / 1000.0
-            
-            # Handle events
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
+            # Fixed timestep; the window only limits how often frames are drawn
+            dt = SIM_DT
+            render = not self.headless and self.visualizer.is_render_frame(frame_count)
+            if render:
+                self.visualizer.update_fps()
+                
+                # Handle events
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        pygame.quit()
+                        sys.exit()
             
-            # Update all active AI cars
-            active_cars = [car for car in ai_cars if car.is_active]
+            # Update all active AI cars and the traffic around them
+            best_car, active = step_world(ai_cars, traffic_manager, self.input_processor, dt, best_car,
+                                          network)
             
             # If all cars are inactive, break the loop
-            if not active_cars:
+            if not active:
                 break
-                
-            for car in active_cars:
-                # Update car
-                car.update(traffic_manager, dt)
-                
-                # Check for collisions
-                if traffic_manager.check_collision(car):
-                    car.handle_collision()
-                    car.is_active = False
-                else:
-                    # Update genome fitness
-                    speed_multiplier = car.velocity / MAX_VELOCITY
-                    fitness_gain = BASE_REWARD_PER_FRAME * speed_multiplier * dt
-                    car.genome.fitness += fitness_gain
-                    
-                    # Track best performing car
-                    if car.genome.fitness > max_fitness:
-                        max_fitness = car.genome.fitness
-                        max_distance = car.total_distance
-                        best_car = car
             
-            # Update traffic manager with active cars
-            if active_cars:
-                # Use the best performing car as the reference for traffic
-                traffic_manager.update(dt, best_car if best_car else active_cars[0])
+            if self.dashboard:
+                self.dashboard.sample_frame(frame_count, active)
+            
+            if best_car:
+                max_fitness = best_car.genome.fitness
+                max_distance = best_car.total_distance
             
             # Visualize current state
-            self.visualizer.draw_frame(
-                ai_cars,
-                traffic_manager,
-                max_fitness,
-                max_distance
-            )
+            if render:
+                self.visualizer.draw_frame(
+                    ai_cars,
+                    traffic_manager,
+                    max_fitness,
+                    max_distance
+                )
         
         # Ensure all genomes have their final fitness values
         for car in ai_cars:
@@ -192,6 +160,30 @@ class FreewayTrainer:
                 car.genome.fitness = 0
             
         print(f"Generation complete. Max fitness: {max_fitness:.2f}")
+        telemetry.flush()
+        self.publish_generation(
+            [car.genome.fitness for car in ai_cars],
+            [car.total_distance for car in ai_cars]
+        )
+    
+    def eval_genomes_parallel(self, genomes, config):
+        """Evaluate genomes in independent traffic worlds on the worker pool"""
+        fitness, distance = self.evaluator.evaluate(genomes, config, self.population.generation)
+        best = int(np.argmax(fitness))
+        print(f"Generation complete. Max fitness: {fitness[best]:.2f}, "
+              f"distance: {distance[best]:.0f}, mean fitness: {fitness.mean():.2f}")
+        self.publish_generation(fitness.tolist(), distance.tolist())
+        if self.dashboard:
+            self.dashboard.record_frames(self.evaluator.alive, self.evaluator.frames_per_second)
+    
+    def publish_generation(self, fitness, distance):
+        """Send the generation's stats to the dashboard, if there is one"""
+        if not self.dashboard or not fitness:
+            return
+        species_sizes = [len(species.members)
+                         for species in self.population.species.species.values()]
+        self.dashboard.record_generation(self.population.generation, fitness, distance,
+                                         species_sizes)
     
     def run(self, generations=50):
         """Run the training process"""
@@ -207,6 +199,10 @@ class FreewayTrainer:
         except KeyboardInterrupt:
             print("\nTraining interrupted by user")
         finally:
+            if self.evaluator:
+                self.evaluator.close()
+            if self.dashboard:
+                self.dashboard.stop()
             pygame.quit()
 
 if __name__ == '__main__':
@@ -214,11 +210,52 @@ if __name__ == '__main__':
     local_dir = os.path.dirname(__file__)
     config_path = os.path.join(local_dir, "config.txt")
     
-    # Get checkpoint file if specified
+    # Get checkpoint file and telemetry settings if specified
+    # e.g. -checkpoint freeway-checkpoint-9 -log-level debug -telemetry events.jsonl
+    # -headless runs without a window as fast as the CPU allows
+    # -workers 8 -group-size 5 evaluates groups of 5 genomes in their own worlds on 8 processes
+    # -draw-cars 10 -render-every 4 draws the 10 fittest cars on every 4th frame
+    # -tape traffic_tapes replays frozen traffic recorded once per seed (needs -workers). Tapes are
+    #   only reused with seed_schedule = fixed; other schedules delete each generation's new tapes
+    # -dashboard 8765 serves live charts on localhost:8765, -dashboard-host 0.0.0.0 shares them on the LAN
     checkpoint_file = None
-    if len(sys.argv) > 2 and sys.argv[1] == '-checkpoint':
-        checkpoint_file = sys.argv[2]
+    workers = 0
+    group_size = 1
+    max_drawn_cars = None
+    render_every = 1
+    tape_dir = None
+    dashboard_port = None
+    dashboard_host = '127.0.0.1'
+    args = [arg for arg in sys.argv[1:] if arg != '-headless']
+    for flag, value in zip(args[::2], args[1::2]):
+        if flag == '-checkpoint':
+            checkpoint_file = value
+        elif flag == '-workers':
+            workers = int(value)
+        elif flag == '-group-size':
+            group_size = int(value)
+        elif flag == '-draw-cars':
+            max_drawn_cars = int(value)
+        elif flag == '-render-every':
+            render_every = int(value)
+        elif flag == '-tape':
+            tape_dir = value
+        elif flag == '-log-level':
+            telemetry.configure(level=value)
+        elif flag == '-telemetry':
+            telemetry.configure(path=value)
+        elif flag == '-dashboard':
+            dashboard_port = int(value)
+        elif flag == '-dashboard-host':
+            dashboard_host = value
+    
+    dashboard = None
+    if dashboard_port:
+        dashboard = Dashboard(dashboard_port, dashboard_host)
+        dashboard.start()
     
     # Create and run trainer
-    trainer = FreewayTrainer(config_path, checkpoint_file)
+    trainer = FreewayTrainer(config_path, checkpoint_file, workers=workers, group_size=group_size,
+                             max_drawn_cars=max_drawn_cars, render_every=render_every,
+                             tape_dir=tape_dir, dashboard=dashboard)
     trainer.run(generations=50)
\ No newline at end of file
@@ -7,8 +7,17 @@ from constants import (
 )
 
 class GameVisualizer:
-    def __init__(self, screen):
-        """Initialize the game visualizer"""
+    def __init__(self, screen, max_drawn_cars=None, render_every=1):
+        """
+        Initialize the game visualizer.
+        
+        Args:
+            screen: pygame display surface
+            max_drawn_cars (int): Draw only this many of the fittest active
+                AI cars, all of them if None
+            render_every (int): Draw only every Nth simulation frame, see
+                is_render_frame
+        """
         self.screen = screen
         self.clock = pygame.time.Clock()
         self.current_fps = 0
@@ -44,58 +53,94 @@ class GameVisualizer:
             label = self.debug_font.render(f"Lane {i+1}", True, LANE_COLOR)
             self.lane_labels.append(label)
         
+        # Level of detail
+        self.max_drawn_cars = max_drawn_cars
+        self.render_every = max(1, render_every)
+        
+        # Static road, drawn once and scrolled every frame
+        self._build_road()
+        
         # Current state
         self.is_paused = False
         
-    def _draw_road(self):
-        """Draw the road, shoulders, and lane markers"""
-        # Clear screen and draw shoulders
-        self.screen.fill(SHOULDER_COLOR)
+    def _build_road(self):
+        """
+        Bake the static road into surfaces once.
         
-        # Draw each lane with slightly different shading
+        The road tile is one dash period wider than the screen so blitting
+        it shifted left by lane_offset scrolls the markers seamlessly. Lane
+        labels stay put, so they live on a separate overlay.
+        """
+        period = self.lane_marker_length + self.lane_marker_gap
+        tile_width = SCREEN_WIDTH + period
+        self.road_tile = pygame.Surface((tile_width, SCREEN_HEIGHT)).convert()
+        
+        # Shoulders
+        self.road_tile.fill(SHOULDER_COLOR)
+        
+        # Each lane with slightly different shading
         lane_height = (self.road_bottom - self.road_top) / NUM_LANES
         for lane in range(NUM_LANES):
             lane_rect = pygame.Rect(
                 0,
                 self.road_top + (lane * lane_height),
-                SCREEN_WIDTH,
+                tile_width,
                 lane_height
             )
-            pygame.draw.rect(self.screen, self.lane_colors[lane], lane_rect)
-            
-            # Draw lane label
-            label = self.lane_labels[lane]
-            label_rect = label.get_rect(
-                left=10,
-                centery=self.road_top + (lane * lane_height) + (lane_height / 2)
-            )
-            pygame.draw.rect(self.screen, (0, 0, 0, 128), label_rect)
-            self.screen.blit(label, label_rect)
+            pygame.draw.rect(self.road_tile, self.lane_colors[lane], lane_rect)
         
-        # Draw dashed lane markers
+        # Dashed lane markers
         for lane in range(1, NUM_LANES):
             y = self.road_top + (lane * lane_height)
-            marker_x = -self.lane_offset
-            while marker_x < SCREEN_WIDTH:
+            for marker_x in range(0, tile_width, period):
                 pygame.draw.line(
-                    self.screen,
+                    self.road_tile,
                     LANE_COLOR,
                     (marker_x, y),
                     (marker_x + self.lane_marker_length, y),
                     self.lane_marker_width
                 )
-                marker_x += self.lane_marker_length + self.lane_marker_gap
         
-        # Draw solid edge lines
+        # Solid edge lines
         edge_width = 4
-        pygame.draw.line(self.screen, LANE_COLOR, (0, self.road_top), 
-                        (SCREEN_WIDTH, self.road_top), edge_width)
-        pygame.draw.line(self.screen, LANE_COLOR, (0, self.road_bottom), 
-                        (SCREEN_WIDTH, self.road_bottom), edge_width)
+        pygame.draw.line(self.road_tile, LANE_COLOR, (0, self.road_top),
+                        (tile_width, self.road_top), edge_width)
+        pygame.draw.line(self.road_tile, LANE_COLOR, (0, self.road_bottom),
+                        (tile_width, self.road_bottom), edge_width)
+        
+        # Lane labels on a transparent overlay just wide enough for them
+        label_rects = []
+        for lane, label in enumerate(self.lane_labels):
+            label_rects.append(label.get_rect(
+                left=10,
+                centery=self.road_top + (lane * lane_height) + (lane_height / 2)
+            ))
+        overlay_width = max(rect.right for rect in label_rects)
+        self.label_overlay = pygame.Surface((overlay_width, SCREEN_HEIGHT), pygame.SRCALPHA)
+        for label, label_rect in zip(self.lane_labels, label_rects):
+            pygame.draw.rect(self.label_overlay, (0, 0, 0), label_rect)
+            self.label_overlay.blit(label, label_rect)
+    
+    def _draw_road(self):
+        """Draw the road, shoulders, and lane markers"""
+        self.screen.blit(self.road_tile, (-self.lane_offset, 0))
+        self.screen.blit(self.label_overlay, (0, 0))
         
-        # Update animation offset
-        self.lane_offset = (self.lane_offset + self.lane_marker_speed) % (
+        # Update animation offset by every simulation frame since the last draw
+        self.lane_offset = (self.lane_offset + self.lane_marker_speed * self.render_every) % (
             self.lane_marker_length + self.lane_marker_gap)
+    
+    def is_render_frame(self, frame):
+        """Whether simulation frame number frame should be drawn"""
+        return frame % self.render_every == 0
+    
+    def _cars_to_draw(self, cars):
+        """Active AI cars to draw, at most max_drawn_cars of the fittest, best last"""
+        active_cars = [car for car in cars if car.is_active]
+        if self.max_drawn_cars is None or len(active_cars) <= self.max_drawn_cars:
+            return active_cars
+        active_cars.sort(key=lambda car: car.genome.fitness)
+        return active_cars[-self.max_drawn_cars:]
         
     def _draw_score(self, score, distance):
         """Draw score and distance information"""
@@ -241,10 +286,9 @@ class GameVisualizer:
         self._draw_road()
         traffic_manager.draw(self.screen)
         
-        # Draw all active cars
-        for car in cars:
-            if car.is_active:
-                car.draw(self.screen)
+        # Draw the active cars the level of detail allows
+        for car in self._cars_to_draw(cars):
+            car.draw(self.screen)
         
         self._draw_score(score, distance)
         self._draw_speed_indicator(cars)
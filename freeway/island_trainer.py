@@ -0,0 +1,384 @@
+# island_trainer.py
+import os
+import sys
+
+# Islands never draw; spawned island processes inherit the setting
+os.environ['FREEWAY_HEADLESS'] = '1'
+
+import copy
+import json
+import multiprocessing
+import pickle
+import random
+from itertools import count
+import neat
+import numpy as np
+from evaluation import load_config, run_world, SeedSchedule, MAX_FRAMES
+from telemetry import telemetry
+
+TOPOLOGIES = ('ring', 'random')
+
+class IslandReporter(neat.reporting.BaseReporter):
+    def __init__(self, index, top_k):
+        """
+        Keeps copies of an island's fittest genomes for migration and prints
+        one line per generation instead of the full StdOutReporter output.
+
+        Args:
+            index (int): Island number, used in the printed lines
+            top_k (int): Genomes to keep
+        """
+        self.index = index
+        self.top_k = top_k
+        self.generation = 0
+        self.top = []
+
+    def start_generation(self, generation):
+        self.generation = generation
+
+    def post_evaluate(self, config, population, species, best_genome):
+        ranked = sorted(population.values(), key=lambda genome: genome.fitness, reverse=True)
+        self.top = [copy.deepcopy(genome) for genome in ranked[:self.top_k]]
+        fitness = [genome.fitness for genome in population.values()]
+        print(f"Island {self.index} generation {self.generation}: "
+              f"best {max(fitness):.2f}, mean {np.mean(fitness):.2f}, "
+              f"species {len(species.species)}")
+
+class Island:
+    def __init__(self, index, config_path, seed, top_k=2, group_size=None,
+                 max_frames=MAX_FRAMES, checkpoint_file=None):
+        """
+        One independently evolving population.
+
+        Args:
+            index (int): Island number
+            config_path (str): NEAT config of this island
+            seed (int): Root traffic seed of this island
+            top_k (int): Genomes sent to other islands per migration
+            group_size (int): Genomes sharing one traffic world, the whole
+                population if None
+            max_frames (int): Frames each world runs for at most
+            checkpoint_file (str): Island checkpoint to resume from
+        """
+        self.index = index
+        config, seed_schedule = load_config(config_path)
+        self.seed_schedule = SeedSchedule(seed_schedule.mode, seed)
+        self.group_size = group_size
+        self.max_frames = max_frames
+
+        if checkpoint_file:
+            self.population = neat.Checkpointer.restore_checkpoint(checkpoint_file)
+            # A restored population's genome keys start over at 1
+            self.population.reproduction.genome_indexer = count(max(self.population.population) + 1)
+        else:
+            self.population = neat.Population(config)
+        self.config = self.population.config
+
+        self.reporter = IslandReporter(index, top_k)
+        self.population.add_reporter(self.reporter)
+
+    def eval_genomes(self, genomes, config):
+        """Drive each group of genomes through its own headless traffic world"""
+        group_size = self.group_size or len(genomes)
+        groups = [genomes[i:i + group_size] for i in range(0, len(genomes), group_size)]
+        seeds = self.seed_schedule.world_seeds(self.population.generation, len(groups))
+        for group, seed in zip(groups, seeds):
+            run_world(group, config, seed, self.max_frames)
+
+    def evolve(self, generations):
+        """Run NEAT for a number of generations"""
+        self.population.run(self.eval_genomes, generations)
+
+    def receive(self, migrants):
+        """
+        Swap migrants in for freshly bred genomes.
+
+        Only unevaluated children are replaced, so elites carried over from
+        the last generation survive. Migrants get new keys, connection
+        innovation numbers consistent with this island and node keys the
+        island will not hand out again, then the population is re-speciated.
+
+        Args:
+            migrants (list): Genomes from other islands
+        """
+        population = self.population.population
+        children = [key for key, genome in population.items() if genome.fitness is None]
+        victims = random.sample(children, min(len(migrants), len(children)))
+
+        # Innovation numbers only exist in newer NEAT versions
+        tracker = getattr(self.population.reproduction, 'innovation_tracker', None)
+        innovations = {}
+        if tracker is not None:
+            for genome in population.values():
+                for gene in genome.connections.values():
+                    innovations[gene.key] = gene.innovation
+
+        for victim, migrant in zip(victims, migrants):
+            genome = copy.deepcopy(migrant)
+            genome.key = next(self.population.reproduction.genome_indexer)
+            genome.fitness = None
+            if tracker is not None:
+                for gene in genome.connections.values():
+                    if gene.key not in innovations:
+                        tracker.global_counter += 1
+                        innovations[gene.key] = tracker.global_counter
+                    gene.innovation = innovations[gene.key]
+            del population[victim]
+            population[genome.key] = genome
+
+        # Keep new node keys clear of the migrants' hidden nodes
+        genome_config = self.config.genome_config
+        highest = max(key for genome in population.values() for key in genome.nodes)
+        next_key = highest + 1
+        if genome_config.node_indexer is not None:
+            next_key = max(next_key, next(genome_config.node_indexer))
+        genome_config.node_indexer = count(next_key)
+
+        self.population.species.speciate(self.config, population, self.population.generation)
+
+    def save_checkpoint(self, checkpoint_dir):
+        """
+        Save the population, ready to evaluate its next generation.
+
+        Returns:
+            str: Checkpoint file
+        """
+        checkpointer = neat.Checkpointer(
+            None, filename_prefix=os.path.join(checkpoint_dir, f'island-{self.index}-gen-')
+        )
+        generation = self.population.generation
+        checkpointer.save_checkpoint(self.config, self.population.population,
+                                     self.population.species, generation)
+        return f'{checkpointer.filename_prefix}{generation}'
+
+def _island_main(index, config_path, seed, top_k, group_size, max_frames, checkpoint_file, conn):
+    """
+    Island process entry point.
+
+    Runs commands from the archipelago until told to stop:
+    ('evolve', n), ('migrate', genomes), ('checkpoint', dir) and ('stop',).
+    """
+    # Islands would append to the telemetry file concurrently
+    telemetry.configure(level='off')
+    island = Island(index, config_path, seed, top_k, group_size, max_frames, checkpoint_file)
+
+    while True:
+        command = conn.recv()
+        if command[0] == 'evolve':
+            island.evolve(command[1])
+            conn.send((island.population.generation, island.reporter.top))
+        elif command[0] == 'migrate':
+            island.receive(command[1])
+            conn.send(None)
+        elif command[0] == 'checkpoint':
+            conn.send(island.save_checkpoint(command[1]))
+        elif command[0] == 'stop':
+            conn.send(island.population.best_genome)
+            break
+
+class Archipelago:
+    def __init__(self, config_paths, num_islands=None, migration_interval=5, migrants=2,
+                 topology='ring', checkpoint_dir='island-checkpoints', checkpoint_every=1,
+                 group_size=None, max_frames=MAX_FRAMES, resume=None):
+        """
+        Island-model trainer: several NEAT populations evolve in their own
+        processes and exchange their fittest genomes every few generations.
+
+        Islands only wait for each other at migrations, so every core stays
+        busy, and the separate populations keep more diversity than one.
+
+        Args:
+            config_paths (list): NEAT configs, handed out to islands in turn
+                so islands can run config variations
+            num_islands (int): Islands to run, defaults to the CPU count
+            migration_interval (int): Generations between migrations
+            migrants (int): Fittest genomes each island sends per migration
+            topology (str): 'ring' sends to the next island, 'random' lets
+                every island receive from a randomly chosen other island
+            checkpoint_dir (str): Where archipelago checkpoints are written
+            checkpoint_every (int): Migrations between checkpoints
+            group_size (int): Genomes sharing one traffic world, the whole
+                island population if None
+            max_frames (int): Frames each world runs for at most
+            resume (str): Archipelago manifest to resume from; its islands,
+                configs and migration settings replace the arguments above
+        """
+        if topology not in TOPOLOGIES:
+            raise ValueError(f"Unknown migration topology: {topology}")
+
+        checkpoint_files = None
+        self.generation = 0
+        if resume:
+            print(f"Resuming archipelago: {resume}")
+            with open(resume, 'r') as f:
+                manifest = json.load(f)
+            config_paths = [island['config'] for island in manifest['islands']]
+            checkpoint_files = [island['checkpoint'] for island in manifest['islands']]
+            num_islands = len(manifest['islands'])
+            migration_interval = manifest['migration_interval']
+            migrants = manifest['migrants']
+            topology = manifest['topology']
+            self.seed = manifest['seed']
+            self.generation = manifest['generation']
+        else:
+            num_islands = num_islands or multiprocessing.cpu_count()
+            # The first config's [Traffic] seed is the root of every island's seed
+            self.seed = load_config(config_paths[0])[1].seed
+
+        self.num_islands = num_islands
+        self.config_paths = [config_paths[i % len(config_paths)] for i in range(num_islands)]
+        self.migration_interval = migration_interval
+        self.migrants = migrants
+        self.topology = topology
+        self.checkpoint_dir = checkpoint_dir
+        self.checkpoint_every = checkpoint_every
+        self.rng = np.random.default_rng([self.seed, self.generation])
+
+        self.connections = []
+        self.processes = []
+        for index in range(num_islands):
+            island_seed = int(np.random.SeedSequence([self.seed, index]).generate_state(1)[0])
+            parent_conn, child_conn = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=_island_main,
+                args=(index, self.config_paths[index], island_seed, migrants, group_size,
+                      max_frames, checkpoint_files[index] if checkpoint_files else None,
+                      child_conn)
+            )
+            process.start()
+            self.connections.append(parent_conn)
+            self.processes.append(process)
+
+    def _broadcast(self, commands):
+        """Send one command to every island and collect their replies"""
+        for conn, command in zip(self.connections, commands):
+            conn.send(command)
+        return [conn.recv() for conn in self.connections]
+
+    def _sources(self):
+        """Island each island receives its migrants from"""
+        n = self.num_islands
+        if self.topology == 'ring':
+            return [(index - 1) % n for index in range(n)]
+        # Any island but itself
+        return [int((index + self.rng.integers(1, n)) % n) for index in range(n)]
+
+    def _save_checkpoint(self):
+        """Checkpoint every island at the same generation and write the manifest"""
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        files = self._broadcast([('checkpoint', self.checkpoint_dir)] * self.num_islands)
+        manifest = {
+            'generation': self.generation,
+            'seed': self.seed,
+            'topology': self.topology,
+            'migration_interval': self.migration_interval,
+            'migrants': self.migrants,
+            'islands': [{'config': config_path, 'checkpoint': checkpoint_file}
+                        for config_path, checkpoint_file in zip(self.config_paths, files)]
+        }
+        path = os.path.join(self.checkpoint_dir, f'archipelago-{self.generation}.json')
+        with open(path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        print(f"Saved archipelago checkpoint: {path}")
+
+    def run(self, generations=50):
+        """
+        Evolve every island for a number of generations.
+
+        Returns:
+            The fittest genome found on any island
+        """
+        if self.num_islands < 2:
+            print("Only one island, migration is disabled")
+
+        remaining = generations
+        epoch = 0
+        while remaining > 0:
+            # Islands run independently until the next migration
+            steps = min(self.migration_interval, remaining)
+            results = self._broadcast([('evolve', steps)] * self.num_islands)
+            remaining -= steps
+            epoch += 1
+            self.generation = results[0][0]
+
+            if self.num_islands > 1:
+                emigrants = [top for _, top in results]
+                sources = self._sources()
+                self._broadcast([('migrate', emigrants[source]) for source in sources])
+                print(f"Migration after generation {self.generation - 1}: " +
+                      ', '.join(f"{source}->{index}" for index, source in enumerate(sources)))
+
+            if epoch % self.checkpoint_every == 0 or remaining == 0:
+                self._save_checkpoint()
+
+        return self.close()
+
+    def close(self):
+        """
+        Stop the islands.
+
+        Returns:
+            The fittest genome found on any island, or None
+        """
+        best_genomes = self._broadcast([('stop',)] * self.num_islands)
+        for process in self.processes:
+            process.join()
+        scored = [genome for genome in best_genomes if genome is not None]
+        return max(scored, key=lambda genome: genome.fitness) if scored else None
+
+if __name__ == '__main__':
+    # Setup paths
+    local_dir = os.path.dirname(__file__)
+    config_paths = [os.path.join(local_dir, "config.txt")]
+
+    # e.g. -islands 4 -migrate-every 5 -migrants 2 -topology ring -generations 50
+    # -configs config.txt,config-small.txt hands the configs out to islands in turn
+    # -group-size 5 splits each island into traffic worlds of 5 genomes
+    # -checkpoint-dir island-checkpoints -checkpoint-every 2 checkpoints every 2nd migration
+    # -resume island-checkpoints/archipelago-20.json continues a saved archipelago
+    num_islands = None
+    migration_interval = 5
+    migrants = 2
+    topology = 'ring'
+    generations = 50
+    checkpoint_dir = 'island-checkpoints'
+    checkpoint_every = 1
+    group_size = None
+    resume = None
+    args = sys.argv[1:]
+    for flag, value in zip(args[::2], args[1::2]):
+        if flag == '-islands':
+            num_islands = int(value)
+        elif flag == '-migrate-every':
+            migration_interval = int(value)
+        elif flag == '-migrants':
+            migrants = int(value)
+        elif flag == '-topology':
+            topology = value
+        elif flag == '-generations':
+            generations = int(value)
+        elif flag == '-configs':
+            config_paths = value.split(',')
+        elif flag == '-checkpoint-dir':
+            checkpoint_dir = value
+        elif flag == '-checkpoint-every':
+            checkpoint_every = int(value)
+        elif flag == '-group-size':
+            group_size = int(value)
+        elif flag == '-resume':
+            resume = value
+
+    archipelago = Archipelago(config_paths, num_islands, migration_interval, migrants, topology,
+                              checkpoint_dir, checkpoint_every, group_size, resume=resume)
+    try:
+        winner = archipelago.run(generations)
+    except KeyboardInterrupt:
+        print("\nTraining interrupted by user")
+        for process in archipelago.processes:
+            process.terminate()
+    else:
+        # Save the winner
+        if winner is not None:
+            with open('winner.pkl', 'wb') as f:
+                pickle.dump(winner, f)
+            print('\nBest genome:\n{!s}'.format(winner))
@@ -1,6 +1,5 @@
 # npc_car.py
 import pygame
-import random
 import numpy as np
 from car import Car
 from constants import (
@@ -9,28 +8,45 @@ from constants import (
     NPC_LANE_CHANGE_PROBABILITY, MIN_NPC_FOLLOWING_DISTANCE
 )
 
+# Used by cars created without a traffic world's generator
+_default_rng = np.random.default_rng()
+
 class NPCCar(Car):
-    def __init__(self, x, y):
+    __slots__ = (
+        'rng', 'target_velocity', 'aggression', 'desired_following_distance',
+        'lane_change_threshold', 'lane_change_cooldown',
+        'time_until_next_decision', 'current_decision_time', 'last_lane_change_time',
+        'decision_started', 'decision_paused_at'
+    )
+
+    def __init__(self, x, y, rng=None):
         """
         Initialize an NPC car with autonomous behavior.
         
         Args:
             x (float): Initial x position
             y (float): Initial y position
+            rng (numpy.random.Generator): Source of the car's randomness,
+                normally its traffic world's generator
         """
         super().__init__(x, y)
+        self.rng = rng if rng is not None else _default_rng
         
         # Set random target velocity within NPC limits
-        self.target_velocity = random.uniform(MIN_NPC_VELOCITY, MAX_NPC_VELOCITY)
+        self.target_velocity = self.rng.uniform(MIN_NPC_VELOCITY, MAX_NPC_VELOCITY)
         
         # NPC-specific state
-        self.time_until_next_decision = random.uniform(1.0, 3.0)  # Seconds between decisions
+        self.time_until_next_decision = self.rng.uniform(1.0, 3.0)  # Seconds between decisions
         self.current_decision_time = 0
         self.last_lane_change_time = 0
-        self.lane_change_cooldown = random.uniform(2.0, 5.0)  # Seconds between lane changes
+        self.lane_change_cooldown = self.rng.uniform(2.0, 5.0)  # Seconds between lane changes
+        
+        # Simulation times kept by a TrafficManager that schedules the decisions
+        self.decision_started = 0  # When the current decision timer started
+        self.decision_paused_at = None  # When the car started coasting, timer frozen
         
         # Behavior parameters (randomized per car)
-        self.aggression = random.uniform(0.5, 1.5)  # Affects following distance and lane change frequency
+        self.aggression = self.rng.uniform(0.5, 1.5)  # Affects following distance and lane change frequency
         self.desired_following_distance = MIN_NPC_FOLLOWING_DISTANCE * self.aggression
         self.lane_change_threshold = NPC_LANE_CHANGE_PROBABILITY * (2 - self.aggression)
         
@@ -114,7 +130,7 @@ class NPCCar(Car):
                                     / self.desired_following_distance)
                     self.accelerate(-brake_force)
                 else:  # Match speed with some randomness
-                    target = front_car.velocity * random.uniform(0.9, 1.1)
+                    target = front_car.velocity * self.rng.uniform(0.9, 1.1)
                     self.adjust_to_target_velocity(target)
             else:
                 self.adjust_to_target_velocity(self.target_velocity)
@@ -136,7 +152,7 @@ class NPCCar(Car):
             return None
         
         # Random lane change with probability
-        if random.random() < self.lane_change_threshold:
+        if self.rng.random() < self.lane_change_threshold:
             # Determine available directions
             can_go_left = (self.y > road_y_min + self.width * 2 and 
                           not (nearby_cars['front_left'] or nearby_cars['back_left']))
@@ -144,7 +160,7 @@ class NPCCar(Car):
                           not (nearby_cars['front_right'] or nearby_cars['back_right']))
             
             if can_go_left and can_go_right:
-                return random.choice([-1, 1])
+                return -1 if self.rng.random() < 0.5 else 1
             elif can_go_left:
                 return -1
             elif can_go_right:
@@ -166,7 +182,7 @@ class NPCCar(Car):
         
         return 0
     
-    def update(self, dt, all_cars, road_y_min, road_y_max, world_offset=0):
+    def update(self, dt, all_cars, road_y_min, road_y_max, world_offset=0, decide=None):
         """
         Update NPC car behavior
         
@@ -176,8 +192,13 @@ class NPCCar(Car):
             road_y_min (float): Top edge of road
             road_y_max (float): Bottom edge of road
             world_offset (float): Current world offset for position calculations
+            decide (bool): Whether a lane-change decision is due this frame,
+                as worked out by the TrafficManager's event scheduler. None
+                runs the car's own decision timer.
         """
-        self.current_decision_time += dt
+        if decide is None:
+            self.current_decision_time += dt
+            decide = self.current_decision_time >= self.time_until_next_decision
         
         # Get information about nearby cars
         nearby_cars = self.detect_nearby_cars(all_cars, road_y_min, road_y_max)
@@ -186,7 +207,7 @@ class NPCCar(Car):
         self.adjust_velocity(nearby_cars)
         
         # Consider lane changes
-        if self.current_decision_time >= self.time_until_next_decision:
+        if decide:
             lane_change = self.consider_lane_change(nearby_cars, road_y_min, road_y_max)
             # Only process lane change if it's a valid direction (-1, 0, or 1)
             if lane_change is not None and lane_change != 0:
@@ -195,8 +216,18 @@ class NPCCar(Car):
                 self.last_lane_change_time = self.current_decision_time
             
             # Reset decision timer with some randomness
-            self.time_until_next_decision = random.uniform(1.0, 3.0)
+            self.time_until_next_decision = self.rng.uniform(1.0, 3.0)
             self.current_decision_time = 0
         
         # Call parent update with world offset
-        super().update(world_offset)
\ No newline at end of file
+        super().update(world_offset)
+    
+    def coast(self, world_offset=0):
+        """
+        Far-field update: hold the current velocity with decisions frozen.
+        
+        Args:
+            world_offset (float): Current world offset for position calculations
+        """
+        self.acceleration = 0
+        super().update(world_offset)
@@ -0,0 +1,332 @@
+# npc_traffic.py
+import numpy as np
+from constants import (
+    CAR_LENGTH, CAR_WIDTH, MIN_VELOCITY, MAX_VELOCITY,
+    MAX_ACCELERATION, MAX_DECELERATION,
+    MAX_NPC_ACCELERATION, MAX_NPC_DECELERATION
+)
+
+# Same-lane and lane-change geometry used by NPCCar (all NPCs share CAR_WIDTH)
+CAR_LANE_HEIGHT = CAR_WIDTH * 1.5
+LANE_CHANGE_OFFSET = CAR_WIDTH * 1.5
+LANE_CHANGE_STEP = CAR_WIDTH * 0.1
+
+# Neighbour slots filled by detect_nearby, matching NPCCar.detect_nearby_cars
+NEARBY_KEYS = ('front', 'back', 'front_left', 'back_left', 'front_right', 'back_right')
+
+class NPCTraffic:
+    """
+    Array-backed NPC traffic engine.
+
+    Holds the state of every NPC as NumPy columns and applies the NPCCar
+    rules (car following, braking, lane changes, kinematics and boundary
+    checks) to all of them in one vectorized step.
+
+    Unlike NPCCar, where each car sees the cars updated before it in the same
+    frame, every NPC here reacts to the state at the start of the frame.
+    """
+    FLOAT_COLUMNS = (
+        'relative_x', 'y', 'target_y', 'velocity', 'acceleration',
+        'target_velocity', 'aggression', 'desired_following_distance',
+        'lane_change_threshold', 'lane_change_cooldown',
+        'current_decision_time', 'time_until_next_decision', 'last_lane_change_time',
+        'left_boundary', 'right_boundary', 'top_boundary', 'bottom_boundary'
+    )
+    BOOL_COLUMNS = ('is_active', 'is_changing_lanes')
+
+    def __init__(self, capacity=256, rng=None):
+        """
+        Initialize an empty traffic engine.
+
+        Args:
+            capacity (int): Initial number of rows to allocate
+            rng (numpy.random.Generator): Source of per-frame randomness
+        """
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.count = 0
+        self.capacity = capacity
+        for name in self.FLOAT_COLUMNS:
+            setattr(self, name, np.zeros(capacity))
+        for name in self.BOOL_COLUMNS:
+            setattr(self, name, np.zeros(capacity, dtype=bool))
+
+    def _grow(self):
+        """Double the allocated rows"""
+        self.capacity *= 2
+        for name in self.FLOAT_COLUMNS + self.BOOL_COLUMNS:
+            old = getattr(self, name)
+            new = np.zeros(self.capacity, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def clear(self):
+        """Remove every NPC"""
+        self.count = 0
+
+    def add_car(self, car):
+        """
+        Append an NPC, copying its current state.
+
+        Args:
+            car (NPCCar): Car whose state becomes the new row
+        """
+        if self.count == self.capacity:
+            self._grow()
+        row = self.count
+        for name in self.FLOAT_COLUMNS + self.BOOL_COLUMNS:
+            getattr(self, name)[row] = getattr(car, name)
+        self.count += 1
+
+    def compact(self, keep):
+        """
+        Drop rows, keeping their order.
+
+        Args:
+            keep (np.ndarray): Boolean mask over the current rows
+        """
+        kept = int(np.count_nonzero(keep))
+        for name in self.FLOAT_COLUMNS + self.BOOL_COLUMNS:
+            column = getattr(self, name)
+            column[:kept] = column[:self.count][keep]
+        self.count = kept
+
+    def keep_mask(self, lead_x, cleanup_distance):
+        """Active cars within cleanup_distance of the lead car"""
+        n = self.count
+        return self.is_active[:n] & (np.abs(self.relative_x[:n] - lead_x) <= cleanup_distance)
+
+    def write_back(self, cars, world_offset):
+        """
+        Copy the state other code reads back onto the NPCCar objects.
+
+        Args:
+            cars (list): NPCCar objects in row order
+            world_offset (float): Current world offset for screen positions
+        """
+        n = self.count
+        rows = zip(
+            cars,
+            self.relative_x[:n].tolist(),
+            self.y[:n].tolist(),
+            self.target_y[:n].tolist(),
+            self.velocity[:n].tolist(),
+            self.acceleration[:n].tolist(),
+            self.is_active[:n].tolist(),
+            self.is_changing_lanes[:n].tolist()
+        )
+        for car, relative_x, y, target_y, velocity, acceleration, is_active, is_changing_lanes in rows:
+            car.relative_x = relative_x
+            car.x = relative_x - world_offset
+            car.y = y
+            car.target_y = target_y
+            car.velocity = velocity
+            car.acceleration = acceleration
+            car.is_active = is_active
+            car.is_changing_lanes = is_changing_lanes
+
+    def detect_nearby(self, all_x, all_y, all_active, road_top, road_bottom, rows=None):
+        """
+        Find the closest car in each neighbour slot for every NPC in rows.
+
+        Cars are sorted by x once; each NPC then only scans outwards while
+        cars stay within twice its following distance.
+
+        Args:
+            all_x, all_y (np.ndarray): Positions of NPCs (first count rows) then AI cars
+            all_active (np.ndarray): Which of those cars can be seen
+            road_top (float): Top edge of road
+            road_bottom (float): Bottom edge of road
+            rows (np.ndarray): NPC rows to search for, all of them if None
+
+        Returns:
+            dict: Slot name -> index into all_x of the closest car, or -1,
+            for each of rows
+        """
+        if rows is None:
+            rows = np.arange(self.count)
+        n = len(rows)
+        total = len(all_x)
+        x = self.relative_x[rows]
+        y = self.y[rows]
+        reach = self.desired_following_distance[rows] * 2
+
+        order = np.argsort(all_x, kind='stable')
+        sorted_x = all_x[order]
+        position = np.empty(total, dtype=np.intp)
+        position[order] = np.arange(total)
+        own = position[rows]
+
+        # Widest window in sorted order that any NPC needs to scan
+        ahead = np.searchsorted(sorted_x, x + reach, side='right') - 1 - own
+        behind = own - np.searchsorted(sorted_x, x - reach, side='left')
+        max_offset = int(max(ahead.max(initial=0), behind.max(initial=0)))
+
+        can_see_left = y > road_top + CAR_WIDTH
+        can_see_right = y < road_bottom - CAR_WIDTH
+
+        best = {key: np.full(n, -1, dtype=np.intp) for key in NEARBY_KEYS}
+        best_distance = {key: np.full(n, np.inf) for key in NEARBY_KEYS}
+
+        for offset in range(1, max_offset + 1):
+            for direction in (1, -1):
+                candidate_pos = own + direction * offset
+                valid = (candidate_pos >= 0) & (candidate_pos < total)
+                candidate = order[np.clip(candidate_pos, 0, total - 1)]
+
+                dx = all_x[candidate] - x
+                dy = all_y[candidate] - y
+                distance = np.abs(dx)
+                valid &= all_active[candidate] & (distance <= reach)
+
+                same = np.abs(dy) < CAR_LANE_HEIGHT
+                left = (dy < -CAR_LANE_HEIGHT) & can_see_left
+                right = (dy > CAR_LANE_HEIGHT) & can_see_right
+                front = dx > 0
+
+                slots = (
+                    ('front', same & front), ('back', same & ~front),
+                    ('front_left', left & front), ('back_left', left & ~front),
+                    ('front_right', right & front), ('back_right', right & ~front)
+                )
+                for key, mask in slots:
+                    closer = valid & mask & (distance < best_distance[key])
+                    best_distance[key][closer] = distance[closer]
+                    best[key][closer] = candidate[closer]
+
+        return best
+
+    def _adjust_velocity(self, nearby, all_x, all_v, rows):
+        """Set acceleration of rows from the car ahead, like NPCCar.adjust_velocity"""
+        x = self.relative_x[rows]
+        v = self.velocity[rows]
+        desired = self.desired_following_distance[rows]
+
+        front = nearby['front']
+        has_front = front >= 0
+        front_index = np.where(has_front, front, 0)
+        front_v = all_v[front_index]
+        distance = all_x[front_index] - x
+        rel_velocity = v - front_v
+
+        approaching = has_front & (rel_velocity > 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            time_to_collision = distance / rel_velocity
+        emergency = approaching & (time_to_collision < 1.0)
+        too_close = approaching & ~emergency & (distance < desired)
+        matching = approaching & ~emergency & ~too_close
+
+        # Match speed with the car ahead with some randomness, otherwise cruise
+        target = self.target_velocity[rows]
+        target[matching] = front_v[matching] * self.rng.uniform(0.9, 1.1, int(np.count_nonzero(matching)))
+
+        amount = np.where(
+            v < target,
+            np.minimum(1.0, (target - v) / MAX_NPC_ACCELERATION),
+            np.maximum(-1.0, (target - v) / MAX_NPC_DECELERATION)
+        )
+        amount = np.where(too_close, -np.minimum(1.0, (desired - distance) / desired), amount)
+        amount = np.where(emergency, -1.0, amount)
+
+        # Car.accelerate
+        amount = np.clip(amount, -1, 1)
+        self.acceleration[rows] = np.where(amount >= 0, amount * MAX_ACCELERATION,
+                                           amount * MAX_DECELERATION)
+
+    def _decide_lane_changes(self, nearby, all_x, all_v, road_top, road_bottom, rows):
+        """Run due lane-change decisions of rows, like NPCCar.consider_lane_change"""
+        # Positions within rows (and nearby) of the cars due a decision
+        local = np.flatnonzero(self.is_active[rows] &
+                               (self.current_decision_time[rows] >= self.time_until_next_decision[rows]))
+        if local.size == 0:
+            return
+        due = rows[local]
+
+        y = self.y[due]
+        blocked = (self.is_changing_lanes[due] |
+                   (self.current_decision_time[due] - self.last_lane_change_time[due]
+                    < self.lane_change_cooldown[due]))
+        left_free = ((y > road_top + CAR_WIDTH * 2) &
+                     (nearby['front_left'][local] < 0) & (nearby['back_left'][local] < 0))
+        right_free = ((y < road_bottom - CAR_WIDTH * 2) &
+                      (nearby['front_right'][local] < 0) & (nearby['back_right'][local] < 0))
+
+        # Random lane change, picking a side at random when both are free
+        random_change = self.rng.random(due.size) < self.lane_change_threshold[due]
+        coin = np.where(self.rng.random(due.size) < 0.5, -1, 1)
+        free_side = np.where(left_free, -1, np.where(right_free, 1, 0))
+        change = np.where(random_change, np.where(left_free & right_free, coin, free_side), 0)
+
+        # Otherwise pull out from behind a slower car that is too close
+        front = nearby['front'][local]
+        has_front = front >= 0
+        front_index = np.where(has_front, front, 0)
+        slow_front = (has_front &
+                      (all_v[front_index] < self.target_velocity[due]) &
+                      (all_x[front_index] - self.relative_x[due] < self.desired_following_distance[due]))
+        change = np.where(change != 0, change, np.where(slow_front, free_side, 0))
+        change[blocked] = 0
+
+        # A lane change starts with one move_toward_y step towards the new lane
+        moving = change != 0
+        rows = due[moving]
+        direction = change[moving]
+        self.target_y[rows] = self.y[rows] + direction * LANE_CHANGE_OFFSET
+        self.y[rows] += direction * LANE_CHANGE_STEP
+        self.is_changing_lanes[rows] = True
+        self.last_lane_change_time[rows] = self.current_decision_time[rows]
+
+        # Reset decision timers with some randomness
+        self.time_until_next_decision[due] = self.rng.uniform(1.0, 3.0, due.size)
+        self.current_decision_time[due] = 0
+
+    def step(self, dt, ai_cars, road_top, road_bottom, world_offset=0, detailed=None):
+        """
+        Advance every NPC by one frame.
+
+        Args:
+            dt (float): Time step in seconds
+            ai_cars (list): AI cars the NPCs react to
+            road_top (float): Top edge of road
+            road_bottom (float): Bottom edge of road
+            world_offset (float): Current world offset for position calculations
+            detailed (np.ndarray): Boolean mask of the rows that get full
+                behaviour; the others coast like NPCCar.coast. All rows if None.
+        """
+        n = self.count
+        if n == 0:
+            return
+
+        rows = np.arange(n) if detailed is None else np.flatnonzero(detailed)
+        if detailed is not None:
+            self.acceleration[:n][~detailed] = 0
+
+        self.current_decision_time[rows] += dt
+
+        # Everything an NPC can see: the NPCs themselves followed by the AI cars
+        ai_x = [car.relative_x for car in ai_cars if car.is_active]
+        ai_y = [car.y for car in ai_cars if car.is_active]
+        ai_v = [car.velocity for car in ai_cars if car.is_active]
+        all_x = np.concatenate([self.relative_x[:n], ai_x])
+        all_y = np.concatenate([self.y[:n], ai_y])
+        all_v = np.concatenate([self.velocity[:n], ai_v])
+        all_active = np.concatenate([self.is_active[:n], np.ones(len(ai_x), dtype=bool)])
+
+        nearby = self.detect_nearby(all_x, all_y, all_active, road_top, road_bottom, rows)
+        self._adjust_velocity(nearby, all_x, all_v, rows)
+        self._decide_lane_changes(nearby, all_x, all_v, road_top, road_bottom, rows)
+
+        # Car.update: integrate velocity and position for active cars
+        active = self.is_active[:n]
+        velocity = self.velocity[:n]
+        velocity[active] = np.clip(velocity[active] + self.acceleration[:n][active],
+                                   MIN_VELOCITY, MAX_VELOCITY)
+        self.relative_x[:n][active] += velocity[active]
+
+        # Car.check_boundaries
+        screen_x = self.relative_x[:n] - world_offset
+        y = self.y[:n]
+        outside = ((screen_x < self.left_boundary[:n] - CAR_LENGTH) |
+                   (screen_x > self.right_boundary[:n] + CAR_LENGTH) |
+                   (y < self.top_boundary[:n] - CAR_WIDTH / 2) |
+                   (y > self.bottom_boundary[:n] + CAR_WIDTH / 2))
+        active &= ~outside
@@ -1,5 +1,4 @@
 # player_car.py
-import numpy as np
 from car import Car
 from constants import (
     PLAYER_COLOR, MAX_VELOCITY, MIN_VELOCITY,
@@ -9,13 +8,24 @@ from constants import (
 )
 import pygame
 from ai_input_processor import get_car_inputs
+from telemetry import telemetry, CAUSE_CODES
 
 class PlayerCar(Car):
+    __slots__ = (
+        'brain', 'fixed_x', 'genome', 'genome_id',
+        'total_distance', 'total_reward', 'actions_taken', 'lane_changes', 'collisions',
+        'death_cause', 'avg_speed', 'max_speed_achieved', 'min_speed_achieved',
+        'fitness', 'time_alive', 'smooth_driving_score', 'last_acceleration', 'last_lane_change',
+        'current_lane', 'target_lane', 'debug_font'
+    )
+
     def __init__(self, x, y, brain=None):
         """Initialize player car with NEAT neural network brain"""
         super().__init__(x, y)
         self.brain = brain
         self.fixed_x = x
+        self.genome = None  # Set by the trainer for AI cars
+        self.genome_id = -1
         
         # Ensure initial position is exactly at lane center
         if hasattr(self, 'target_y'):
@@ -29,6 +39,7 @@ class PlayerCar(Car):
         self.actions_taken = 0
         self.lane_changes = 0
         self.collisions = 0
+        self.death_cause = None  # What ended the run, see handle_collision
         self.avg_speed = MIN_VELOCITY
         self.max_speed_achieved = MIN_VELOCITY
         self.min_speed_achieved = MAX_VELOCITY
@@ -49,54 +60,82 @@ class PlayerCar(Car):
         if SHOW_DEBUG_INFO:
             self.debug_font = pygame.font.Font(None, DEBUG_FONT_SIZE)
     
-    def think(self, traffic_manager):
-        """Use NEAT brain to make driving decisions"""
+    def think(self, traffic_manager, inputs=None):
+        """
+        Use NEAT brain to make driving decisions.
+        
+        Args:
+            traffic_manager: TrafficManager instance
+            inputs (list): Precomputed network inputs, e.g. a row from
+                BatchInputProcessor. Computed with get_car_inputs if omitted.
+        """
         if not self.brain:
             return 0, 0
             
         # Get normalized inputs
-        inputs = get_car_inputs(self, traffic_manager)
+        if inputs is None:
+            inputs = get_car_inputs(self, traffic_manager)
         
         # Get neural network outputs
         outputs = self.brain.activate(inputs)
         
         # Parse outputs [acceleration, lane_change]
-        acceleration = np.clip(outputs[0], -1, 1)
-        lane_change = np.clip(outputs[1], -1, 1)
+        acceleration = min(max(outputs[0], -1), 1)
+        lane_change = min(max(outputs[1], -1), 1)
         
         return acceleration, lane_change
     
-    def update(self, traffic_manager=None, dt=1/60):
-        """Update car position and track statistics"""
+    def apply_controls(self, acceleration, lane_change, traffic_manager):
+        """
+        Apply one frame of driving controls.
+        
+        Args:
+            acceleration (float): Acceleration amount (-1 to 1)
+            lane_change (float): Lane change output (-1 to 1), acted on
+                when stronger than 0.5
+            traffic_manager: TrafficManager providing the lane layout
+        """
+        # Apply acceleration
+        self.accelerate(acceleration)
+        
+        # Handle lane changes if output is strong enough
+        if abs(lane_change) > 0.5 and not self.is_changing_lanes:
+            # Get current lane safely
+            current_lane = traffic_manager._get_lane(self.y)
+            if current_lane is not None:  # Only proceed if we're in a valid lane
+                # Calculate target lane
+                direction = 1 if lane_change > 0 else -1
+                target_lane = current_lane + direction
+                
+                # Verify target lane is valid
+                if 0 <= target_lane < NUM_LANES:
+                    # Get target y position for the lane
+                    target_y = traffic_manager._get_lane_y(target_lane)
+                    self.move_toward_y(target_y, self.width * 0.1)
+                    self.is_changing_lanes = True
+                    self.target_lane = target_lane
+    
+    def update(self, traffic_manager=None, dt=1/60, inputs=None, controls=None):
+        """
+        Update car position and track statistics.
+        
+        Args:
+            traffic_manager: TrafficManager instance
+            dt (float): Time step in seconds
+            inputs (list): Precomputed network inputs, passed on to think
+            controls (tuple): Precomputed (acceleration, lane_change)
+                decisions, e.g. from a PopulationNetwork. Skips think.
+        """
         prev_relative_x = self.relative_x
         
-        if traffic_manager and self.brain:
-            # Get AI decisions
-            acceleration, lane_change = self.think(traffic_manager)
-            
-            # Apply acceleration
-            self.accelerate(acceleration)
-            
-            # Handle lane changes if output is strong enough
-            if abs(lane_change) > 0.5 and not self.is_changing_lanes:
-                # Get current lane safely
-                current_lane = traffic_manager._get_lane(self.y)
-                if current_lane is not None:  # Only proceed if we're in a valid lane
-                    # Calculate target lane
-                    direction = 1 if lane_change > 0 else -1
-                    target_lane = current_lane + direction
-                    
-                    # Verify target lane is valid
-                    if 0 <= target_lane < NUM_LANES:
-                        # Get target y position for the lane
-                        target_y = traffic_manager._get_lane_y(target_lane)
-                        self.move_toward_y(target_y, self.width * 0.1)
-                        self.is_changing_lanes = True
-                        self.target_lane = target_lane
+        if traffic_manager and (self.brain or controls is not None):
+            # Get AI decisions, unless the whole generation's were batched
+            if controls is None:
+                controls = self.think(traffic_manager, inputs)
+            self.apply_controls(*controls, traffic_manager)
         
         # Update velocity with acceleration
-        self.velocity += self.acceleration
-        self.velocity = np.clip(self.velocity, MIN_VELOCITY, MAX_VELOCITY)
+        self.velocity = min(max(self.velocity + self.acceleration, MIN_VELOCITY), MAX_VELOCITY)
         
         # Update relative position (true position in world)
         self.relative_x += self.velocity
@@ -106,8 +145,9 @@ class PlayerCar(Car):
             self.x = self.relative_x - traffic_manager.world_offset
         
         # Check boundaries and destroy if out of bounds
-        if self.check_boundaries():
-            self.handle_collision()
+        violation = self.check_boundaries()
+        if violation:
+            self.handle_collision(violation)
             return
         
         # Update statistics
@@ -139,52 +179,55 @@ class PlayerCar(Car):
         # Ensure fitness doesn't go negative
         self.fitness = max(0, self.fitness)
     
-    def handle_collision(self):
-        """Handle collision event"""
+    def handle_collision(self, cause=None):
+        """
+        Handle collision event.
+        
+        Args:
+            cause (str): Cause of death, worked out from the car's
+                position if omitted
+        """
         self.collisions += 1
+        self.death_cause = cause or self._collision_cause()
         
-        # Debug collision info
-        print(f"\nCar {self.genome_id} died:")
-        print(f"Position: x={self.x:.1f}, y={self.y:.1f}")
-        print(f"Relative position: {self.relative_x:.1f}")
-        print(f"Velocity: {self.velocity:.1f}")
-        print(f"Time alive: {self.time_alive:.1f} seconds")
-        print(f"Distance traveled: {self.total_distance:.1f}")
-        
-        if self.y < self.top_boundary:
-            print("Cause: Hit top boundary")
-        elif self.y > self.bottom_boundary:
-            print("Cause: Hit bottom boundary")
-        elif self.x < self.left_boundary:
-            print("Cause: Too far left")
-        elif self.x > self.right_boundary:
-            print("Cause: Too far right")
-        else:
-            print("Cause: Collision with NPC car")
+        if telemetry.active['death']:
+            telemetry.record('death', self.genome_id, self.x, self.y,
+                             self.velocity, CAUSE_CODES[self.death_cause])
             
         self._update_fitness()
         self.is_active = False  # Mark car as inactive after collision
+    
+    def _collision_cause(self):
+        """Best guess at what killed the car from its final position"""
+        if self.y < self.top_boundary:
+            return 'top_boundary'
+        if self.y > self.bottom_boundary:
+            return 'bottom_boundary'
+        if self.x < self.left_boundary:
+            return 'left_boundary'
+        if self.x > self.right_boundary:
+            return 'right_boundary'
+        return 'npc_collision'
         
     def check_boundaries(self):
-        """Check if car is outside screen boundaries with debug info"""
-        print(f"\nDEBUG: Boundary check for car {self.genome_id}")
-        print(f"Car position: ({self.x}, {self.y})")
-        print(f"Car boundaries: top={self.top_boundary}, bottom={self.bottom_boundary}")
-        print(f"Car dimensions: width={self.width}, length={self.length}")
+        """
+        Check if car is outside screen boundaries.
         
-        # Check each boundary with debug output
+        Returns:
+            str or None: Which boundary was crossed, None if the car is inside
+        """
         if self.y - self.width/2 < self.top_boundary:
-            print(f"Top boundary violation: {self.y - self.width/2} < {self.top_boundary}")
-            return True
-        if self.y + self.width/2 > self.bottom_boundary:
-            print(f"Bottom boundary violation: {self.y + self.width/2} > {self.bottom_boundary}")
-            return True
-        if self.x < self.left_boundary:
-            print(f"Left boundary violation: {self.x} < {self.left_boundary}")
-            return True
-        if self.x > self.right_boundary:
-            print(f"Right boundary violation: {self.x} > {self.right_boundary}")
-            return True
-            
-        print("All boundaries OK")
-        return False
+            violation = 'top_boundary'
+        elif self.y + self.width/2 > self.bottom_boundary:
+            violation = 'bottom_boundary'
+        elif self.x < self.left_boundary:
+            violation = 'left_boundary'
+        elif self.x > self.right_boundary:
+            violation = 'right_boundary'
+        else:
+            return None
+        
+        if telemetry.active['boundary']:
+            telemetry.record('boundary', self.genome_id, self.x, self.y,
+                             self.velocity, CAUSE_CODES[violation])
+        return violation
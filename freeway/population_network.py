@@ -0,0 +1,116 @@
+# population_network.py
+import collections
+import numpy as np
+from typing import Optional
+from neat.activations import tanh_activation
+from neat.aggregations import sum_aggregation
+
+class PopulationNetwork:
+    """
+    A generation's neat FeedForwardNetworks evaluated as one dense network.
+
+    Genomes add and drop hidden nodes, and hidden node keys are per genome,
+    so nodes are matched by depth (longest path from the inputs) instead:
+    each depth is one layer, as wide as its widest network, with unused
+    slots where a network has fewer nodes. The weights are stacked into one
+    (networks, sources, layer) array per layer, zero where a network lacks
+    the connection, and each layer is a single batched matmul for every car
+    at once. Built by create, which returns None when the networks can't be
+    stacked so callers keep activating them one by one.
+    """
+    def __init__(self, num_inputs: int, num_nodes: int, output_columns: np.ndarray, layers: list):
+        self.num_inputs = num_inputs
+        self.num_columns = num_inputs + num_nodes + 1  # The last one stays 0
+        self.output_columns = output_columns  # (networks, outputs), the last column if never evaluated
+        self.layers = layers  # (first column, weights, bias, response) per layer
+
+    @classmethod
+    def create(cls, networks: list) -> Optional['PopulationNetwork']:
+        """Stack networks with the same inputs and outputs and only tanh/sum nodes, or return None"""
+        if not networks:
+            return None
+        first = networks[0]
+        for network in networks:
+            if network.input_nodes != first.input_nodes or network.output_nodes != first.output_nodes:
+                return None
+            for _, activation, aggregation, _, _, _ in network.node_evals:
+                if activation is not tanh_activation or aggregation is not sum_aggregation:
+                    return None
+
+        # Depth of every node, node_evals is already in evaluation order
+        depths = []
+        for network in networks:
+            depth = dict.fromkeys(network.input_nodes, 0)
+            for node, _, _, _, _, links in network.node_evals:
+                depth[node] = 1 + max((depth[source] for source, _ in links), default=0)
+            depths.append(depth)
+
+        # Each layer is as wide as the most nodes any network has at that depth
+        widths = []
+        for network, depth in zip(networks, depths):
+            counts = collections.Counter(depth[node] for node, *_ in network.node_evals)
+            for level, count in counts.items():
+                widths.extend([0] * (level - len(widths)))
+                widths[level - 1] = max(widths[level - 1], count)
+        num_inputs = len(first.input_nodes)
+        starts = num_inputs + np.concatenate([[0], np.cumsum(widths)]).astype(int)
+
+        # Column of every value per network: inputs first, then layer by layer
+        columns = []
+        for network, depth in zip(networks, depths):
+            network_columns = {key: i for i, key in enumerate(network.input_nodes)}
+            filled = [0] * len(widths)
+            for node, *_ in network.node_evals:
+                level = depth[node] - 1
+                network_columns[node] = starts[level] + filled[level]
+                filled[level] += 1
+            columns.append(network_columns)
+
+        layers = []
+        for level, width in enumerate(widths):
+            start = starts[level]
+            layers.append((
+                start,
+                np.zeros((len(networks), start, width)),  # weights
+                np.zeros((len(networks), width)),  # bias
+                np.zeros((len(networks), width))  # response
+            ))
+        for index, (network, depth, network_columns) in enumerate(zip(networks, depths, columns)):
+            for node, _, _, bias, response, links in network.node_evals:
+                start, weights, layer_bias, layer_response = layers[depth[node] - 1]
+                column = network_columns[node] - start
+                layer_bias[index, column] = bias
+                layer_response[index, column] = response
+                for source, weight in links:
+                    weights[index, network_columns[source], column] = weight
+
+        num_nodes = sum(widths)
+        never_evaluated = num_inputs + num_nodes
+        output_columns = np.array([
+            [network_columns.get(key, never_evaluated) for key in first.output_nodes]
+            for network_columns in columns
+        ])
+        return cls(num_inputs, num_nodes, output_columns, layers)
+
+    def activate(self, inputs: np.ndarray, rows: Optional[list] = None) -> np.ndarray:
+        """Outputs of the chosen networks, one row of inputs per network
+
+        Args:
+            inputs: (len(rows), num_inputs) array
+            rows: Networks to evaluate, e.g. the indices of the cars still
+                driving. All of them if None.
+
+        Returns:
+            (len(rows), num_outputs) array, same as each network's activate
+            up to float rounding
+        """
+        if rows is None:
+            rows = slice(None)
+        values = np.zeros((inputs.shape[0], self.num_columns))
+        values[:, :self.num_inputs] = inputs
+        for start, weights, bias, response in self.layers:
+            total = np.matmul(values[:, np.newaxis, :start], weights[rows])[:, 0, :]
+            # neat's tanh_activation
+            z = np.clip(2.5 * (bias[rows] + response[rows] * total), -60.0, 60.0)
+            values[:, start:start + weights.shape[2]] = np.tanh(z)
+        return np.take_along_axis(values, self.output_columns[rows], axis=1)
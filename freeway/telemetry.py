@@ -0,0 +1,174 @@
+# telemetry.py
+import json
+import numpy as np
+
+# Log levels, lowest is most verbose
+DEBUG = 10
+INFO = 20
+WARNING = 30
+OFF = 100
+
+LEVELS = {
+    'debug': DEBUG,
+    'info': INFO,
+    'warning': WARNING,
+    'off': OFF
+}
+
+# Event categories and the level each one is recorded at
+CATEGORY_LEVELS = {
+    'boundary': DEBUG,  # Boundary violations, checked every car every frame
+    'spawn': DEBUG,     # AI cars created and NPC cars spawned
+    'death': INFO       # AI car deaths with their cause
+}
+CATEGORIES = list(CATEGORY_LEVELS)
+CATEGORY_CODES = {category: code for code, category in enumerate(CATEGORIES)}
+
+# Value codes for boundary and death events
+CAUSES = ['top_boundary', 'bottom_boundary', 'left_boundary', 'right_boundary', 'npc_collision']
+CAUSE_CODES = {cause: code for code, cause in enumerate(CAUSES)}
+
+# One fixed-size record per event so recording is a single row write
+EVENT_DTYPE = np.dtype([
+    ('frame', np.int32),
+    ('category', np.int8),
+    ('car_id', np.int64),
+    ('x', np.float32),
+    ('y', np.float32),
+    ('velocity', np.float32),
+    ('value', np.float32)
+])
+
+class Telemetry:
+    def __init__(self, level=INFO, capacity=65536, path=None):
+        """
+        In-memory event log for the training hot path.
+
+        Events go into a preallocated buffer and are written to a JSONL file
+        in bulk by flush(), once per generation or whenever the buffer fills.
+        Call sites check telemetry.active[category] before building an event,
+        so disabled categories cost a single dict lookup.
+
+        Args:
+            level (int): Minimum level a category needs to be recorded
+            capacity (int): Events held in memory between flushes
+            path (str): JSONL file events are appended to, or None to only
+                keep per-generation summaries
+        """
+        self.buffer = np.zeros(capacity, dtype=EVENT_DTYPE)
+        self.count = 0
+        self.frame = 0
+        self.generation = 0
+        self.path = path
+        self.active = {}
+        self.configure(level)
+        self._reset_totals()
+
+    def configure(self, level=None, path=None, **categories):
+        """
+        Change the log level, output file or individual categories.
+
+        Args:
+            level (int or str): New log level, e.g. DEBUG or 'debug'
+            path (str): New JSONL output file
+            **categories: Per-category overrides, e.g. boundary=False
+        """
+        if level is not None:
+            self.level = LEVELS[level] if isinstance(level, str) else level
+            self.active = {
+                category: category_level >= self.level
+                for category, category_level in CATEGORY_LEVELS.items()
+            }
+        if path is not None:
+            self.path = path
+        for category, enabled in categories.items():
+            if category not in CATEGORY_LEVELS:
+                raise ValueError(f"Unknown telemetry category: {category}")
+            self.active[category] = bool(enabled)
+
+    def _reset_totals(self):
+        self.totals = np.zeros(len(CATEGORIES), dtype=np.int64)
+        self.cause_totals = np.zeros(len(CAUSES), dtype=np.int64)
+
+    def set_frame(self, frame):
+        """Set the frame number stamped on following events"""
+        self.frame = frame
+
+    def record(self, category, car_id, x, y, velocity, value=0):
+        """
+        Append one event to the buffer.
+
+        Args:
+            category (str): One of CATEGORIES
+            car_id (int): Genome id of the car, -1 for NPC cars
+            x, y (float): Car screen position
+            velocity (float): Car velocity
+            value (float): Category specific value, e.g. a cause code or lane
+        """
+        if self.count == len(self.buffer):
+            self._drain()
+        self.buffer[self.count] = (
+            self.frame, CATEGORY_CODES[category], car_id, x, y, velocity, value
+        )
+        self.count += 1
+
+    def _drain(self):
+        """Fold buffered events into the totals and write them out"""
+        events = self.buffer[:self.count]
+        if len(events) == 0:
+            return
+        self.totals += np.bincount(events['category'], minlength=len(CATEGORIES))
+
+        causes = events['value'][events['category'] == CATEGORY_CODES['death']]
+        self.cause_totals += np.bincount(causes.astype(np.int64), minlength=len(CAUSES))
+
+        if self.path:
+            lines = []
+            for frame, category, car_id, x, y, velocity, value in events.tolist():
+                event = {
+                    'generation': self.generation,
+                    'frame': frame,
+                    'category': CATEGORIES[category],
+                    'car_id': car_id,
+                    'x': round(x, 2),
+                    'y': round(y, 2),
+                    'velocity': round(velocity, 3)
+                }
+                if CATEGORIES[category] == 'spawn':
+                    event['lane'] = int(value)
+                else:
+                    event['cause'] = CAUSES[int(value)]
+                lines.append(json.dumps(event) + '\n')
+            with open(self.path, 'a') as f:
+                f.writelines(lines)
+
+        self.count = 0
+
+    def flush(self):
+        """
+        Write out the generation's events and print its summary.
+
+        Returns:
+            dict: Event counts per category and deaths per cause
+        """
+        self._drain()
+        summary = {
+            'events': {category: int(total) for category, total in zip(CATEGORIES, self.totals)},
+            'deaths': {cause: int(total) for cause, total in zip(CAUSES, self.cause_totals) if total}
+        }
+
+        if self.level < OFF:
+            recorded = ', '.join(f"{category}={total}" for category, total in summary['events'].items()
+                                 if self.active[category])
+            print(f"Telemetry generation {self.generation}: {recorded or 'no categories enabled'}")
+            if summary['deaths']:
+                causes = ', '.join(f"{cause}={total}" for cause, total in summary['deaths'].items())
+                print(f"  Deaths by cause: {causes}")
+
+        self.generation += 1
+        self.frame = 0
+        self._reset_totals()
+        return summary
+
+# Shared instance used by the cars, traffic manager and trainer
+telemetry = Telemetry()
@@ -0,0 +1,336 @@
+# traffic_benchmark.py
+import os
+import sys
+
+# Benchmarks never draw
+os.environ['FREEWAY_HEADLESS'] = '1'
+
+import json
+import math
+import multiprocessing
+import platform
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime
+import numpy as np
+from constants import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, SHOULDER_WIDTH, SPAWN_DISTANCE, NUM_LANES,
+    MIN_NPC_VELOCITY, MAX_NPC_VELOCITY, MAX_VELOCITY, SIM_DT
+)
+from npc_car import NPCCar
+from player_car import PlayerCar
+from traffic_manager import TrafficManager
+from ai_input_processor import BatchInputProcessor, get_car_inputs
+
+# Per-frame phases, in the order a frame runs them
+PHASES = ('sensors', 'sensors_scalar', 'ai_update', 'collision', 'npc_update', 'spawning')
+
+# Phases the training loop actually runs; frames/sec is based on these
+# (sensors_scalar is the per-car get_car_inputs the batched sensors replace)
+TRAINING_PHASES = ('sensors', 'ai_update', 'collision', 'npc_update', 'spawning')
+
+ENGINES = ('object', 'vectorized')
+
+REGRESSION_RATIO = 1.25  # Slower than this relative to the baseline is reported
+
+def default_cases():
+    """
+    Sweeps around a base case of 1000 NPCs, 10 AI cars and 4 lanes: NPC
+    count, AI car count and lane count are each varied on their own.
+
+    Returns:
+        list: Case dicts with npcs, ai_cars and lanes
+    """
+    cases = []
+    for npcs in (10, 100, 1000, 5000):
+        cases.append({'npcs': npcs, 'ai_cars': 10, 'lanes': 4})
+    for ai_cars in (1, 10, 100, 1000):
+        cases.append({'npcs': 1000, 'ai_cars': ai_cars, 'lanes': 4})
+    for lanes in (2, 4, 8):
+        cases.append({'npcs': 1000, 'ai_cars': 10, 'lanes': lanes})
+
+    unique = []
+    for case in cases:
+        if case not in unique:
+            unique.append(case)
+    return unique
+
+def build_world(num_npcs, num_ai_cars, vectorized=False, seed=0):
+    """
+    A traffic world holding a fixed number of cars.
+
+    NPCs are spread over every lane of the stretch of road TrafficManager
+    keeps around the lead car, and nothing is destroyed at the screen
+    edges, so the counts stay put while the frames are timed. AI cars
+    cruise side by side across the screen without a brain.
+
+    Returns:
+        tuple: (TrafficManager, list of AI cars)
+    """
+    road_top = SHOULDER_WIDTH
+    road_bottom = SCREEN_HEIGHT - SHOULDER_WIDTH
+    traffic_manager = TrafficManager(road_top, road_bottom, vectorized=vectorized, seed=seed)
+    rng = np.random.default_rng(seed)
+
+    # AI cars start where the trainer puts them and share one speed
+    ai_cars = []
+    for i in range(num_ai_cars):
+        lane = i % NUM_LANES
+        car = PlayerCar(SCREEN_WIDTH * 0.2, traffic_manager._get_lane_y(lane))
+        car.top_boundary = road_top
+        car.bottom_boundary = road_bottom
+        car.left_boundary = -math.inf
+        car.right_boundary = math.inf
+        car.current_lane = lane
+        car.velocity = MAX_VELOCITY * 0.5
+        ai_cars.append(car)
+
+    # NPCs inside the cleanup distance of the lead car
+    lead_x = max(car.relative_x for car in ai_cars)
+    reach = (SCREEN_WIDTH + SPAWN_DISTANCE) * 0.9
+    positions = rng.uniform(lead_x - reach, lead_x + reach, num_npcs).tolist()
+    for i, relative_x in enumerate(positions):
+        lane = i % NUM_LANES
+        car = NPCCar(relative_x - lead_x, traffic_manager._get_lane_y(lane), traffic_manager.rng)
+        car.relative_x = relative_x
+        # Half the traffic drives each way, like spawn_initial_traffic
+        direction = 1 if (i // NUM_LANES) % 2 == 0 else -1
+        car.velocity = direction * rng.uniform(MIN_NPC_VELOCITY, MAX_NPC_VELOCITY)
+        car.left_boundary = -math.inf
+        car.right_boundary = math.inf
+        car.top_boundary = road_top
+        car.bottom_boundary = road_bottom
+        traffic_manager.cars.append(car)
+        traffic_manager._schedule_decision(car)
+        if traffic_manager.npc_engine:
+            traffic_manager.npc_engine.add_car(car)
+
+    # Spawning keeps the lanes topped up to the benchmark's density
+    traffic_manager.target_cars_per_lane = 2 * math.ceil(num_npcs / NUM_LANES / 2)
+    traffic_manager._rebuild_index()
+    return traffic_manager, ai_cars
+
+def run_case(case):
+    """
+    Time one world's frames phase by phase.
+
+    Args:
+        case (dict): npcs, ai_cars, engine, frames, max_seconds and seed
+
+    Returns:
+        dict: The case with per-phase milliseconds per frame, frames/sec,
+        memory and the car counts at the end
+    """
+    # Memory of the world and of a couple of frames, traced apart from the timing
+    tracemalloc.start()
+    traffic_manager, ai_cars = build_world(case['npcs'], case['ai_cars'],
+                                           case['engine'] == 'vectorized', case['seed'])
+    processor = BatchInputProcessor(len(ai_cars))
+    world_bytes = tracemalloc.get_traced_memory()[0]
+
+    # Split spawning out of TrafficManager.update
+    spawn_time = [0.0]
+    manage_spawning = traffic_manager._manage_spawning
+
+    def timed_spawning():
+        start = time.perf_counter()
+        manage_spawning()
+        spawn_time[0] += time.perf_counter() - start
+    traffic_manager._manage_spawning = timed_spawning
+
+    totals = dict.fromkeys(PHASES, 0.0)
+    collisions = 0
+    frames = 0
+    started = time.perf_counter()
+    # The first two frames only warm up and measure memory
+    while frames < max(3, case['frames']):
+        if frames == 2:
+            peak_bytes = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            totals = dict.fromkeys(PHASES, 0.0)
+            spawn_time[0] = 0.0
+            started = time.perf_counter()
+        elif frames > 2 and time.perf_counter() - started > case['max_seconds']:
+            break
+
+        t0 = time.perf_counter()
+        processor.compute(ai_cars, traffic_manager)
+        t1 = time.perf_counter()
+        for car in ai_cars:
+            get_car_inputs(car, traffic_manager)
+        t2 = time.perf_counter()
+        for car in ai_cars:
+            car.update(traffic_manager, SIM_DT)
+        t3 = time.perf_counter()
+        for car in ai_cars:
+            collisions += traffic_manager.check_collision(car)
+        t4 = time.perf_counter()
+        spawn_before = spawn_time[0]
+        # Like the trainer, traffic follows a single reference car
+        traffic_manager.update(SIM_DT, ai_cars[0])
+        t5 = time.perf_counter()
+
+        spawning = spawn_time[0] - spawn_before
+        totals['sensors'] += t1 - t0
+        totals['sensors_scalar'] += t2 - t1
+        totals['ai_update'] += t3 - t2
+        totals['collision'] += t4 - t3
+        totals['npc_update'] += t5 - t4 - spawning
+        totals['spawning'] += spawning
+        frames += 1
+
+    timed = max(1, frames - 2)
+    phase_ms = {phase: 1000 * total / timed for phase, total in totals.items()}
+    frame_ms = sum(phase_ms[phase] for phase in TRAINING_PHASES)
+    return {
+        **case,
+        'frames_timed': timed,
+        'phase_ms': {phase: round(ms, 4) for phase, ms in phase_ms.items()},
+        'frame_ms': round(frame_ms, 4),
+        'fps': round(1000 / frame_ms, 1) if frame_ms else None,
+        'world_bytes': world_bytes,
+        'peak_bytes': peak_bytes,
+        'final_npcs': len(traffic_manager.cars),
+        'detailed_npcs': traffic_manager.num_detailed,
+        'collision_checks_hit': collisions
+    }
+
+def _run_cases(cases):
+    return [run_case(case) for case in cases]
+
+def run_benchmark(cases, engines=ENGINES, frames=60, max_seconds=5.0, seed=0):
+    """
+    Run every case with every engine.
+
+    Lane counts other than the current NUM_LANES run in a fresh process
+    with FREEWAY_NUM_LANES set, since the lane count is fixed at import.
+
+    Returns:
+        list: One result dict per case and engine
+    """
+    by_lanes = {}
+    for case in cases:
+        for engine in engines:
+            by_lanes.setdefault(case['lanes'], []).append(
+                {**case, 'engine': engine, 'frames': frames, 'max_seconds': max_seconds, 'seed': seed}
+            )
+
+    results = []
+    context = multiprocessing.get_context('spawn')
+    for lanes, lane_cases in sorted(by_lanes.items()):
+        if lanes == NUM_LANES:
+            lane_results = []
+            for case in lane_cases:
+                lane_results.append(run_case(case))
+                _print_result(lane_results[-1])
+        else:
+            os.environ['FREEWAY_NUM_LANES'] = str(lanes)
+            try:
+                pool = context.Pool(1)
+                lane_results = pool.apply(_run_cases, (lane_cases,))
+                pool.close()
+                pool.join()
+            finally:
+                os.environ['FREEWAY_NUM_LANES'] = str(NUM_LANES)
+            for result in lane_results:
+                _print_result(result)
+        results.extend(lane_results)
+    return results
+
+def _print_result(result):
+    phases = ' '.join(f"{phase}={result['phase_ms'][phase]:.2f}" for phase in PHASES)
+    print(f"{result['engine']:>10} npcs={result['npcs']:<5} ai={result['ai_cars']:<4} "
+          f"lanes={result['lanes']}  {result['frame_ms']:8.2f} ms/frame {result['fps']:>8} fps  "
+          f"{result['peak_bytes'] / 2**20:6.1f} MiB  [{phases}]")
+
+def _case_key(result):
+    return (result['engine'], result['npcs'], result['ai_cars'], result['lanes'])
+
+def compare(results, baseline):
+    """
+    Print each case's frame time against a previous run.
+
+    Args:
+        results (list): Results of this run
+        baseline (dict): Contents of an earlier benchmark JSON file
+
+    Returns:
+        list: Keys of the cases slower than REGRESSION_RATIO times the baseline
+    """
+    previous = {_case_key(result): result for result in baseline['results']}
+    regressions = []
+    print(f"\nCompared with {baseline.get('commit') or 'baseline'}:")
+    for result in results:
+        old = previous.get(_case_key(result))
+        if not old or not old['frame_ms']:
+            continue
+        ratio = result['frame_ms'] / old['frame_ms']
+        flag = ''
+        if ratio > REGRESSION_RATIO:
+            flag = '  REGRESSION'
+            regressions.append(_case_key(result))
+        engine, npcs, ai_cars, lanes = _case_key(result)
+        print(f"{engine:>10} npcs={npcs:<5} ai={ai_cars:<4} lanes={lanes}  "
+              f"{old['frame_ms']:8.2f} -> {result['frame_ms']:8.2f} ms/frame  x{ratio:.2f}{flag}")
+    return regressions
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        return None
+
+if __name__ == '__main__':
+    # e.g. -out bench.json -compare bench-main.json -frames 60 -max-seconds 5
+    # -npcs 10,100,1000 -ai-cars 10 -lanes 4 replaces the default sweeps with their grid
+    # -engines vectorized times only one NPC engine
+    out_path = 'traffic_benchmark.json'
+    compare_path = None
+    frames = 60
+    max_seconds = 5.0
+    engines = ENGINES
+    grid = {}
+    args = sys.argv[1:]
+    for flag, value in zip(args[::2], args[1::2]):
+        if flag == '-out':
+            out_path = value
+        elif flag == '-compare':
+            compare_path = value
+        elif flag == '-frames':
+            frames = int(value)
+        elif flag == '-max-seconds':
+            max_seconds = float(value)
+        elif flag == '-engines':
+            engines = value.split(',')
+        elif flag in ('-npcs', '-ai-cars', '-lanes'):
+            grid[flag[1:].replace('-', '_')] = [int(item) for item in value.split(',')]
+
+    if grid:
+        cases = [{'npcs': npcs, 'ai_cars': ai_cars, 'lanes': lanes}
+                 for npcs in grid.get('npcs', [1000])
+                 for ai_cars in grid.get('ai_cars', [10])
+                 for lanes in grid.get('lanes', [NUM_LANES])]
+    else:
+        cases = default_cases()
+
+    results = run_benchmark(cases, engines, frames, max_seconds)
+    report = {
+        'commit': _git_commit(),
+        'date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'frames': frames,
+        'results': results
+    }
+    with open(out_path, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {out_path}")
+
+    if compare_path:
+        with open(compare_path, 'r') as f:
+            regressions = compare(results, json.load(f))
+        if regressions:
+            sys.exit(1)
@@ -1,17 +1,50 @@
 # traffic_manager.py
-import random
+import math
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+import numpy as np
 from npc_car import NPCCar
+from npc_traffic import NPCTraffic
+from event_scheduler import EventScheduler
+from telemetry import telemetry
 from constants import (
     SCREEN_WIDTH, NUM_LANES, SPAWN_DISTANCE, DESPAWN_DISTANCE,
     TRAFFIC_DENSITY, MIN_CAR_SPACING, NUM_CARS_VISIBLE_AHEAD,
-    MIN_NPC_VELOCITY, MAX_NPC_VELOCITY
+    MIN_NPC_VELOCITY, MAX_NPC_VELOCITY, CAR_LENGTH, NPC_LOD_RADIUS
 )
 
+# NumPy copy of the spatial index for batched queries. Overall and per-lane
+# arrays are sorted by relative_x; x is the screen position of the same cars.
+TrafficSnapshot = namedtuple('TrafficSnapshot', [
+    'relative_x', 'x', 'y', 'velocity',
+    'lane_relative_x', 'lane_x', 'lane_velocity'
+])
+
 class TrafficManager:
-    def __init__(self, road_top, road_bottom):
-        """Initialize the traffic manager."""
+    def __init__(self, road_top, road_bottom, vectorized=False, seed=None,
+                 lod_radius=NPC_LOD_RADIUS):
+        """
+        Initialize the traffic manager.
+        
+        Args:
+            road_top (float): Top edge of road
+            road_bottom (float): Bottom edge of road
+            vectorized (bool): Step NPCs with the array-backed NPCTraffic engine.
+                The NPCCar objects in self.cars are then kept in sync for
+                drawing and sensor queries.
+            seed (int): Seed for this world's generator. Every spawn, NPC
+                behaviour parameter and NPC decision is drawn from it, so the
+                same seed replays the same traffic for the same drivers.
+            lod_radius (float): Level-of-detail radius. Only NPCs within this
+                distance along the road of an active AI car run their full
+                behaviour; the rest coast at constant velocity with their
+                decisions frozen until they come back into range. None runs
+                full behaviour for every NPC.
+        """
         self.road_top = road_top
         self.road_bottom = road_bottom
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
         self.lane_height = (road_bottom - road_top) / NUM_LANES
         self.num_lanes = NUM_LANES
         self.cars = []
@@ -21,14 +54,28 @@ class TrafficManager:
         self.max_cars_per_lane = int(visible_road_length / MIN_CAR_SPACING)
         self.target_cars_per_lane = int(self.max_cars_per_lane * TRAFFIC_DENSITY)
         
-        # Track spawn cooldowns per lane and direction
-        self.spawn_cooldowns = {
-            'left': [0.0] * NUM_LANES,
-            'right': [0.0] * NUM_LANES
-        }
+        # Timed events keyed by simulation time: spawn cooldowns, keyed by
+        # (direction, lane), and the NPCCar lane-change decisions of the
+        # object engine, keyed by car. Only the events due each frame are touched.
+        self.scheduler = EventScheduler()
         
         self.world_offset = 0
         self.lead_car = None
+        self.npc_engine = NPCTraffic(rng=self.rng) if vectorized else None
+        self.lod_radius = lod_radius
+        self.num_detailed = 0  # NPCs that ran full behaviour last update
+        
+        # Spatial index rebuilt once per frame: active cars sorted by relative_x,
+        # overall and per lane, with parallel key lists for bisect
+        self._sorted_x = []
+        self._sorted_cars = []
+        self._lane_x = [[] for _ in range(NUM_LANES)]
+        self._lane_cars = [[] for _ in range(NUM_LANES)]
+        self._lane_counts = {
+            'left': [0] * NUM_LANES,
+            'right': [0] * NUM_LANES
+        }
+        self._snapshot = None
 
     def _get_lane_y(self, lane):
         """Convert lane number to y-coordinate center."""
@@ -41,32 +88,120 @@ class TrafficManager:
         lane = int((y - self.road_top) / self.lane_height)
         return max(0, min(lane, NUM_LANES - 1))
 
+    def _lanes_for_y(self, y):
+        """
+        Lanes a car at y counts as being in.
+        
+        A car belongs to every lane whose center is within one lane height,
+        so a car part way through a lane change is in both lanes.
+        """
+        first = math.floor((y - self.road_top) / self.lane_height - 0.5)
+        return [lane for lane in (first, first + 1)
+                if 0 <= lane < self.num_lanes and
+                abs(y - self._get_lane_y(lane)) < self.lane_height]
+
+    def _index_car(self, car):
+        """Insert a car into the sorted indexes."""
+        self._snapshot = None
+        key = car.relative_x
+        pos = bisect_right(self._sorted_x, key)
+        self._sorted_x.insert(pos, key)
+        self._sorted_cars.insert(pos, car)
+        for lane in self._lanes_for_y(car.y):
+            pos = bisect_right(self._lane_x[lane], key)
+            self._lane_x[lane].insert(pos, key)
+            self._lane_cars[lane].insert(pos, car)
+            if car.velocity > 0:
+                self._lane_counts['right'][lane] += 1
+            elif car.velocity < 0:
+                self._lane_counts['left'][lane] += 1
+
+    def _rebuild_index(self):
+        """Rebuild the per-lane sorted indexes from the current car positions."""
+        self._snapshot = None
+        active = sorted((car for car in self.cars if car.is_active),
+                        key=lambda car: car.relative_x)
+        self._sorted_cars = active
+        self._sorted_x = [car.relative_x for car in active]
+        self._lane_cars = [[] for _ in range(self.num_lanes)]
+        self._lane_counts = {
+            'left': [0] * self.num_lanes,
+            'right': [0] * self.num_lanes
+        }
+        for car in active:
+            for lane in self._lanes_for_y(car.y):
+                self._lane_cars[lane].append(car)
+                if car.velocity > 0:
+                    self._lane_counts['right'][lane] += 1
+                elif car.velocity < 0:
+                    self._lane_counts['left'][lane] += 1
+        self._lane_x = [[car.relative_x for car in lane_cars] for lane_cars in self._lane_cars]
+
+    def _detail_mask(self, relative_x, focus_x):
+        """
+        Which cars run full behaviour this frame.
+        
+        Args:
+            relative_x (np.ndarray): World positions of the NPCs
+            focus_x (list): World positions of the active AI cars
+            
+        Returns:
+            np.ndarray: True for cars within lod_radius of a focus car
+        """
+        if self.lod_radius is None:
+            return np.ones(len(relative_x), dtype=bool)
+        
+        # Distance to the nearest focus car on either side
+        focus = np.sort(focus_x)
+        pos = np.searchsorted(focus, relative_x)
+        ahead = focus[np.minimum(pos, len(focus) - 1)]
+        behind = focus[np.maximum(pos - 1, 0)]
+        nearest = np.minimum(np.abs(relative_x - ahead), np.abs(relative_x - behind))
+        return nearest <= self.lod_radius
+
+    def get_snapshot(self):
+        """Arrays of the spatial index for batched queries, cached until the index changes."""
+        if self._snapshot is None:
+            cars = self._sorted_cars
+            self._snapshot = TrafficSnapshot(
+                relative_x=np.array(self._sorted_x, dtype=float),
+                x=np.array([car.x for car in cars], dtype=float),
+                y=np.array([car.y for car in cars], dtype=float),
+                velocity=np.array([car.velocity for car in cars], dtype=float),
+                lane_relative_x=[np.array(keys, dtype=float) for keys in self._lane_x],
+                lane_x=[np.array([car.x for car in lane_cars], dtype=float)
+                        for lane_cars in self._lane_cars],
+                lane_velocity=[np.array([car.velocity for car in lane_cars], dtype=float)
+                               for lane_cars in self._lane_cars]
+            )
+        return self._snapshot
+
+    def get_lane_cars(self, lane, min_x=-math.inf, max_x=math.inf):
+        """
+        Cars in a lane with min_x <= relative_x <= max_x, sorted by relative_x.
+        
+        Returns a slice of the per-lane index as of the last update.
+        """
+        keys = self._lane_x[lane]
+        lo = bisect_left(keys, min_x)
+        hi = bisect_right(keys, max_x)
+        return self._lane_cars[lane][lo:hi]
+
     def _count_cars_in_lane(self, lane, direction='both'):
         """Count number of cars in the given lane and direction."""
-        lane_y = self._get_lane_y(lane)
-        return sum(1 for car in self.cars 
-                  if (abs(car.y - lane_y) < self.lane_height and 
-                      car.is_active and
-                      (direction == 'both' or
-                       (direction == 'right' and car.velocity > 0) or
-                       (direction == 'left' and car.velocity < 0))))
+        if direction == 'both':
+            return len(self._lane_cars[lane])
+        return self._lane_counts[direction][lane]
 
     def _can_spawn_in_lane(self, lane, spawn_x, direction='right'):
         """Check if it's safe to spawn a car at the given position."""
-        lane_y = self._get_lane_y(lane)
         safe_distance = MIN_CAR_SPACING * 2  # Double spacing for extra safety
         
-        # Check for nearby cars in the same lane
-        for car in self.cars:
-            if not car.is_active:
-                continue
-            
-            if abs(car.y - lane_y) < self.lane_height:  # Same lane
-                # Check distance using relative positions
-                if abs(car.relative_x - spawn_x) < safe_distance:
-                    return False
-                    
-        return True
+        # Check for cars in the same lane strictly within safe_distance
+        keys = self._lane_x[lane]
+        lo = bisect_right(keys, spawn_x - safe_distance)
+        hi = bisect_left(keys, spawn_x + safe_distance)
+        return lo >= hi
 
     def _get_spawn_position(self, direction='right'):
         """Get safe spawn position relative to lead car."""
@@ -86,13 +221,13 @@ class TrafficManager:
         if self._can_spawn_in_lane(lane, spawn_relative_x, direction):
             # Set appropriate velocity based on direction
             if direction == 'right':
-                velocity = random.uniform(MIN_NPC_VELOCITY, MAX_NPC_VELOCITY)
+                velocity = self.rng.uniform(MIN_NPC_VELOCITY, MAX_NPC_VELOCITY)
             else:
-                velocity = -random.uniform(MIN_NPC_VELOCITY, MAX_NPC_VELOCITY)
+                velocity = -self.rng.uniform(MIN_NPC_VELOCITY, MAX_NPC_VELOCITY)
             
             # Create new car at spawn position
             screen_x = spawn_relative_x - self.world_offset
-            new_car = NPCCar(screen_x, self._get_lane_y(lane))
+            new_car = NPCCar(screen_x, self._get_lane_y(lane), self.rng)
             new_car.relative_x = spawn_relative_x
             new_car.velocity = velocity
             
@@ -103,9 +238,48 @@ class TrafficManager:
             new_car.bottom_boundary = self.road_bottom
             
             self.cars.append(new_car)
+            self._index_car(new_car)
+            if self.npc_engine:
+                self.npc_engine.add_car(new_car)
+            
+            if telemetry.active['spawn']:
+                telemetry.record('spawn', -1, screen_x, new_car.y, velocity, lane)
+            
+            self._schedule_decision(new_car)
             
             # Set spawn cooldown
-            self.spawn_cooldowns[direction][lane] = random.uniform(1.0, 3.0)
+            self.scheduler.schedule((direction, lane), self.rng.uniform(1.0, 3.0))
+
+    def _schedule_decision(self, car):
+        """
+        Schedule an NPC's next lane-change decision from its decision timer.
+
+        Only the object engine is scheduled; NPCTraffic keeps its timers as
+        columns and checks them all in one vectorized comparison.
+        """
+        if self.npc_engine:
+            return
+        car.decision_started = self.scheduler.time - car.current_decision_time
+        self.scheduler.schedule_at(car, car.decision_started + car.time_until_next_decision)
+
+    def _resume_decisions(self, car):
+        """
+        Restart the decision timer of an NPC coming back into detail.
+
+        The timer stood still while the car coasted, so its start and its
+        pending decision move later by the time spent coasting.
+
+        Returns:
+            bool: Whether the decision is due this frame
+        """
+        now = self.scheduler.time
+        car.decision_started += now - car.decision_paused_at
+        car.decision_paused_at = None
+        decision_time = car.decision_started + car.time_until_next_decision
+        if decision_time <= now:
+            return True
+        self.scheduler.schedule_at(car, decision_time)
+        return False
 
     def _manage_spawning(self):
         """Manage continuous spawning of traffic in both directions."""
@@ -119,21 +293,22 @@ class TrafficManager:
             
             # Try spawning from right if needed
             if (right_moving < target_per_direction and 
-                self.spawn_cooldowns['right'][lane] <= 0):
+                ('right', lane) not in self.scheduler):
                 self._spawn_car(lane, 'right')
                     
             # Try spawning from left if needed
             if (left_moving < target_per_direction and 
-                self.spawn_cooldowns['left'][lane] <= 0):
+                ('left', lane) not in self.scheduler):
                 self._spawn_car(lane, 'left')
 
     def get_nearby_cars(self, x, y, max_distance):
         """Get list of cars near a specific point."""
+        # Only cars within max_distance along the road can be within range
+        lo = bisect_left(self._sorted_x, x - max_distance)
+        hi = bisect_right(self._sorted_x, x + max_distance)
+        
         nearby = []
-        for car in self.cars:
-            if not car.is_active:
-                continue
-            
+        for car in self._sorted_cars[lo:hi]:
             dx = car.relative_x - x
             dy = car.y - y
             distance = (dx * dx + dy * dy) ** 0.5
@@ -157,27 +332,15 @@ class TrafficManager:
         Returns:
             NPCCar or None: Closest car in lane, if any
         """
-        lane_y = self._get_lane_y(lane)
-        closest_car = None
-        closest_distance = float('inf')
+        keys = self._lane_x[lane]
+        if ahead:
+            # First car strictly ahead of reference_x
+            pos = bisect_right(keys, reference_x)
+            return self._lane_cars[lane][pos] if pos < len(keys) else None
         
-        for car in self.cars:
-            if not car.is_active:
-                continue
-                
-            # Check if car is in the specified lane
-            if abs(car.y - lane_y) < self.lane_height:
-                # Calculate relative distance using relative positions
-                dx = car.relative_x - reference_x
-                
-                # Check if car is in the desired direction
-                if (ahead and dx > 0) or (not ahead and dx < 0):
-                    distance = abs(dx)
-                    if distance < closest_distance:
-                        closest_car = car
-                        closest_distance = distance
-        
-        return closest_car
+        # Last car strictly behind reference_x
+        pos = bisect_left(keys, reference_x) - 1
+        return self._lane_cars[lane][pos] if pos >= 0 else None
 
     def check_collision(self, player_car):
         """Check if player car collides with any NPC cars or boundaries."""
@@ -188,37 +351,96 @@ class TrafficManager:
             player_car.y + player_car.width/2 > self.road_bottom):
             return True
             
-        # Check collisions with NPC cars
-        for car in self.cars:
-            if car.is_active and car.get_rect().colliderect(player_rect):
+        # Only NPCs within a car length (plus rect rounding) of the player can overlap.
+        # NPC screen x is relative_x - world_offset, so search around the player's world x
+        center = player_car.x + self.world_offset
+        reach = CAR_LENGTH + 2
+        lo = bisect_left(self._sorted_x, center - reach)
+        hi = bisect_right(self._sorted_x, center + reach)
+        for car in self._sorted_cars[lo:hi]:
+            if car.get_rect().colliderect(player_rect):
                 return True
                 
         return False
 
-    def update(self, dt, ai_car_or_cars):
-        """Update traffic state."""
+    def update(self, dt, ai_car_or_cars, react_to_ai=True):
+        """
+        Update traffic state.
+        
+        Args:
+            dt (float): Time step in seconds
+            ai_car_or_cars: AI car or list of AI cars; the one furthest
+                ahead anchors the world
+            react_to_ai (bool): Whether NPCs see the AI cars. Without it the
+                traffic only depends on the seed and the lead car's path,
+                which is what lets traffic_tape.py record it once and
+                replay it for every genome.
+        """
         # Handle both single car and multiple cars cases
         ai_cars = [ai_car_or_cars] if not isinstance(ai_car_or_cars, list) else ai_car_or_cars
         
         # Find the lead AI car (furthest ahead)
         self.lead_car = max(ai_cars, key=lambda car: car.relative_x)
         
+        # Full NPC behaviour is only needed around the cars still driving
+        focus_x = ([car.relative_x for car in ai_cars if car.is_active] or
+                   [self.lead_car.relative_x])
+        if not react_to_ai:
+            ai_cars = []
+        
         # Update world offset based on lead car
         self.world_offset = self.lead_car.relative_x - (SCREEN_WIDTH * 0.2)
         
-        # Update spawn cooldowns
-        for direction in self.spawn_cooldowns:
-            self.spawn_cooldowns[direction] = [max(0, cd - dt) for cd in self.spawn_cooldowns[direction]]
+        # Expire spawn cooldowns and collect the NPC decisions due this frame
+        due = set(self.scheduler.advance(dt))
         
         # Clean up cars that are too far away from the lead car
         cleanup_distance = SCREEN_WIDTH + SPAWN_DISTANCE
-        self.cars = [car for car in self.cars 
-                    if (car.is_active and 
-                        abs(car.relative_x - self.lead_car.relative_x) <= cleanup_distance)]
+        if self.npc_engine:
+            keep = self.npc_engine.keep_mask(self.lead_car.relative_x, cleanup_distance)
+            self.npc_engine.compact(keep)
+            self.cars = [car for car, kept in zip(self.cars, keep.tolist()) if kept]
+            
+            # Update all NPC cars in one vectorized step
+            detailed = None
+            if self.lod_radius is not None:
+                detailed = self._detail_mask(self.npc_engine.relative_x[:self.npc_engine.count], focus_x)
+            self.npc_engine.step(dt, ai_cars, self.road_top, self.road_bottom, self.world_offset,
+                                 detailed)
+            self.npc_engine.write_back(self.cars, self.world_offset)
+            self.num_detailed = self.npc_engine.count if detailed is None else int(detailed.sum())
+        else:
+            self.cars = [car for car in self.cars 
+                        if (car.is_active and 
+                            abs(car.relative_x - self.lead_car.relative_x) <= cleanup_distance)]
+            
+            # Update nearby NPC cars fully, let distant ones coast
+            detailed = self._detail_mask(
+                np.array([car.relative_x for car in self.cars], dtype=float), focus_x
+            ).tolist()
+            all_cars = [*self.cars, *ai_cars]
+            now = self.scheduler.time
+            for car, full in zip(self.cars, detailed):
+                if full:
+                    if car.decision_paused_at is None:
+                        decide = car in due
+                    else:
+                        decide = self._resume_decisions(car)
+                    if decide:
+                        car.current_decision_time = now - car.decision_started
+                    car.update(dt, all_cars, self.road_top, self.road_bottom, self.world_offset,
+                               decide)
+                    if decide:
+                        self._schedule_decision(car)
+                else:
+                    # Coasting freezes the decision timer
+                    if car.decision_paused_at is None:
+                        car.decision_paused_at = now
+                    car.coast(self.world_offset)
+            self.num_detailed = sum(detailed)
         
-        # Update all NPC cars
-        for car in self.cars:
-            car.update(dt, [*self.cars, *ai_cars], self.road_top, self.road_bottom, self.world_offset)
+        # Index the new positions once; spawning keeps the index current
+        self._rebuild_index()
         
         # Spawn new cars where needed
         self._manage_spawning()
@@ -226,6 +448,9 @@ class TrafficManager:
     def spawn_initial_traffic(self):
         """Create initial set of NPC cars, ensuring they're off screen."""
         self.cars.clear()
+        self.scheduler.clear()  # Decisions and cooldowns of the old traffic
+        if self.npc_engine:
+            self.npc_engine.clear()
         
         # Initial reference position (assume no lead car yet)
         reference_x = SCREEN_WIDTH * 0.2  # Where player will start
@@ -235,22 +460,30 @@ class TrafficManager:
             for i in range(self.target_cars_per_lane // 2):
                 # Start spawning beyond right edge of screen
                 relative_x = reference_x + SCREEN_WIDTH + SPAWN_DISTANCE + (i * MIN_CAR_SPACING * 2)
-                car = NPCCar(relative_x, self._get_lane_y(lane))
+                car = NPCCar(relative_x, self._get_lane_y(lane), self.rng)
                 car.relative_x = relative_x
-                car.velocity = random.uniform(MIN_NPC_VELOCITY, MAX_NPC_VELOCITY)
+                car.velocity = self.rng.uniform(MIN_NPC_VELOCITY, MAX_NPC_VELOCITY)
                 self.cars.append(car)
+                self._schedule_decision(car)
             
             # Spawn left-moving traffic behind
             for i in range(self.target_cars_per_lane // 2):
                 # Start spawning beyond left edge of screen
                 relative_x = reference_x - SPAWN_DISTANCE - (i * MIN_CAR_SPACING * 2)
-                car = NPCCar(relative_x, self._get_lane_y(lane))
+                car = NPCCar(relative_x, self._get_lane_y(lane), self.rng)
                 car.relative_x = relative_x
-                car.velocity = -random.uniform(MIN_NPC_VELOCITY, MAX_NPC_VELOCITY)
+                car.velocity = -self.rng.uniform(MIN_NPC_VELOCITY, MAX_NPC_VELOCITY)
                 self.cars.append(car)
+                self._schedule_decision(car)
+        
+        if self.npc_engine:
+            for car in self.cars:
+                self.npc_engine.add_car(car)
+        self._rebuild_index()
 
     def draw(self, screen):
-        """Draw all active traffic."""
-        for car in self.cars:
-            if car.is_active:
-                car.draw(screen)
\ No newline at end of file
+        """Draw the active traffic that is on screen."""
+        lo = bisect_left(self._sorted_x, self.world_offset - CAR_LENGTH)
+        hi = bisect_right(self._sorted_x, self.world_offset + SCREEN_WIDTH + CAR_LENGTH)
+        for car in self._sorted_cars[lo:hi]:
+            car.draw(screen)
\ No newline at end of file
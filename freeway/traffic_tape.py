@@ -0,0 +1,265 @@
+# traffic_tape.py
+"""
+Frozen traffic: record a seed's traffic once and replay it from disk.
+
+Taped traffic ignores the AI cars. Its world_offset follows a pace car
+holding full throttle, where live traffic follows the lead AI car. Genomes
+slower than the pace car therefore drift off the left of the screen and end
+on left_boundary, even when they would survive as the leaders of a live
+world.
+
+A tape is only valid for the world it was recorded in, so its directory
+name carries the pace velocity, lane count (FREEWAY_NUM_LANES) and screen
+size along with the seed and frame count.
+"""
+import json
+import os
+import shutil
+import tempfile
+from bisect import bisect_left, bisect_right
+import numpy as np
+import pygame
+from constants import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, SHOULDER_WIDTH, NUM_LANES,
+    MIN_VELOCITY, MAX_VELOCITY, MAX_ACCELERATION, CAR_LENGTH, CAR_WIDTH, SIM_DT
+)
+from traffic_manager import TrafficManager, TrafficSnapshot
+
+# One .npy file per column so every column can be memory-mapped
+TAPE_COLUMNS = ('offsets', 'world_offset', 'relative_x', 'y', 'velocity')
+
+class PaceCar:
+    def __init__(self, pace_velocity=MAX_VELOCITY):
+        """
+        Stand-in lead car the taped traffic is anchored to.
+
+        It drives like an AI car holding full throttle from the usual start
+        position, up to pace_velocity.
+
+        Args:
+            pace_velocity (float): Cruising speed in pixels per frame
+        """
+        self.relative_x = SCREEN_WIDTH * 0.2
+        self.velocity = MIN_VELOCITY
+        self.pace_velocity = pace_velocity
+        self.is_active = True
+
+    def step(self):
+        self.velocity = min(self.velocity + MAX_ACCELERATION, self.pace_velocity)
+        self.relative_x += self.velocity
+
+def record_tape(path, seed, frames, pace_velocity=MAX_VELOCITY, vectorized=True):
+    """
+    Simulate traffic that ignores AI cars and write it out as a tape.
+
+    Frame k of the tape is the traffic AI cars see during simulation frame
+    k, i.e. before the k-th traffic update. Each frame's cars are sorted by
+    relative_x.
+
+    The tape is written to a temporary directory next to path and renamed
+    into place, so other processes never see a half-written tape and no
+    column they have memory-mapped is overwritten. If another process
+    finished the same tape first, its copy is kept.
+
+    Args:
+        path (str): Directory to write the tape to
+        seed (int): Traffic seed
+        frames (int): Frames to record
+        pace_velocity (float): Speed of the pace car anchoring the traffic
+        vectorized (bool): Use the NPCTraffic engine while recording
+
+    Returns:
+        str: path
+    """
+    road_top = SHOULDER_WIDTH
+    road_bottom = SCREEN_HEIGHT - SHOULDER_WIDTH
+    traffic_manager = TrafficManager(road_top, road_bottom, vectorized=vectorized, seed=seed)
+    traffic_manager.spawn_initial_traffic()
+    pace_car = PaceCar(pace_velocity)
+
+    offsets = [0]
+    world_offsets = []
+    relative_x, y, velocity = [], [], []
+    for frame in range(frames):
+        cars = traffic_manager._sorted_cars
+        relative_x.extend(traffic_manager._sorted_x)
+        y.extend(car.y for car in cars)
+        velocity.extend(car.velocity for car in cars)
+        offsets.append(len(relative_x))
+        world_offsets.append(traffic_manager.world_offset)
+
+        pace_car.step()
+        traffic_manager.update(SIM_DT, pace_car, react_to_ai=False)
+
+    parent = os.path.dirname(os.path.abspath(path))
+    os.makedirs(parent, exist_ok=True)
+    temp_path = tempfile.mkdtemp(prefix=os.path.basename(path) + '.', suffix='.tmp', dir=parent)
+    columns = {
+        'offsets': np.array(offsets, dtype=np.int64),
+        'world_offset': np.array(world_offsets, dtype=np.float64),
+        'relative_x': np.array(relative_x, dtype=np.float64),
+        'y': np.array(y, dtype=np.float32),
+        'velocity': np.array(velocity, dtype=np.float32)
+    }
+    for name, column in columns.items():
+        np.save(os.path.join(temp_path, f'{name}.npy'), column)
+    with open(os.path.join(temp_path, 'meta.json'), 'w') as f:
+        json.dump({
+            'seed': seed,
+            'frames': frames,
+            'pace_velocity': pace_velocity,
+            'road_top': road_top,
+            'road_bottom': road_bottom,
+            'num_lanes': NUM_LANES,
+            'screen_width': SCREEN_WIDTH,
+            'screen_height': SCREEN_HEIGHT
+        }, f)
+
+    try:
+        os.rename(temp_path, path)
+    except OSError:
+        if os.path.exists(os.path.join(path, 'meta.json')):
+            # Another process recorded the same tape first
+            shutil.rmtree(temp_path)
+        else:
+            # Columns left without their meta.json by an interrupted recording
+            shutil.rmtree(path)
+            os.rename(temp_path, path)
+    return path
+
+def tape_path(tape_dir, seed, frames, pace_velocity=MAX_VELOCITY):
+    """
+    Where the tape for a seed lives inside a tape directory.
+
+    Every setting that changes the recorded traffic is part of the name, so
+    a different pace car, lane count or screen size records a new tape.
+    """
+    name = (f'seed-{seed}-{frames}-pace-{pace_velocity:g}-lanes-{NUM_LANES}'
+            f'-{SCREEN_WIDTH}x{SCREEN_HEIGHT}')
+    return os.path.join(tape_dir, name)
+
+def ensure_tape(tape_dir, seed, frames, pace_velocity=MAX_VELOCITY):
+    """Record the tape for seed unless it already exists, returning its path"""
+    path = tape_path(tape_dir, seed, frames, pace_velocity)
+    if not os.path.exists(os.path.join(path, 'meta.json')):
+        record_tape(path, seed, frames, pace_velocity)
+    return path
+
+class TrafficTape:
+    def __init__(self, path):
+        """
+        Read-only view of a recorded tape.
+
+        Columns are memory-mapped, so any number of processes can share one
+        copy of the tape through the page cache.
+
+        Args:
+            path (str): Directory written by record_tape
+        """
+        self.path = path
+        with open(os.path.join(path, 'meta.json'), 'r') as f:
+            self.meta = json.load(f)
+        for name in TAPE_COLUMNS:
+            setattr(self, name, np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r'))
+        self.frames = len(self.world_offset)
+
+    def frame(self, index):
+        """
+        Returns:
+            tuple: (relative_x, y, velocity) arrays of the cars in frame index
+        """
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return self.relative_x[start:end], self.y[start:end], self.velocity[start:end]
+
+class TapeTraffic:
+    def __init__(self, tape):
+        """
+        Replays a TrafficTape through the parts of the TrafficManager
+        interface the trainers use: get_snapshot, check_collision, update
+        and the lane helpers. Sensor inputs have to come from
+        BatchInputProcessor.
+
+        The world stays anchored to the tape's pace car, so AI cars that fall
+        behind it leave the screen exactly as they would behind a lead car.
+
+        Args:
+            tape (TrafficTape): Tape to replay
+        """
+        recorded = (tape.meta.get('num_lanes'), tape.meta.get('screen_width'), tape.meta.get('screen_height'))
+        if recorded != (NUM_LANES, SCREEN_WIDTH, SCREEN_HEIGHT):
+            raise ValueError(f"Tape {tape.path} was recorded for {recorded[0]} lanes on a "
+                             f"{recorded[1]}x{recorded[2]} screen, not {NUM_LANES} lanes on "
+                             f"{SCREEN_WIDTH}x{SCREEN_HEIGHT}")
+        self.tape = tape
+        self.road_top = tape.meta['road_top']
+        self.road_bottom = tape.meta['road_bottom']
+        self.lane_height = (self.road_bottom - self.road_top) / NUM_LANES
+        self.num_lanes = NUM_LANES
+        self.lane_centers = self.road_top + (np.arange(NUM_LANES) + 0.5) * self.lane_height
+        self.frame_index = 0
+        self._rect = pygame.Rect(0, 0, CAR_LENGTH, CAR_WIDTH)  # Reused by check_collision
+        self._load_frame()
+
+    # Lane helpers shared with TrafficManager
+    _get_lane_y = TrafficManager._get_lane_y
+    _get_lane = TrafficManager._get_lane
+
+    def _load_frame(self):
+        """Build the snapshot of the current frame"""
+        index = min(self.frame_index, self.tape.frames - 1)
+        relative_x, y, velocity = self.tape.frame(index)
+        self.world_offset = float(self.tape.world_offset[index])
+
+        self._relative_x = np.asarray(relative_x, dtype=float)
+        self._sorted_x = self._relative_x.tolist()
+        y = np.asarray(y, dtype=float)
+        velocity = np.asarray(velocity, dtype=float)
+        x = self._relative_x - self.world_offset
+        self._y = y.tolist()
+
+        # Same lane membership rule as TrafficManager._lanes_for_y
+        in_lane = [np.abs(y - center) < self.lane_height for center in self.lane_centers]
+        self._snapshot = TrafficSnapshot(
+            relative_x=self._relative_x,
+            x=x,
+            y=y,
+            velocity=velocity,
+            lane_relative_x=[self._relative_x[mask] for mask in in_lane],
+            lane_x=[x[mask] for mask in in_lane],
+            lane_velocity=[velocity[mask] for mask in in_lane]
+        )
+
+    def get_snapshot(self):
+        return self._snapshot
+
+    def check_collision(self, player_car):
+        """Check if player car collides with any taped car or leaves the road."""
+        player_rect = player_car.get_rect()
+
+        # Check if player is off road
+        if (player_car.y - player_car.width/2 < self.road_top or
+            player_car.y + player_car.width/2 > self.road_bottom):
+            return True
+
+        # Only cars within a car length (plus rect rounding) can overlap
+        center = player_car.x + self.world_offset
+        reach = CAR_LENGTH + 2
+        lo = bisect_left(self._sorted_x, center - reach)
+        hi = bisect_right(self._sorted_x, center + reach)
+        rect = self._rect
+        for i in range(lo, hi):
+            rect.update(
+                self._sorted_x[i] - self.world_offset - CAR_LENGTH/2,
+                self._y[i] - CAR_WIDTH/2,
+                CAR_LENGTH,
+                CAR_WIDTH
+            )
+            if rect.colliderect(player_rect):
+                return True
+
+        return False
+
+    def update(self, dt, ai_car_or_cars=None):
+        """Advance to the next taped frame; the AI cars do not affect it."""
+        self.frame_index += 1
+        self._load_frame()
@@ -0,0 +1,140 @@
+# vec_environment.py
+import numpy as np
+from constants import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, SHOULDER_WIDTH, NUM_LANES,
+    BASE_REWARD_PER_FRAME, MAX_VELOCITY, SIM_DT
+)
+from player_car import PlayerCar
+from traffic_manager import TrafficManager
+from ai_input_processor import BatchInputProcessor, get_input_size
+from evaluation import MAX_FRAMES
+
+class VecEnvironment:
+    def __init__(self, num_envs, seed=None, max_frames=MAX_FRAMES):
+        """
+        Steps num_envs independent freeway worlds in lockstep.
+
+        Each world is one car in its own seeded TrafficManager. Observations
+        are the same normalized inputs the NEAT networks get from
+        get_car_inputs, and rewards are the trainer's per-frame fitness gain,
+        so NEAT and external RL code see the same problem. Worlds that finish
+        are reset with fresh traffic straight away.
+
+        Args:
+            num_envs (int): Number of worlds
+            seed (int): Root seed, every episode's traffic is derived from it
+            max_frames (int): Frames before an episode is cut off
+        """
+        self.num_envs = num_envs
+        self.max_frames = max_frames
+        self.seed_sequence = np.random.SeedSequence(seed)
+        self.road_top = SHOULDER_WIDTH
+        self.road_bottom = SCREEN_HEIGHT - SHOULDER_WIDTH
+
+        self.cars = [None] * num_envs
+        self.traffic = [None] * num_envs
+        self.input_processor = BatchInputProcessor(1)
+
+        # Preallocated outputs, overwritten by every reset() and step()
+        self.observations = np.zeros((num_envs, get_input_size()))
+        self.rewards = np.zeros(num_envs)
+        self.dones = np.zeros(num_envs, dtype=bool)
+        self.frames = np.zeros(num_envs, dtype=np.int64)
+        self.distances = np.zeros(num_envs)
+        self.episode_returns = np.zeros(num_envs)
+        self.final_distances = np.zeros(num_envs)
+        self.final_returns = np.zeros(num_envs)
+
+    @property
+    def observation_size(self):
+        return self.observations.shape[1]
+
+    def _observe(self, env):
+        self.observations[env] = self.input_processor.compute(
+            [self.cars[env]], self.traffic[env]
+        )[0]
+
+    def reset_world(self, env):
+        """Start a new episode in one world with the next seed"""
+        seed = int(self.seed_sequence.spawn(1)[0].generate_state(1)[0])
+        traffic_manager = TrafficManager(self.road_top, self.road_bottom, seed=seed)
+        traffic_manager.spawn_initial_traffic()
+
+        # Start in the lane the trainer's first car would use
+        lane_height = (self.road_bottom - self.road_top) / NUM_LANES
+        car = PlayerCar(SCREEN_WIDTH * 0.2, self.road_top + lane_height / 2)
+        car.top_boundary = self.road_top
+        car.bottom_boundary = self.road_bottom
+        car.left_boundary = 0
+        car.right_boundary = SCREEN_WIDTH
+        car.current_lane = 0
+
+        self.cars[env] = car
+        self.traffic[env] = traffic_manager
+        self.frames[env] = 0
+        self.episode_returns[env] = 0
+        self._observe(env)
+
+    def reset(self):
+        """
+        Reset every world.
+
+        Returns:
+            np.ndarray: (num_envs, observation_size) observations
+        """
+        for env in range(self.num_envs):
+            self.reset_world(env)
+        return self.observations
+
+    def step(self, actions):
+        """
+        Advance every world by one frame.
+
+        Args:
+            actions (np.ndarray): (num_envs, 2) array of [acceleration,
+                lane_change], both -1 to 1
+
+        Returns:
+            tuple: (observations, rewards, dones, info). The arrays are
+            reused by the next call. Observations of finished worlds are
+            already those of the new episode; info holds the finished
+            episodes' 'final_distance' and 'final_return'.
+        """
+        actions = np.asarray(actions, dtype=float).reshape(self.num_envs, 2).tolist()
+        self.dones[:] = False
+
+        for env, (acceleration, lane_change) in enumerate(actions):
+            car = self.cars[env]
+            traffic_manager = self.traffic[env]
+
+            car.apply_controls(acceleration, lane_change, traffic_manager)
+            car.update(traffic_manager, SIM_DT)
+            if car.is_active and traffic_manager.check_collision(car):
+                car.handle_collision()
+
+            if car.is_active:
+                reward = BASE_REWARD_PER_FRAME * (car.velocity / MAX_VELOCITY) * SIM_DT
+                traffic_manager.update(SIM_DT, car)
+            else:
+                reward = 0.0
+
+            self.frames[env] += 1
+            self.rewards[env] = reward
+            self.episode_returns[env] += reward
+            self.distances[env] = car.total_distance
+            self.dones[env] = not car.is_active or self.frames[env] >= self.max_frames
+
+            if self.dones[env]:
+                self.final_distances[env] = car.total_distance
+                self.final_returns[env] = self.episode_returns[env]
+                self.reset_world(env)
+            else:
+                self._observe(env)
+
+        info = {
+            'final_distance': self.final_distances,
+            'final_return': self.final_returns,
+            'distance': self.distances,
+            'frames': self.frames
+        }
+        return self.observations, self.rewards, self.dones, info
@@ -0,0 +1,147 @@
+import math
+import numpy as np
+from rocket_physics import PhysicsConfig, PhysicsState
+from game_init import get_constants
+
+# Action codes used by Lander.step
+NO_THRUST, LEFT_THRUSTER, MAIN_ENGINE, RIGHT_THRUSTER = 0, 1, 2, 3
+
+class BatchRocketPhysics:
+    """
+    Array-backed physics for many identical landers.
+
+    Holds position, velocity, angle, angular velocity and fuel of every
+    lander as NumPy arrays and applies Lander.step / RocketPhysics.step to
+    all of them in one vectorized step. The Lander objects are kept in sync
+    through write_back so everything else keeps reading them as before.
+
+    Thrust is worked out in closed form instead of rotating a force and its
+    application point per thruster:
+    - main engine: force (F sin a, -F cos a) through the centre line, no torque
+    - side thrusters: force (-F sin a, F cos a), torque -/+ F * width / 2
+      for left/right
+    Results match RocketPhysics to float rounding.
+    """
+    def __init__(self, config: PhysicsConfig, num_landers: int):
+        self.config = config
+        self.num_landers = num_landers
+        self.moment_of_inertia = (config.mass / 12.0) * (config.width ** 2 + config.height ** 2)
+        self.side_torque = config.width / 2 * config.side_engine_force
+
+        self.position = np.zeros((num_landers, 2))  # meters
+        self.velocity = np.zeros((num_landers, 2))  # meters/sec
+        self.angle = np.zeros(num_landers)  # radians
+        self.angular_velocity = np.zeros(num_landers)  # radians/sec
+        self.fuel = np.zeros(num_landers)
+        self.action = np.zeros(num_landers, dtype=int)  # Thruster fired last step
+
+        # Rows that moved in the last step, i.e. the ones write_back copies
+        self.moved = np.arange(0)
+
+    def load(self, landers: list) -> None:
+        """Copy the state of each lander into its row"""
+        for i, lander in enumerate(landers):
+            state = lander.physics.state
+            self.position[i] = state.position
+            self.velocity[i] = state.velocity
+            self.angle[i] = state.angle
+            self.angular_velocity[i] = state.angular_velocity
+            self.fuel[i] = lander.fuel
+        self.action[:] = NO_THRUST
+        self.moved = np.arange(len(landers))
+
+    def step(self, actions, active: np.ndarray) -> None:
+        """Fire each lander's thruster and advance every active lander with fuel left
+
+        Args:
+            actions: Action code per lander (0 none, 1 left, 2 main, 3 right)
+            active: Boolean mask of the landers still in play
+        """
+        const = get_constants()
+        config = self.config
+        dt = config.dt
+
+        # Like Lander.step, landers that are done or out of fuel don't move at all
+        moved = np.flatnonzero(active & (self.fuel > 0))
+        self.moved = moved
+        action = np.asarray(actions, dtype=int)[moved]
+        self.action[moved] = action
+        main = action == MAIN_ENGINE
+        left = action == LEFT_THRUSTER
+        right = action == RIGHT_THRUSTER
+        side = left | right
+
+        # Fuel
+        cost = np.where(main, const.MAIN_ENGINE_FUEL_COST,
+                        np.where(side, const.SIDE_ENGINE_FUEL_COST, 0.0))
+        self.fuel[moved] = np.maximum(0, self.fuel[moved] - cost)
+
+        # Thrust and torque in closed form
+        angle = self.angle[moved]
+        sin_angle = np.sin(angle)
+        cos_angle = np.cos(angle)
+        force = np.where(main, config.main_engine_force,
+                         np.where(side, config.side_engine_force, 0.0))
+        direction = np.where(main, -1.0, 1.0)  # Main pushes along -y, side thrusters along +y
+        acceleration = np.empty((moved.size, 2))
+        acceleration[:, 0] = -direction * sin_angle * force / config.mass
+        acceleration[:, 1] = config.gravity + direction * cos_angle * force / config.mass
+        torque = np.where(left, -self.side_torque, np.where(right, self.side_torque, 0.0))
+        angular_acceleration = torque / self.moment_of_inertia
+
+        # Drag
+        linear_damping = math.exp(-config.linear_drag * dt)
+        angular_damping = math.exp(-config.angular_drag * dt)
+
+        # Integrate, new arrays so states handed out earlier stay as they were
+        velocity = self.velocity[moved]
+        angular_velocity = self.angular_velocity[moved]
+        self.position = self.position.copy()
+        self.velocity = self.velocity.copy()
+        self.position[moved] = self.position[moved] + velocity * dt + 0.5 * acceleration * dt ** 2
+        self.velocity[moved] = velocity * linear_damping + acceleration * dt
+        new_angle = angle + angular_velocity * dt + 0.5 * angular_acceleration * dt ** 2
+        self.angular_velocity[moved] = angular_velocity * angular_damping + angular_acceleration * dt
+
+        # Normalize angle to [-π, π]
+        self.angle[moved] = np.arctan2(np.sin(new_angle), np.cos(new_angle))
+
+    def advance(self, actions, frames: np.ndarray) -> None:
+        """Step each lander for its own number of frames with its action held
+
+        Args:
+            actions: Action code per lander
+            frames: Frames to advance per lander, 0 for the ones not in play
+        """
+        moved = []
+        for frame in range(frames.max(initial=0)):
+            self.step(actions, frames > frame)
+            moved.append(self.moved)
+        if len(moved) != 1:
+            # write_back has to cover every lander that moved in any frame
+            self.moved = np.unique(np.concatenate(moved)) if moved else np.arange(0)
+
+    def write_back(self, landers: list) -> None:
+        """Copy the new state of the landers that moved onto the Lander objects"""
+        moved = self.moved.tolist()
+        rows = zip(
+            moved,
+            self.angle[moved].tolist(),
+            self.angular_velocity[moved].tolist(),
+            self.fuel[moved].tolist(),
+            self.action[moved].tolist()
+        )
+        for i, angle, angular_velocity, fuel, action in rows:
+            lander = landers[i]
+            lander.physics.state = PhysicsState(
+                position=self.position[i],
+                velocity=self.velocity[i],
+                angle=angle,
+                angular_velocity=angular_velocity
+            )
+            lander.fuel = fuel
+            lander.thrusters = {
+                'main': action == MAIN_ENGINE,
+                'left': action == LEFT_THRUSTER,
+                'right': action == RIGHT_THRUSTER
+            }
@@ -7,9 +7,21 @@ from renderer import Renderer
 from game_init import get_constants
 from typing import List, Tuple, Dict, Any
 from reward_tracker import RewardTracker
+from batch_physics import BatchRocketPhysics
 
 class MultiLanderEnv:
-    def __init__(self, num_landers: int = 20, fast_mode: bool = False):
+    def __init__(self, num_landers: int = 20, fast_mode: bool = False, batched_physics: bool = True,
+                 adaptive_timestep: bool = False, max_frames_per_step: int = 8):
+        """
+        Args:
+            num_landers: Landers flying at once
+            fast_mode: Skip rendering
+            batched_physics: Step every lander in one vectorized BatchRocketPhysics
+                step instead of one RocketPhysics step per lander
+            adaptive_timestep: Let landers far from terrain and screen edges cover
+                several frames per step with their action held, see _plan_frames
+            max_frames_per_step: Longest macro-step in frames when adaptive
+        """
         const = get_constants()
         
         # Initialize environment settings
@@ -19,6 +31,11 @@ class MultiLanderEnv:
         self.landers: List[Lander] = []
         self.terrain = None
         self.fast_mode = fast_mode
+        self.batched_physics = batched_physics
+        self.physics = None
+        self.adaptive_timestep = adaptive_timestep
+        self.max_frames_per_step = max_frames_per_step
+        self.frames = None  # Frames simulated per lander this episode
         
         # Set a fixed seed for reproducibility
         np.random.seed(42)
@@ -61,10 +78,33 @@ class MultiLanderEnv:
         dones = []
         info = {'landers': []}
         
+        # Move every lander at once, then handle each as usual
+        active = np.array([lander.active for lander in self.landers])
+        if self.adaptive_timestep:
+            frames = self._plan_frames(actions, active)
+        else:
+            frames = active.astype(int)
+        self.frames += frames
+        if self.physics:
+            self.physics.advance(actions, frames)
+            self.physics.write_back(self.landers)
+        else:
+            for lander, action, lander_frames in zip(self.landers, actions, frames.tolist()):
+                for _ in range(lander_frames):
+                    lander.step(action)
+        frames = frames.tolist()
+        
+        # Terrain collisions of every active lander in one batched query
+        active_indices = np.flatnonzero(active)
+        crashed = np.zeros(len(self.landers), dtype=bool)
+        crashed[active_indices] = self.terrain.check_collisions(
+            [self.landers[i] for i in active_indices.tolist()]
+        )
+        
         # Process each lander
         for i, (lander, action) in enumerate(zip(self.landers, actions)):
             # Get state from lander
-            state = lander.step(action)
+            state = lander.get_state()
             states.append(state)
             
             # Get reward tracker for this lander
@@ -82,7 +122,7 @@ class MultiLanderEnv:
                 continue
             
             # Calculate reward components for active lander
-            reward_components = reward_tracker.calculate_survival_reward(lander, self.terrain)
+            reward_components = reward_tracker.calculate_survival_reward(lander, self.terrain, frames[i])
             
             # Check termination conditions
             terminal_reward = 0.0
@@ -90,7 +130,7 @@ class MultiLanderEnv:
             if self.terrain.check_landing(lander.x, lander.y, lander.velocity_y, lander):
                 lander.terminate('landed')
                 terminal_reward = reward_tracker.calculate_terminal_reward(lander, self.terrain, 'landed')
-            elif self.terrain.check_collision(lander.x, lander.y, lander):
+            elif crashed[i]:
                 lander.terminate('crashed')
                 terminal_reward = reward_tracker.calculate_terminal_reward(lander, self.terrain, 'crashed')
             elif (lander.x < 0 or lander.x > self.width or lander.y < 0):
@@ -142,6 +182,7 @@ class MultiLanderEnv:
         info['quit'] = False
         info['all_done'] = all_done
         info['steps'] = self.steps
+        info['frames'] = frames
         
         return states, rewards, [all_done] * len(self.landers), info
     
@@ -153,6 +194,7 @@ class MultiLanderEnv:
         # Clear existing landers
         self.landers = []
         self.steps = 0
+        self.frames = np.zeros(self.num_landers, dtype=int)
         
         # Reset episode rewards tracking and reward trackers
         self.episode_rewards = [0] * self.num_landers
@@ -173,10 +215,65 @@ class MultiLanderEnv:
         # Create new landers all at the same position
         for _ in range(self.num_landers):
             self.landers.append(Lander(spawn_x, spawn_y, self.terrain))
+        
+        if self.batched_physics:
+            self.physics = BatchRocketPhysics(self.landers[0].physics.config, self.num_landers)
+            self.physics.load(self.landers)
             
         # Return initial states
         return [lander.get_state() for lander in self.landers]
     
+    def _plan_frames(self, actions: List[int], active: np.ndarray) -> np.ndarray:
+        """Frames each lander covers this step, 0 for the ones not in play
+        
+        A lander gets a macro-step of up to max_frames_per_step frames with
+        its action held only while a swept bound on where it can be by then
+        stays clear of everything that can end its episode. The bound grows
+        a circle around body and legs by the current speed plus gravity and
+        full thrust over the whole step, and must keep off the highest
+        terrain point (less the landing tolerance) and the screen edges.
+        Anywhere near them the lander is stepped one frame at a time, so
+        landings, crashes and bounds are caught on the same frame as with
+        the fixed step.
+        """
+        const = get_constants()
+        config = self.landers[0].physics.config
+        frames = active.astype(int)
+        
+        x = np.array([lander.x for lander in self.landers])
+        y = np.array([lander.y for lander in self.landers])
+        speed_x = np.abs([lander.velocity_x for lander in self.landers])
+        speed_y = np.abs([lander.velocity_y for lander in self.landers])
+        
+        # A lander that runs out of fuel mid-step would have stopped moving
+        fuel = np.array([lander.fuel for lander in self.landers])
+        cost = np.array([
+            const.MAIN_ENGINE_FUEL_COST if action == 2 else
+            const.SIDE_ENGINE_FUEL_COST if action in (1, 3) else 0.0
+            for action in actions
+        ])
+        fuel_frames = np.full(len(self.landers), np.inf)
+        fuel_frames[cost > 0] = np.floor(fuel[cost > 0] / cost[cost > 0])
+        
+        max_acceleration = (config.gravity + max(config.main_engine_force, config.side_engine_force)
+                            / config.mass) * const.PIXELS_PER_METER
+        radius = self.landers[0].radius + 1  # Vertices are truncated to whole pixels
+        ground = min(self.terrain.height_map.min(), self.height) - const.LANDING_PAD_TOLERANCE - radius
+        
+        step_frames = 2
+        while step_frames <= self.max_frames_per_step:
+            duration = step_frames * const.DT
+            reach_x = speed_x * duration + 0.5 * max_acceleration * duration ** 2
+            reach_y = speed_y * duration + 0.5 * max_acceleration * duration ** 2
+            clear = (
+                active & (fuel_frames >= step_frames) &
+                (x - reach_x > 0) & (x + reach_x < self.width) &
+                (y - reach_y > 0) & (y + reach_y < ground)
+            )
+            frames[clear] = step_frames
+            step_frames *= 2
+        return frames
+    
     def render(self) -> bool:
         """Render current state"""
         if self.fast_mode:
@@ -4,6 +4,16 @@ import math
 import terrain as Terrain
 from game_init import get_constants
 import random
+from typing import NamedTuple
+
+class LanderGeometry(NamedTuple):
+    """Lander outline in screen pixels for one physics state"""
+    state: PhysicsState  # State it was computed from
+    x: float
+    y: float
+    vertices: list  # Body corners
+    legs: tuple  # ((left_start, left_end), (right_start, right_end))
+    contact_points: list  # Body corners and both feet
 
 class Lander:
     def __init__(self, x: float, y: float, terrain: Terrain):
@@ -52,6 +62,25 @@ class Lander:
         self.width = const.LANDER_WIDTH
         self.height = const.LANDER_HEIGHT
         self.leg_length = const.LEG_LENGTH
+        self.pixels_per_meter = const.PIXELS_PER_METER
+        
+        # Body corners then leg start/end points, relative to the centre (in pixels)
+        half_width = self.width / 2
+        half_height = self.height / 2
+        self._outline = [
+            (-half_width, -half_height),  # Top left
+            (half_width, -half_height),   # Top right
+            (half_width, half_height),    # Bottom right
+            (-half_width, half_height),   # Bottom left
+            (-half_width, half_height),   # Left leg start
+            (-half_width - self.leg_length * 0.7, half_height + self.leg_length),  # Left leg end, angled outward
+            (half_width, half_height),    # Right leg start
+            (half_width + self.leg_length * 0.7, half_height + self.leg_length)   # Right leg end
+        ]
+        self._geometry = None
+        
+        # Radius of a circle around the body and legs (in pixels)
+        self.radius = max(math.hypot(px, py) for px, py in self._outline)
         
         # Active state
         self.active = True
@@ -71,14 +100,12 @@ class Lander:
     @property
     def x(self) -> float:
         """Get x position in pixels"""
-        const = get_constants()
-        return self.physics.state.position[0] * const.PIXELS_PER_METER
+        return self.geometry.x
         
     @property
     def y(self) -> float:
         """Get y position in pixels"""
-        const = get_constants()
-        return self.physics.state.position[1] * const.PIXELS_PER_METER
+        return self.geometry.y
         
     @property
     def angle(self) -> float:
@@ -88,96 +115,60 @@ class Lander:
     @property
     def velocity_x(self) -> float:
         """Get x velocity in pixels/sec"""
-        const = get_constants()
-        return self.physics.state.velocity[0] * const.PIXELS_PER_METER
+        return self.physics.state.velocity[0] * self.pixels_per_meter
         
     @property
     def velocity_y(self) -> float:
         """Get y velocity in pixels/sec"""
-        const = get_constants()
-        return self.physics.state.velocity[1] * const.PIXELS_PER_METER
+        return self.physics.state.velocity[1] * self.pixels_per_meter
         
     @property
     def angular_velocity(self) -> float:
         """Get angular velocity in radians/sec"""
         return self.physics.state.angular_velocity
 
-    def get_vertices(self) -> list:
-        """Get vertices for rendering, with rotation applied"""
-        # Define vertices relative to center (in pixels)
-        half_width = self.width / 2
-        half_height = self.height / 2
-        vertices = [
-            (-half_width, -half_height),  # Top left
-            (half_width, -half_height),   # Top right
-            (half_width, half_height),    # Bottom right
-            (-half_width, half_height)    # Bottom left
+    @property
+    def geometry(self) -> LanderGeometry:
+        """Pixel position, body and legs for the current physics state
+
+        Worked out on first use after each physics step and shared by
+        landing, collision and rendering until the state changes again.
+        """
+        geometry = self._geometry
+        state = self.physics.state
+        if geometry is not None and geometry.state is state:
+            return geometry
+        
+        x = state.position[0] * self.pixels_per_meter
+        y = state.position[1] * self.pixels_per_meter
+        cos_angle = math.cos(state.angle)
+        sin_angle = math.sin(state.angle)
+        
+        # Rotate every outline point once and translate to the lander position
+        points = [
+            (int(px * cos_angle - py * sin_angle + x), int(px * sin_angle + py * cos_angle + y))
+            for px, py in self._outline
         ]
-        
-        # Apply rotation and translation
-        cos_angle = math.cos(self.angle)
-        sin_angle = math.sin(self.angle)
-        
-        rotated_vertices = []
-        for vx, vy in vertices:
-            # Rotate point
-            rotated_x = vx * cos_angle - vy * sin_angle
-            rotated_y = vx * sin_angle + vy * cos_angle
-            
-            # Translate to lander position
-            final_x = int(rotated_x + self.x)
-            final_y = int(rotated_y + self.y)
-            
-            rotated_vertices.append((final_x, final_y))
-        
-        return rotated_vertices
+        vertices = points[:4]
+        left_start, left_end, right_start, right_end = points[4:]
+        
+        self._geometry = LanderGeometry(
+            state=state,
+            x=x,
+            y=y,
+            vertices=vertices,
+            legs=((left_start, left_end), (right_start, right_end)),
+            contact_points=vertices + [left_end, right_end]
+        )
+        return self._geometry
+
+    def get_vertices(self) -> list:
+        """Get vertices for rendering, with rotation applied (shared, don't modify)"""
+        return self.geometry.vertices
 
     def get_leg_positions(self) -> tuple:
         """Get leg endpoints for rendering, with rotation applied"""
-        cos_angle = math.cos(self.angle)
-        sin_angle = math.sin(self.angle)
-        
-        # Left leg
-        left_base_x = -self.width/2
-        left_base_y = self.height/2
-        
-        # Rotate base point
-        left_rotated_x = left_base_x * cos_angle - left_base_y * sin_angle
-        left_rotated_y = left_base_x * sin_angle + left_base_y * cos_angle
-        
-        # Translate to lander position
-        left_start = (int(left_rotated_x + self.x), int(left_rotated_y + self.y))
-        
-        # Calculate leg end point with angle
-        left_end_x = left_base_x - self.leg_length * 0.7  # Angle the legs outward
-        left_end_y = left_base_y + self.leg_length
-        
-        # Rotate and translate end point
-        left_end_rotated_x = left_end_x * cos_angle - left_end_y * sin_angle
-        left_end_rotated_y = left_end_x * sin_angle + left_end_y * cos_angle
-        left_end = (int(left_end_rotated_x + self.x), int(left_end_rotated_y + self.y))
-        
-        # Right leg (mirror of left leg)
-        right_base_x = self.width/2
-        right_base_y = self.height/2
-        
-        # Rotate base point
-        right_rotated_x = right_base_x * cos_angle - right_base_y * sin_angle
-        right_rotated_y = right_base_x * sin_angle + right_base_y * cos_angle
-        
-        # Translate to lander position
-        right_start = (int(right_rotated_x + self.x), int(right_rotated_y + self.y))
-        
-        # Calculate leg end point with angle
-        right_end_x = right_base_x + self.leg_length * 0.7  # Angle the legs outward
-        right_end_y = right_base_y + self.leg_length
-        
-        # Rotate and translate end point
-        right_end_rotated_x = right_end_x * cos_angle - right_end_y * sin_angle
-        right_end_rotated_y = right_end_x * sin_angle + right_end_y * cos_angle
-        right_end = (int(right_end_rotated_x + self.x), int(right_end_rotated_y + self.y))
-        
-        return ((left_start, left_end), (right_start, right_end))
+        return self.geometry.legs
 
     def terminate(self, reason: str):
         """Set lander to terminated state"""
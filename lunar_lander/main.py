@@ -164,6 +164,8 @@ def main():
     parser.add_argument('--checkpoint-interval', type=int, default=250, 
                        help='How often to save checkpoints (in generations)')
     parser.add_argument('--injection', action='store_true', help='Enable genome injection')  # Add injection argument
+    parser.add_argument('--adaptive-timestep', action='store_true',
+                       help='Hold actions over several frames while landers are far from the ground')
     args = parser.parse_args()
 
     # Verify config file exists
@@ -186,7 +188,8 @@ def main():
             num_landers=args.num_landers,
             checkpoint_interval=args.checkpoint_interval,
             fast_mode=args.fast,
-            inject_genomes=args.injection  # Pass the injection flag
+            inject_genomes=args.injection,  # Pass the injection flag
+            adaptive_timestep=args.adaptive_timestep
         )
         
         try:
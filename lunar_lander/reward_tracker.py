@@ -57,10 +57,14 @@ class RewardTracker:
         }
         self.accumulated_survival_reward = 0.0
 
-    def calculate_survival_reward(self, lander, terrain) -> Dict[str, Any]:
+    def calculate_survival_reward(self, lander, terrain, frames: int = 1) -> Dict[str, Any]:
         """
         Calculate reward components based on current lander state
         Returns dict containing all reward components and ratios for this frame
+        
+        frames is how many frames the step covered; the survival components
+        are counted once per frame so a held macro-step earns the same as
+        the single frames it replaces
         """
         # Calculate base metrics
         raw_distance_x = terrain.landing_pad_x - lander.x  # Flipped from (lander - pad) to (pad - lander)
@@ -101,6 +105,8 @@ class RewardTracker:
             'angle': survival_reward_base * 0.5 * angle_ratio,
             'velocity': survival_reward_base * 0.25 * velocity_ratio
         }
+        if frames != 1:
+            survival_components = {key: value * frames for key, value in survival_components.items()}
         
         # Calculate frame survival bonus
         frame_survival_bonus = sum(survival_components.values())
@@ -27,6 +27,7 @@ class Terrain:
         # Generate initial terrain
         self.points = self._generate()
         self._generate_segments()
+        self._build_height_map()
 
     
     def _generate(self) -> List[Tuple[int, int]]:
@@ -106,39 +107,63 @@ class Terrain:
         for i in range(len(self.points) - 1):
             self.segments.append((self.points[i], self.points[i + 1]))
 
+    def _build_height_map(self):
+        """Precompute the ground height under every pixel column for O(1) lookups
+
+        Where segments meet (and at the vertical step at the pad's right
+        edge) a column belongs to several segments; it keeps the highest
+        ground, i.e. the smallest y, since a point below any of them collides.
+        Columns no segment covers hold inf.
+        """
+        heights = np.full(self.width + 1, np.inf)
+        for (x1, y1), (x2, y2) in self.segments:
+            columns = np.arange(max(x1, 0), min(x2, self.width) + 1)
+            if x2 - x1 == 0:  # Vertical line segment
+                terrain_y = np.full(columns.size, float(y1))
+            else:
+                slope = (y2 - y1) / (x2 - x1)
+                terrain_y = y1 + slope * (columns - x1)
+            heights[columns] = np.minimum(heights[columns], terrain_y)
+        self.height_map = heights
+
+    def surface_y(self, x) -> np.ndarray:
+        """Ground height at pixel columns x (any array shape), inf off the terrain
+
+        Lander geometry is already truncated to whole pixels, so the lookup
+        is exact for it.
+        """
+        columns = np.floor(x).astype(int)
+        inside = (columns >= 0) & (columns < self.height_map.size)
+        return np.where(inside, self.height_map[np.clip(columns, 0, self.height_map.size - 1)], np.inf)
+
+    def _collision_points(self, lander) -> list:
+        """The 4 body vertices followed by the 2 feet"""
+        return lander.geometry.contact_points
+
     def check_collision(self, x: float, y: float, lander) -> bool:
         """Check if lander collides with terrain"""
-        const = get_constants()
-        
         # Quick bounds check
         if y >= self.height:
             return True
-            
-        # Get lander vertices and legs
-        vertices = lander.get_vertices()
-        left_leg, right_leg = lander.get_leg_positions()
+        return bool(self.check_collisions([lander])[0])
+
+    def check_collisions(self, landers: list) -> np.ndarray:
+        """check_collision for many landers with one batched height-map lookup
+
+        Returns:
+            Boolean array, True for each lander touching the terrain or below the screen
+        """
+        const = get_constants()
+        if not landers:
+            return np.zeros(0, dtype=bool)
+        
+        points = np.array([self._collision_points(lander) for lander in landers])  # (n, 6, 2)
         
-        # Combine all points to check
-        points_to_check = vertices + [left_leg[1], right_leg[1]]
-        
-        # Check each point against terrain
-        for i, (point_x, point_y) in enumerate(points_to_check):
-            point_type = "vertex" if i < len(vertices) else "leg"
-            for (x1, y1), (x2, y2) in self.segments:
-                if x1 <= point_x <= x2:  # Point is within segment x-range
-                    if x2 - x1 == 0:  # Vertical line segment
-                        terrain_y = y1
-                    else:
-                        slope = (y2 - y1) / (x2 - x1)
-                        terrain_y = y1 + slope * (point_x - x1)
-                    
-                    # Add tolerance for leg points during landing
-                    tolerance = const.LANDING_PAD_TOLERANCE if point_type == "leg" else 0
-                    
-                    if point_y > terrain_y + tolerance:
-                        return True
-                        
-        return False
+        # Feet get some tolerance for landing
+        tolerance = np.array([0, 0, 0, 0, const.LANDING_PAD_TOLERANCE, const.LANDING_PAD_TOLERANCE])
+        below_ground = points[..., 1] > self.surface_y(points[..., 0]) + tolerance
+        below_screen = np.array([lander.y for lander in landers]) >= self.height
+        return below_screen | below_ground.any(axis=1)
 
     def check_landing(self, x: float, y: float, velocity_y: float, lander) -> bool:
         """Check if lander has achieved safe landing on pad"""
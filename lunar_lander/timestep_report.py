@@ -0,0 +1,119 @@
+"""
+Compare the adaptive timestep against the fixed-step reference.
+
+Flies the same genomes over the same terrains once with the fixed 1/60 s
+step and once with MultiLanderEnv(adaptive_timestep=True), then reports
+how many steps each needed and how far fitness, termination reasons and
+final positions drift apart.
+
+    python timestep_report.py --episodes 5 --max-frames 8
+"""
+import argparse
+import os
+import pickle
+import random
+import time
+import numpy as np
+import neat
+import game_init
+
+
+def make_genomes(config: neat.Config, count: int, seed: int) -> list:
+    """A fresh seeded population of count genomes"""
+    random.seed(seed)
+    config.pop_size = count
+    return list(neat.Population(config).population.values())
+
+
+def run_episodes(networks: list, episodes: int, adaptive: bool, max_frames: int) -> dict:
+    """Fly every network for a number of episodes and record how each lander ended"""
+    from environment import MultiLanderEnv
+    from input_handler import InputHandler
+    from terrain import Terrain
+    from trainer import output_to_action
+
+    # Same terrain sequence for both runs
+    Terrain._last_pad_was_left = False
+    env = MultiLanderEnv(num_landers=len(networks), fast_mode=True,
+                         adaptive_timestep=adaptive, max_frames_per_step=max_frames)
+    input_handler = InputHandler()
+
+    results = {'steps': 0, 'frames': [], 'fitness': [], 'reasons': [], 'x': [], 'y': [], 'seconds': 0.0}
+    start = time.perf_counter()
+    for episode in range(episodes):
+        if episode:
+            env.reset()
+        done = False
+        rewards = []
+        while not done:
+            actions = [
+                output_to_action(network.activate(input_handler.get_state(lander, env.terrain)))
+                if lander.active else 0
+                for network, lander in zip(networks, env.landers)
+            ]
+            _, rewards, dones, _ = env.step(actions)
+            results['steps'] += 1
+            done = all(dones)
+        results['frames'].extend(env.frames.tolist())
+        results['fitness'].extend(rewards)
+        results['reasons'].extend(lander.terminate_reason for lander in env.landers)
+        results['x'].extend(lander.x for lander in env.landers)
+        results['y'].extend(lander.y for lander in env.landers)
+    results['seconds'] = time.perf_counter() - start
+    env.close()
+    return results
+
+
+def report(fixed: dict, adaptive: dict) -> None:
+    """Print step savings and the error of the adaptive run against the fixed one"""
+    fitness_fixed = np.array(fixed['fitness'], dtype=float)
+    fitness_adaptive = np.array(adaptive['fitness'], dtype=float)
+    fitness_error = np.abs(fitness_adaptive - fitness_fixed) / np.maximum(1.0, np.abs(fitness_fixed))
+    position_error = np.hypot(np.subtract(adaptive['x'], fixed['x']), np.subtract(adaptive['y'], fixed['y']))
+    frame_error = np.abs(np.subtract(adaptive['frames'], fixed['frames']))
+    same_reason = np.mean([a == b for a, b in zip(adaptive['reasons'], fixed['reasons'])])
+
+    print(f"Steps:            fixed {fixed['steps']:6d}  adaptive {adaptive['steps']:6d}  "
+          f"({fixed['steps'] / max(1, adaptive['steps']):.2f}x fewer)")
+    print(f"Time:             fixed {fixed['seconds']:6.2f}s adaptive {adaptive['seconds']:6.2f}s")
+    print(f"Same ending:      {same_reason:.1%} of landers")
+    print(f"Fitness error:    mean {fitness_error.mean():.3%}  max {fitness_error.max():.3%} (relative)")
+    print(f"Final position:   mean {position_error.mean():.1f}px  max {position_error.max():.1f}px off")
+    print(f"Episode length:   mean {frame_error.mean():.1f}  max {frame_error.max()} frames off")
+
+    reasons = sorted(set(fixed['reasons']) | set(adaptive['reasons']), key=str)
+    for reason in reasons:
+        print(f"  {str(reason):14s} fixed {fixed['reasons'].count(reason):4d}  "
+              f"adaptive {adaptive['reasons'].count(reason):4d}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare the adaptive timestep against the fixed step')
+    parser.add_argument('--episodes', type=int, default=5, help='Episodes (terrains) to fly')
+    parser.add_argument('--num-landers', type=int, default=20, help='Genomes flown per episode')
+    parser.add_argument('--max-frames', type=int, default=8, help='Longest adaptive macro-step in frames')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the generated genomes')
+    parser.add_argument('--genomes', type=str, help='Pickled list of genomes to fly instead of fresh ones')
+    parser.add_argument('--config', type=str, default=os.path.join(os.path.dirname(__file__), 'config-lunar.txt'),
+                        help='NEAT config file')
+    args = parser.parse_args()
+
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    game_init.init()
+
+    config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                         neat.DefaultSpeciesSet, neat.DefaultStagnation, args.config)
+    if args.genomes:
+        with open(args.genomes, 'rb') as f:
+            genomes = pickle.load(f)
+    else:
+        genomes = make_genomes(config, args.num_landers, args.seed)
+    networks = [neat.nn.FeedForwardNetwork.create(genome, config) for genome in genomes]
+
+    fixed = run_episodes(networks, args.episodes, adaptive=False, max_frames=args.max_frames)
+    adaptive = run_episodes(networks, args.episodes, adaptive=True, max_frames=args.max_frames)
+    report(fixed, adaptive)
+
+
+if __name__ == "__main__":
+    main()
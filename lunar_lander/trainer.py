@@ -9,16 +9,38 @@ from typing import Tuple, Optional, Dict, Any
 import matplotlib.pyplot as plt
 from input_handler import InputHandler
 from best_genome_logger import BestGenomeLogger
+from population_network import PopulationNetwork, outputs_to_actions
 
 
+def output_to_action(output) -> int:
+    """Map the 3 network outputs (left, main, right) to an action code"""
+    action = 0
+    if len(output) >= 3:
+        # Convert from [-1,1] to [0,1] range if using tanh activation
+        normalized_outputs = [(x + 1) / 2 for x in output]
+        threshold = 0.5
+        
+        # Check thrusters with threshold
+        if normalized_outputs[0] > threshold:  # Left thruster
+            action = 1
+        elif normalized_outputs[2] > threshold:  # Right thruster
+            action = 3
+        elif normalized_outputs[1] > threshold:  # Main thruster
+            action = 2
+    return action
+
 
 class LanderTrainer:
     fittest_genomes = []  # Will store top genomes by fitness
     MAX_STORED_GENOMES = 7
 
-    def __init__(self, num_landers: int = 20, checkpoint_interval: int = 5, fast_mode: bool = False, inject_genomes: bool = False):
+    def __init__(self, num_landers: int = 20, checkpoint_interval: int = 5, fast_mode: bool = False, inject_genomes: bool = False,
+                 adaptive_timestep: bool = False):
         """
         Initialize the trainer with genome logging
+        
+        adaptive_timestep lets landers far from the ground hold their action
+        over several frames per step, see MultiLanderEnv._plan_frames
         """
         # Initialize genome logger first
         self.const = get_constants()
@@ -28,7 +50,8 @@ class LanderTrainer:
         
         try:
             # Initialize components
-            self.env = MultiLanderEnv(num_landers=num_landers, fast_mode=fast_mode)
+            self.env = MultiLanderEnv(num_landers=num_landers, fast_mode=fast_mode,
+                                      adaptive_timestep=adaptive_timestep)
             self.logger.debug("Environment initialized")
             
             self.input_handler = InputHandler()
@@ -154,6 +177,10 @@ class LanderTrainer:
             batch_networks = networks[i:i + self.env.num_landers]
             batch_genomes = genome_list[i:i + self.env.num_landers]
             
+            # One dense network for the whole batch when the genomes line up
+            population_network = PopulationNetwork.create(batch_networks)
+            batch_size = len(batch_networks)
+            
             # Pad batch if needed
             while len(batch_networks) < self.env.num_landers:
                 batch_networks.append(None)
@@ -168,34 +195,26 @@ class LanderTrainer:
             while not done:
                 # Get actions for each lander
                 actions = []
-                for idx, (network, lander) in enumerate(zip(batch_networks, self.env.landers)):
-                    if network is None:
-                        actions.append(0)  # No-op for padding networks
-                        continue
+                if population_network is not None:
+                    inputs = np.array([
+                        self.input_handler.get_state(lander, self.env.terrain)
+                        for lander in self.env.landers[:batch_size]
+                    ])
+                    actions = outputs_to_actions(population_network.activate(inputs)).tolist()
+                    actions += [0] * (self.env.num_landers - batch_size)  # No-op for padding networks
+                else:
+                    for idx, (network, lander) in enumerate(zip(batch_networks, self.env.landers)):
+                        if network is None:
+                            actions.append(0)  # No-op for padding networks
+                            continue
                         
-                    try:
-                        state = self.input_handler.get_state(lander, self.env.terrain)
-                        output = network.activate(state)
-                        
-                        # Convert network output to action
-                        action = 0
-                        if len(output) >= 3:
-                            # Convert from [-1,1] to [0,1] range if using tanh activation
-                            normalized_outputs = [(x + 1) / 2 for x in output]
-                            threshold = 0.5
-                            
-                            # Check thrusters with threshold
-                            if normalized_outputs[0] > threshold:  # Left thruster
-                                action = 1
-                            elif normalized_outputs[2] > threshold:  # Right thruster
-                                action = 3
-                            elif normalized_outputs[1] > threshold:  # Main thruster
-                                action = 2
-                            
-                        actions.append(action)
-                    except Exception as e:
-                        print(f"Error activating network: {e}")
-                        actions.append(0)
+                        try:
+                            state = self.input_handler.get_state(lander, self.env.terrain)
+                            output = network.activate(state)
+                            actions.append(output_to_action(output))
+                        except Exception as e:
+                            print(f"Error activating network: {e}")
+                            actions.append(0)
                 
                 try:
                     # Step environment
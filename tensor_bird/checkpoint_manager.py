@@ -2,9 +2,9 @@
 import pickle
 from dataclasses import dataclass
 from typing import List, Tuple
-import pygame
 import copy
 import os
+from constants import PIPE_GAP
 
 @dataclass
 class GameState:
@@ -37,6 +37,7 @@ class CheckpointManager:
             pipe_state = {
                 'x': pipe.x,
                 'gap_y': pipe.gap_y,
+                'gap_size': pipe.gap_size,
                 'passed': pipe.passed,
                 'top_y': pipe.top_y,
                 'bottom_y': pipe.bottom_y,
@@ -90,30 +91,10 @@ class CheckpointManager:
         # Restore complete pipe states
         pipes = []
         for pipe_state in state.pipe_states:
-            pipe = pipe_class(pipe_state['x'])
-            pipe.gap_y = pipe_state['gap_y']
+            # The pipe rebuilds its own rects and sprite offsets from its gap
+            pipe = pipe_class(pipe_state['x'], pipe_state['gap_y'],
+                              pipe_state.get('gap_size', PIPE_GAP))
             pipe.passed = pipe_state['passed']
-            pipe.top_y = pipe_state['top_y']
-            pipe.bottom_y = pipe_state['bottom_y']
-            pipe.height = pipe_state['height']
-            
-            # Properly restore collision rectangles
-            top_rect = pipe_state['top_rect']
-            bottom_rect = pipe_state['bottom_rect']
-            
-            pipe.top_rect = pygame.Rect(
-                top_rect['x'], 
-                top_rect['y'], 
-                top_rect['width'], 
-                top_rect['height']
-            )
-            
-            pipe.bottom_rect = pygame.Rect(
-                bottom_rect['x'], 
-                bottom_rect['y'], 
-                bottom_rect['width'], 
-                bottom_rect['height']
-            )
             
             pipes.append(pipe)
             
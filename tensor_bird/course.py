@@ -0,0 +1,238 @@
+# course.py
+import json
+import random
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Optional
+from constants import (
+    SCREEN_HEIGHT,
+    PIPE_GAP,
+    PIPE_TOP_MARGIN,
+    PIPE_BOTTOM_MARGIN,
+    PIPE_SPACING,
+    FIRST_PIPE_X,
+    VISIBLE_PIPES
+)
+from pipe import Pipe, MIN_GAP_Y, MAX_GAP_Y
+
+# Gap positions at the very top and very bottom of the playable area
+HIGH_GAP_Y = PIPE_TOP_MARGIN
+LOW_GAP_Y = SCREEN_HEIGHT - PIPE_GAP - PIPE_BOTTOM_MARGIN
+
+class CourseGenerator(ABC):
+    """
+    Produces the sequence of pipe gap positions a generation flies through.
+
+    Subclasses implement next_gap() and, if they keep state, reset().
+    Generators only deal in gap_y values so trainers can build whatever
+    pipe representation they need from them. gap_size and spacing apply to
+    every pipe the generator builds.
+    """
+    def __init__(self, seed=None):
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.gap_size = PIPE_GAP
+        self.spacing = PIPE_SPACING
+
+    def reset(self):
+        """
+        Start a fresh course. Called once at the start of every evaluation.
+        Unseeded courses draw a new layout from the global random module, so
+        a seeded session replays them too.
+        """
+        self.rng.seed(self.seed if self.seed is not None else random.randrange(2**32))
+
+    @abstractmethod
+    def next_gap(self):
+        """Return the gap_y of the next pipe"""
+
+    def stage_cleared(self, pipes_cleared):
+        """Whether pipes_cleared is enough to end the generation and move to a harder course"""
+        return False
+
+    def end_generation(self, pipes_cleared):
+        """Called by trainers after each evaluation with the pipes the population cleared"""
+        pass
+
+    @property
+    def complete(self):
+        """False while the course is still easier than its final form"""
+        return True
+
+    def gaps(self, count):
+        """Return the next count gap positions as a list"""
+        return [self.next_gap() for _ in range(count)]
+
+    def create_pipes(self, count=VISIBLE_PIPES, first_x=FIRST_PIPE_X):
+        """Reset the course and build the opening row of pipes"""
+        self.reset()
+        return [Pipe(first_x + i * self.spacing, self.next_gap(), self.gap_size)
+                for i in range(count)]
+
+    def next_pipe(self, pipes):
+        """Build the pipe that follows the last one in pipes"""
+        return Pipe(pipes[-1].x + self.spacing, self.next_gap(), self.gap_size)
+
+class UniformCourse(CourseGenerator):
+    """Gaps drawn uniformly between min_gap_y (inclusive) and max_gap_y (exclusive)"""
+    def __init__(self, min_gap_y=MIN_GAP_Y, max_gap_y=MAX_GAP_Y, seed=None):
+        super().__init__(seed)
+        self.min_gap_y = min_gap_y
+        self.max_gap_y = max_gap_y
+
+    def next_gap(self):
+        return self.rng.randrange(self.min_gap_y, self.max_gap_y)
+
+class AlternatingExtremeCourse(CourseGenerator):
+    """
+    One random pipe, then gaps flipping between the top and bottom extremes.
+    The first extreme is picked at random.
+    """
+    def __init__(self, seed=None):
+        super().__init__(seed)
+        self.is_high = None
+
+    def reset(self):
+        super().reset()
+        self.is_high = None
+
+    def next_gap(self):
+        if self.is_high is None:
+            # First pipe is random, the next one picks a random extreme
+            self.is_high = self.rng.choice([True, False])
+            return self.rng.randint(HIGH_GAP_Y, LOW_GAP_Y)
+
+        gap_y = HIGH_GAP_Y if self.is_high else LOW_GAP_Y
+        self.is_high = not self.is_high
+        return gap_y
+
+class ReplayCourse(CourseGenerator):
+    """
+    Replays gap positions loaded from a file written by save_course().
+    Positions are stored as fractions of SCREEN_HEIGHT so a course recorded
+    on one display replays the same on another. The sequence loops when it
+    runs out.
+    """
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        with open(path, 'r') as f:
+            fractions = json.load(f)['gaps']
+        if not fractions:
+            raise ValueError(f"Course file {path} contains no gaps")
+        self.sequence = [int(round(fraction * SCREEN_HEIGHT)) for fraction in fractions]
+        self.index = 0
+
+    def reset(self):
+        self.index = 0
+
+    def next_gap(self):
+        gap_y = self.sequence[self.index % len(self.sequence)]
+        self.index += 1
+        return gap_y
+
+@dataclass
+class CurriculumStage:
+    """Course settings for one curriculum stage, relative to the base constants"""
+    gap_scale: float        # Gap size as a multiple of PIPE_GAP
+    spacing_scale: float    # Pipe spacing as a multiple of PIPE_SPACING
+    gap_spread: float       # Fraction of the playable range random gaps may use
+    extreme_prob: float     # Chance each pipe is an alternating extreme
+    advance_at: Optional[int] = None  # Pipes cleared in one generation to move on, None on the last stage
+
+# Wide, centred gaps first, ending on the alternating extreme course
+DEFAULT_STAGES = [
+    CurriculumStage(1.4, 1.3, 0.25, 0.0, advance_at=10),
+    CurriculumStage(1.25, 1.2, 0.5, 0.1, advance_at=15),
+    CurriculumStage(1.1, 1.1, 0.75, 0.3, advance_at=20),
+    CurriculumStage(1.0, 1.0, 1.0, 0.6, advance_at=25),
+    CurriculumStage(1.0, 1.0, 1.0, 1.0),
+]
+
+class CurriculumCourse(CourseGenerator):
+    """
+    Starts on an easy course and tightens gap size, spacing and extreme-gap
+    frequency each time the population clears a stage's advance_at pipes in
+    one generation. The last stage is the alternating extreme course.
+    """
+    def __init__(self, stages=None, seed=None):
+        super().__init__(seed)
+        self.stages = stages or DEFAULT_STAGES
+        self.last_extreme_high = None
+        self.set_stage(0)
+
+    @property
+    def stage(self):
+        return self.stages[self.stage_index]
+
+    @property
+    def complete(self):
+        return self.stage_index == len(self.stages) - 1
+
+    def set_stage(self, index):
+        self.stage_index = index
+        self.gap_size = int(PIPE_GAP * self.stage.gap_scale)
+        self.spacing = int(PIPE_SPACING * self.stage.spacing_scale)
+        print(f"Curriculum stage {index + 1}/{len(self.stages)}: "
+              f"gap {self.gap_size}px, spacing {self.spacing}px, "
+              f"spread {self.stage.gap_spread:.2f}, extreme {self.stage.extreme_prob:.2f}")
+
+    def reset(self):
+        super().reset()
+        self.last_extreme_high = None
+
+    def next_gap(self):
+        high_gap_y = HIGH_GAP_Y
+        low_gap_y = SCREEN_HEIGHT - self.gap_size - PIPE_BOTTOM_MARGIN
+
+        if self.rng.random() < self.stage.extreme_prob:
+            if self.last_extreme_high is None:
+                self.last_extreme_high = self.rng.choice([True, False])
+            else:
+                self.last_extreme_high = not self.last_extreme_high
+            return high_gap_y if self.last_extreme_high else low_gap_y
+
+        # Random gaps stay within gap_spread of the middle of the playable range
+        center = (high_gap_y + low_gap_y) / 2
+        half_range = (low_gap_y - high_gap_y) / 2 * self.stage.gap_spread
+        return self.rng.randint(int(center - half_range), int(center + half_range))
+
+    def stage_cleared(self, pipes_cleared):
+        advance_at = self.stage.advance_at
+        return not self.complete and advance_at is not None and pipes_cleared >= advance_at
+
+    def end_generation(self, pipes_cleared):
+        if self.stage_cleared(pipes_cleared):
+            print(f"Cleared {pipes_cleared} pipes, advancing curriculum")
+            self.set_stage(self.stage_index + 1)
+        else:
+            print(f"Curriculum stage {self.stage_index + 1}/{len(self.stages)}, "
+                  f"cleared {pipes_cleared} pipes")
+
+    def save_state(self, path):
+        with open(path, 'w') as f:
+            json.dump({'stage': self.stage_index}, f)
+
+    def load_state(self, path):
+        with open(path, 'r') as f:
+            self.set_stage(json.load(f)['stage'])
+
+# Curriculum state is written next to each NEAT checkpoint with this suffix
+CURRICULUM_SUFFIX = '.curriculum'
+
+def save_course(path, gaps):
+    """Write a list of gap_y values so ReplayCourse can fly it again"""
+    with open(path, 'w') as f:
+        json.dump({'gaps': [gap_y / SCREEN_HEIGHT for gap_y in gaps]}, f)
+
+COURSES = {
+    'uniform': UniformCourse,
+    'extreme': AlternatingExtremeCourse,
+    'curriculum': CurriculumCourse,
+}
+
+def get_course(name, **kwargs):
+    """Look up a course by name, or treat the name as a replay file path"""
+    if name in COURSES:
+        return COURSES[name](**kwargs)
+    return ReplayCourse(name)
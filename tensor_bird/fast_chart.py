@@ -6,11 +6,15 @@ from bird import Bird
 from pipe import Pipe
 from inputs import get_pipe_inputs
 from constants import *
-import random
-import json
+from results_store import ResultsStore, seed_session, run_seeds
 
-def run_training_session():
-    """Run a single training session and return generations needed to reach fitness"""
+def run_training_session(generation_stats=None):
+    """
+    Run a single training session and return generations needed to reach fitness.
+    Per-generation best fitness and pipes cleared are appended to generation_stats.
+    """
+    if generation_stats is None:
+        generation_stats = []
     config = neat.config.Config(
         neat.DefaultGenome,
         neat.DefaultReproduction,
@@ -32,6 +36,8 @@ def run_training_session():
             genome.fitness = 0
             
         # Evaluate current generation
+        gen_best = 0
+        pipes_cleared = 0
         birds = []
         nets = []
         ge = []
@@ -64,9 +70,12 @@ def run_training_session():
                     bird.jump()
                     
                 max_fitness_reached = max(max_fitness_reached, ge[x].fitness)
+                gen_best = max(gen_best, ge[x].fitness)
                 
                 # Check if we've reached target fitness
                 if ge[x].fitness >= 5000:
+                    generation_stats.append({'generation': generation, 'best_fitness': gen_best,
+                                             'pipes_cleared': pipes_cleared})
                     return generation, ge[x].fitness
             
             # Update pipes and check collisions
@@ -89,6 +98,7 @@ def run_training_session():
                         ge.pop(x)
                     elif not pipe.passed and birds[x].x > pipe.x + PIPE_WIDTH:
                         pipe.passed = True
+                        pipes_cleared += 1
                         ge[x].fitness += 5
                     x += 1
                     
@@ -97,6 +107,9 @@ def run_training_session():
                 pipes.pop(0)
                 pipes.append(Pipe(pipes[-1].x + PIPE_SPACING))
                 
+        generation_stats.append({'generation': generation, 'best_fitness': gen_best,
+                                 'pipes_cleared': pipes_cleared})
+        
         # Create next generation
         pop.population = pop.reproduction.reproduce(config, pop.species, pop.config.pop_size, generation)
         pop.species.speciate(config, pop.population, generation)
@@ -104,19 +117,30 @@ def run_training_session():
     return generation, max_fitness_reached
 
 def collect_training_data(num_sessions=50):
-    """Run multiple training sessions and collect data"""
+    """Run multiple training sessions and record each one in the results store"""
     results = []
-    for session in range(num_sessions):
-        print(f"Running session {session + 1}/{num_sessions}")
-        generations, fitness = run_training_session()
-        results.append({"generations": generations, "fitness": fitness})
-        
-    # Save results to file
-    with open('training_results.json', 'w') as f:
-        json.dump(results, f)
+    with ResultsStore() as store:
+        for session in range(num_sessions):
+            print(f"Running session {session + 1}/{num_sessions}")
+            
+            # Seed every session so any run in the store can be replayed
+            seed = seed_session()
+            
+            generation_stats = []
+            generations, fitness = run_training_session(generation_stats)
+            results.append({"generations": generations, "fitness": fitness})
+            
+            store.record_run(
+                'fast_chart',
+                generations=generations,
+                max_fitness=fitness,
+                target_reached=fitness >= 5000,
+                seeds=run_seeds(seed),
+                generation_stats=generation_stats
+            )
     
     return results
 
 if __name__ == "__main__":
     results = collect_training_data()
-    print("\nTraining complete! Results saved to training_results.json")
\ No newline at end of file
+    print("\nTraining complete! Results saved to the results store")
\ No newline at end of file
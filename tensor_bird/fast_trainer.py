@@ -3,8 +3,9 @@ import sys
 import os
 from datetime import datetime
 from bird import Bird
-from pipe import Pipe
+from course import UniformCourse, CurriculumCourse, CURRICULUM_SUFFIX, get_course
 from inputs import get_pipe_inputs
+from results_store import ResultsStore, config_params, seed_session, run_seeds
 from constants import *
 
 class DebugStats:
@@ -19,14 +20,16 @@ class DebugStats:
     def reset(self):
         self.__init__()
 
-def save_checkpoint(config, population, species, generation):
-    """Save the current population as a checkpoint file"""
+def save_checkpoint(config, population, species, generation, course=None):
+    """Save the current population, and the curriculum stage if any, as checkpoint files"""
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     filename = f'neat-checkpoint-{generation}-{timestamp}'
     
     # Create a Checkpointer instance
     checkpointer = neat.Checkpointer(generation_interval=1, filename_prefix=filename)
     checkpointer.save_checkpoint(config, population, species, generation)
+    if isinstance(course, CurriculumCourse):
+        course.save_state(f"{filename}{generation}{CURRICULUM_SUFFIX}")
     
     # Find the best performing genome
     best_genome = None
@@ -44,7 +47,21 @@ def save_checkpoint(config, population, species, generation):
     print(f"\nCheckpoint saved as: {filename}")
     return filename
 
-def fast_eval_genomes(genomes, config):
+def record_generation_stats(generation_stats, genomes, stats):
+    """Append this evaluation's fitness summary in the results store's format"""
+    fitnesses = [genome.fitness for _, genome in genomes]
+    generation_stats.append({
+        'generation': len(generation_stats),
+        'best_fitness': max(fitnesses),
+        'mean_fitness': sum(fitnesses) / len(fitnesses),
+        'pipes_cleared': stats.pipes_cleared,
+    })
+
+def fast_eval_genomes(genomes, config, course=None, generation_stats=None):
+    if generation_stats is None:
+        generation_stats = []
+    if course is None:
+        course = UniformCourse()
     birds = []
     nets = []
     ge = []
@@ -64,7 +81,7 @@ def fast_eval_genomes(genomes, config):
         ge.append(genome)
         stats.current_fitnesses.append(0)
     
-    pipes = [Pipe(FIRST_PIPE_X + i * PIPE_SPACING) for i in range(VISIBLE_PIPES)]
+    pipes = course.create_pipes()
     
     print("\nInitial state:")
     print(f"Birds: {len(birds)}")
@@ -79,11 +96,19 @@ def fast_eval_genomes(genomes, config):
             print(f"Best fitness: {max(stats.current_fitnesses) if stats.current_fitnesses else 0}")
             print(f"Pipes cleared: {stats.pipes_cleared}")
         
+        # Curriculum stage mastered, end the generation so it can advance
+        if course.stage_cleared(stats.pipes_cleared):
+            break
+        
         # Check if any bird has reached the fitness threshold
         current_best_fitness = max(stats.current_fitnesses)
         if current_best_fitness >= FITNESS_THRESHOLD:
+            if not course.complete:
+                # Only the final course counts as reaching the target
+                break
             print(f"\nFitness threshold {FITNESS_THRESHOLD} reached!")
             print(f"Final fitness: {current_best_fitness}")
+            record_generation_stats(generation_stats, genomes, stats)
             return True  # Signal to stop evolution
         
         pipe_ind = 0
@@ -124,7 +149,7 @@ def fast_eval_genomes(genomes, config):
                     birds[x].x < pipe.x + PIPE_WIDTH and
                     birds[x].x + birds[x].width > pipe.x and
                     (birds[x].y < pipe.gap_y or
-                     birds[x].y + birds[x].height > pipe.gap_y + PIPE_GAP)
+                     birds[x].y + birds[x].height > pipe.gap_y + pipe.gap_size)
                 )
                 
                 if collision:
@@ -141,11 +166,27 @@ def fast_eval_genomes(genomes, config):
         
         while len(pipes) > 0 and pipes[0].x < -PIPE_WIDTH:
             pipes.pop(0)
-            pipes.append(Pipe(pipes[-1].x + PIPE_SPACING))
+            pipes.append(course.next_pipe(pipes))
     
+    course.end_generation(stats.pipes_cleared)
+    record_generation_stats(generation_stats, genomes, stats)
     return False  # Signal to continue evolution
 
-def run_fast_training(config_path, generations=50):
+def record_training_run(config, course, generation_stats, target_reached, session_seed=None):
+    """Write the whole session to the results store in one transaction"""
+    with ResultsStore() as store:
+        store.record_run(
+            'fast_trainer',
+            params=config_params(config, course),
+            generations=len(generation_stats),
+            max_fitness=max((stat['best_fitness'] for stat in generation_stats), default=None),
+            target_reached=target_reached,
+            seeds=run_seeds(session_seed, course),
+            generation_stats=generation_stats
+        )
+
+def run_fast_training(config_path, generations=50, course=None):
+    session_seed = seed_session()
     config = neat.config.Config(
         neat.DefaultGenome,
         neat.DefaultReproduction,
@@ -160,6 +201,7 @@ def run_fast_training(config_path, generations=50):
     pop.add_reporter(stats)
     
     # Custom evaluation loop to handle fitness threshold
+    generation_stats = []
     generation = 0
     while generation < generations:
         print(f"\n===== Generation {generation} =====")
@@ -169,11 +211,14 @@ def run_fast_training(config_path, generations=50):
         for _, genome in pop.population.items():
             genome.fitness = 0
         
-        fitness_threshold_reached = fast_eval_genomes(list(pop.population.items()), config)
+        fitness_threshold_reached = fast_eval_genomes(list(pop.population.items()), config, course,
+                                                      generation_stats)
         
         if fitness_threshold_reached:
+            record_training_run(config, course, generation_stats, True, session_seed)
+            
             # Save checkpoint before exiting
-            checkpoint_file = save_checkpoint(config, pop, pop.species, generation)
+            checkpoint_file = save_checkpoint(config, pop, pop.species, generation, course)
             print(f"\nFitness threshold reached! Checkpoint saved.")
             print(f"You can now load this bird using:")
             print(f"python main.py -load {checkpoint_file}")
@@ -183,8 +228,13 @@ def run_fast_training(config_path, generations=50):
         pop.population = pop.reproduction.reproduce(config, pop.species, pop.config.pop_size, generation)
         pop.species.speciate(config, pop.population, generation)
         generation += 1
+    
+    record_training_run(config, course, generation_stats, False, session_seed)
 
 if __name__ == "__main__":
     local_dir = os.path.dirname(__file__)
     config_path = os.path.join(local_dir, "config-feedforward.txt")
-    run_fast_training(config_path)
\ No newline at end of file
+    
+    # Optional course: a built-in name ('uniform', 'extreme', 'curriculum') or a saved course file
+    course = get_course(sys.argv[1]) if len(sys.argv) > 1 else None
+    run_fast_training(config_path, course=course)
\ No newline at end of file
@@ -2,8 +2,6 @@ import pygame
 import neat
 import os
 import sys
-import csv
-from datetime import datetime
 from itertools import product
 import numpy as np
 from constants import *
@@ -13,6 +11,7 @@ from background import Background
 from game_utils import check_collision, draw_game
 from death_marker import DeathMarker
 from inputs import get_pipe_inputs
+from results_store import ResultsStore, seed_session, run_seeds
 
 class HyperparameterTest:
     def __init__(self):
@@ -32,22 +31,8 @@ class HyperparameterTest:
             'bias_mutate_power': np.arange(0.05, 0.2, 0.05)   # 4 values
         }
         
-        self.timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        self.results_file = f'bias_param_results_{self.timestamp}.csv'
-        self.setup_results_file()
-
-    def setup_results_file(self):
-        headers = [
-            'bias_init_stdev', 
-            'bias_range',      # Single column for range since min/max are linked
-            'bias_mutate_power',
-            'generations_to_target',
-            'max_fitness_achieved',
-            'timestamp'
-        ]
-        with open(self.results_file, 'w', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow(headers)
+        self.store = ResultsStore()
+        self.generation_stats = []
 
     def test_parameter_set(self, params):
         config_path = os.path.join(os.path.dirname(__file__), "config-feedforward.txt")
@@ -72,6 +57,7 @@ class HyperparameterTest:
         pop.species.speciate(config, pop.population, 0)
         
         best_fitness = 0
+        self.generation_stats = []
         for generation in range(self.max_generations):
             gen_best = 0
             for _, genome in pop.population.items():
@@ -79,6 +65,7 @@ class HyperparameterTest:
             
             fitness, target_reached = self.eval_genomes(list(pop.population.items()), config)
             best_fitness = max(best_fitness, fitness)
+            self.generation_stats.append({'generation': generation, 'best_fitness': fitness})
             
             if target_reached:
                 return generation + 1, best_fitness
@@ -210,17 +197,22 @@ class HyperparameterTest:
                 print(f"\nTesting combination {current_test}/{total_combinations}")
                 print("Parameters:", param_dict)
                 
+                session_seed = seed_session()
                 generations, max_fitness = self.test_parameter_set(param_dict)
                 
                 if self.update_best_performance(generations, max_fitness, param_dict):
                     print("\n🌟 NEW BEST PERFORMANCE! 🌟")
                     self.print_best_performance()
                 
-                result = list(params) + [generations, max_fitness, datetime.now().strftime('%Y-%m-%d %H:%M:%S')]
-                
-                with open(self.results_file, 'a', newline='') as f:
-                    writer = csv.writer(f)
-                    writer.writerow(result)
+                self.store.record_run(
+                    'hyper_tester',
+                    params=param_dict,
+                    generations=generations,
+                    max_fitness=max_fitness,
+                    target_reached=max_fitness >= self.target_fitness,
+                    seeds=run_seeds(session_seed),
+                    generation_stats=self.generation_stats
+                )
                 
                 print(f"Generations to target: {generations}")
                 print(f"Max fitness achieved: {max_fitness:.2f}")
@@ -233,6 +225,7 @@ class HyperparameterTest:
             print(f"\nError during testing: {str(e)}")
             raise
         finally:
+            self.store.close()
             pygame.quit()
 
 if __name__ == "__main__":
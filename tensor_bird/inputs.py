@@ -1,8 +1,7 @@
 from constants import (
     SCREEN_WIDTH,
     SCREEN_HEIGHT,
-    PIPE_WIDTH,
-    PIPE_GAP
+    PIPE_WIDTH
 )
 
 def get_pipe_inputs(bird, current_pipe, next_pipe=None):
@@ -23,7 +22,7 @@ def get_pipe_inputs(bird, current_pipe, next_pipe=None):
         )
     """
     # Calculate center points of pipe gaps
-    current_gap_center = current_pipe.gap_y + (PIPE_GAP / 2)
+    current_gap_center = current_pipe.gap_y + (current_pipe.gap_size / 2)
     
     inputs = [
         bird.y / SCREEN_HEIGHT,  # Bird height
@@ -32,7 +31,7 @@ def get_pipe_inputs(bird, current_pipe, next_pipe=None):
     ]
     
     if next_pipe:
-        next_gap_center = next_pipe.gap_y + (PIPE_GAP / 2)
+        next_gap_center = next_pipe.gap_y + (next_pipe.gap_size / 2)
         inputs.append((bird.y - next_gap_center) / SCREEN_HEIGHT)  # Distance to next pipe gap center
     
     return tuple(inputs)
\ No newline at end of file
@@ -2,15 +2,68 @@ import pygame
 import neat
 import os
 import sys
+from functools import partial
 from constants import *
 from bird import Bird
-from pipe import Pipe 
+from course import UniformCourse, CurriculumCourse, CURRICULUM_SUFFIX, get_course
 from background import Background
 from game_utils import check_collision, draw_game
 from death_marker import DeathMarker
 from inputs import get_pipe_inputs
+from results_store import ResultsStore, config_params, seed_session, run_seeds
 
-def eval_genomes(genomes, config):
+class CurriculumCheckpointer(neat.Checkpointer):
+    """Checkpointer that also saves the curriculum stage next to each checkpoint"""
+    def __init__(self, course, generation_interval, filename_prefix):
+        super().__init__(generation_interval, filename_prefix=filename_prefix)
+        self.course = course
+        
+    def save_checkpoint(self, config, population, species_set, generation):
+        super().save_checkpoint(config, population, species_set, generation)
+        self.course.save_state(f"{self.filename_prefix}{generation}{CURRICULUM_SUFFIX}")
+
+class ResultsReporter(neat.reporting.BaseReporter):
+    """Collects per-generation stats and writes the session to the results store in one go"""
+    def __init__(self, source, params, seeds=None):
+        self.source = source
+        self.params = params
+        self.seeds = seeds
+        self.generation = 0
+        self.generation_stats = []
+        self.target_reached = False
+        
+    def start_generation(self, generation):
+        self.generation = generation
+        
+    def post_evaluate(self, config, population, species, best_genome):
+        fitnesses = [genome.fitness for genome in population.values()]
+        self.generation_stats.append({
+            'generation': self.generation,
+            'best_fitness': best_genome.fitness,
+            'mean_fitness': sum(fitnesses) / len(fitnesses),
+        })
+        
+    def found_solution(self, config, generation, best):
+        self.target_reached = True
+        
+    def flush(self):
+        if not self.generation_stats:
+            return
+        with ResultsStore() as store:
+            store.record_run(
+                self.source,
+                params=self.params,
+                generations=len(self.generation_stats),
+                max_fitness=max(stat['best_fitness'] for stat in self.generation_stats),
+                target_reached=self.target_reached,
+                seeds=self.seeds,
+                generation_stats=self.generation_stats
+            )
+        self.generation_stats = []
+
+def eval_genomes(genomes, config, course=None, pass_reward=5):
+    if course is None:
+        course = UniformCourse()
     try:
         birds = []
         nets = []
@@ -27,7 +80,7 @@ def eval_genomes(genomes, config):
             ge.append(genome)
         
         background = Background(SCREEN_WIDTH, SCREEN_HEIGHT)
-        pipes = [Pipe(FIRST_PIPE_X + i * PIPE_SPACING) for i in range(VISIBLE_PIPES)]
+        pipes = course.create_pipes()
         score = 0
         clock = pygame.time.Clock()
         
@@ -108,21 +161,28 @@ def eval_genomes(genomes, config):
                     elif not pipe.passed and birds[x].x > pipe.x + PIPE_WIDTH:
                         pipe.passed = True
                         score += 1
-                        ge[x].fitness += 5
+                        ge[x].fitness += pass_reward
                     x += 1
             
             while len(pipes) > 0 and pipes[0].x < -PIPE_WIDTH:
                 pipes.pop(0)
-                pipes.append(Pipe(pipes[-1].x + PIPE_SPACING))
+                pipes.append(course.next_pipe(pipes))
             
             draw_game(SCREEN, background, pipes, birds, score, death_markers)
+            
+            # Curriculum stage mastered, end the generation so it can advance
+            if course.stage_cleared(score):
+                break
         
+        course.end_generation(score)
         return best_genome
         
     except pygame.error:
         sys.exit()
 
-def run_neat(config_path, checkpoint_file=None):
+def run_neat(config_path, checkpoint_file=None, course=None, pass_reward=5,
+             checkpoint_prefix='neat-checkpoint-'):
+    results = None
     try:
         config = neat.config.Config(
             neat.DefaultGenome,
@@ -143,29 +203,45 @@ def run_neat(config_path, checkpoint_file=None):
                 all_members.update(species.members)
             pop.population = all_members
             
+            # The checkpoint restores its own random state
+            session_seed = None
+            
         else:
             if checkpoint_file:
                 print(f"Checkpoint file {checkpoint_file} not found. Starting fresh.")
+            session_seed = seed_session()
             pop = neat.Population(config)
             start_gen = 0
         
         pop.add_reporter(neat.StdOutReporter(True))
         stats = neat.StatisticsReporter()
         pop.add_reporter(stats)
-        checkpointer = neat.Checkpointer(5, filename_prefix='neat-checkpoint-')
+        if isinstance(course, CurriculumCourse):
+            checkpointer = CurriculumCheckpointer(course, 5, filename_prefix=checkpoint_prefix)
+            curriculum_file = f"{checkpoint_file}{CURRICULUM_SUFFIX}"
+            if checkpoint_file and os.path.exists(curriculum_file):
+                course.load_state(curriculum_file)
+        else:
+            checkpointer = neat.Checkpointer(5, filename_prefix=checkpoint_prefix)
         pop.add_reporter(checkpointer)
+        results = ResultsReporter('main', config_params(config, course), run_seeds(session_seed, course))
+        pop.add_reporter(results)
         
         remaining_gens = 50 - start_gen
-        winner = pop.run(eval_genomes, remaining_gens)
+        winner = pop.run(partial(eval_genomes, course=course, pass_reward=pass_reward),
+                         remaining_gens)
         print('\nBest genome:\n{!s}'.format(winner))
         
     except KeyboardInterrupt:
         print("\nSaving checkpoint before exiting...")
         current_gen = pop.generation
         checkpointer.save_checkpoint(config, pop, pop.species, current_gen)
-        print(f"Checkpoint saved as neat-checkpoint-{current_gen}")
+        print(f"Checkpoint saved as {checkpoint_prefix}{current_gen}")
     except SystemExit:
         print("\nTraining terminated")
+    finally:
+        if results is not None:
+            results.flush()
 
 if __name__ == "__main__":
     pygame.init()
@@ -175,7 +251,14 @@ if __name__ == "__main__":
     
     # Parse command line arguments
     checkpoint_file = None
-    if len(sys.argv) > 2 and sys.argv[1] == '-load':
-        checkpoint_file = sys.argv[2]
+    course = None
+    args = sys.argv[1:]
+    while len(args) > 1:
+        if args[0] == '-load':
+            checkpoint_file = args[1]
+        elif args[0] == '-course':
+            # A built-in course name ('uniform', 'extreme', 'curriculum') or a saved course file
+            course = get_course(args[1])
+        args = args[2:]
     
-    run_neat(config_path, checkpoint_file)
\ No newline at end of file
+    run_neat(config_path, checkpoint_file, course)
\ No newline at end of file
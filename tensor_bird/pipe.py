@@ -3,46 +3,69 @@ import pygame
 import random
 from constants import SCREEN_HEIGHT, PIPE_WIDTH, PIPE_GAP, PIPE_VELOCITY
 
+# Leave room for at least 100px of pipe at top and bottom
+MIN_GAP_Y = 100
+MAX_GAP_Y = SCREEN_HEIGHT - PIPE_GAP - 100
+
 class Pipe:
-    def __init__(self, x):
-        self.UP_PIPE_IMG = pygame.image.load('art/purple_pipe.png')
-        self.DOWN_PIPE_IMG = pygame.image.load('art/purple_pipe.png')
-        
-        # Calculate scale based on aspect ratio
-        up_pipe_aspect_ratio = self.UP_PIPE_IMG.get_height() / self.UP_PIPE_IMG.get_width()
-        down_pipe_aspect_ratio = self.DOWN_PIPE_IMG.get_height() / self.DOWN_PIPE_IMG.get_width()
-        
-        self.UP_PIPE_IMG = pygame.transform.scale(self.UP_PIPE_IMG, 
-                                       (PIPE_WIDTH, int(PIPE_WIDTH * up_pipe_aspect_ratio)))
-        self.DOWN_PIPE_IMG = pygame.transform.scale(self.DOWN_PIPE_IMG, 
-                                         (PIPE_WIDTH, int(PIPE_WIDTH * down_pipe_aspect_ratio)))
-        
+    # Scaled sprites are shared by every pipe and only loaded on first draw,
+    # so headless trainers never touch the image files
+    _images = None
+
+    def __init__(self, x, gap_y=None, gap_size=PIPE_GAP):
         self.x = x
-        
-        # First, determine where the gap should be
-        # Leave room for at least 100px of pipe at top and bottom
-        min_gap_y = 100
-        max_gap_y = SCREEN_HEIGHT - PIPE_GAP - 100
-        
+        self.gap_size = gap_size
+
         # This is the Y coordinate where the gap starts
-        self.gap_y = random.randrange(min_gap_y, max_gap_y)
-        
+        if gap_y is None:
+            gap_y = random.randrange(MIN_GAP_Y, SCREEN_HEIGHT - gap_size - 100)
+        self.gap_y = gap_y
+
         # Now calculate positions for both pipes
-        self.top_y = self.gap_y - self.DOWN_PIPE_IMG.get_height()
-        self.bottom_y = self.gap_y + PIPE_GAP
+        self.bottom_y = self.gap_y + self.gap_size
         self.height = self.gap_y  # For collision detection
         self.passed = False
-        
+
         # Create collision rectangles
         self.top_rect = pygame.Rect(self.x, 0, PIPE_WIDTH, self.gap_y)
-        self.bottom_rect = pygame.Rect(self.x, self.bottom_y, PIPE_WIDTH, 
+        self.bottom_rect = pygame.Rect(self.x, self.bottom_y, PIPE_WIDTH,
                                      SCREEN_HEIGHT - self.bottom_y)
-        
+
+    @classmethod
+    def load_images(cls):
+        """Load and scale the pipe sprites once, returning (up, down) images"""
+        if cls._images is None:
+            up_pipe_img = pygame.image.load('art/purple_pipe.png')
+            down_pipe_img = pygame.image.load('art/purple_pipe.png')
+
+            # Calculate scale based on aspect ratio
+            up_pipe_aspect_ratio = up_pipe_img.get_height() / up_pipe_img.get_width()
+            down_pipe_aspect_ratio = down_pipe_img.get_height() / down_pipe_img.get_width()
+
+            up_pipe_img = pygame.transform.scale(up_pipe_img,
+                                       (PIPE_WIDTH, int(PIPE_WIDTH * up_pipe_aspect_ratio)))
+            down_pipe_img = pygame.transform.scale(down_pipe_img,
+                                         (PIPE_WIDTH, int(PIPE_WIDTH * down_pipe_aspect_ratio)))
+            cls._images = (up_pipe_img, down_pipe_img)
+        return cls._images
+
+    @property
+    def UP_PIPE_IMG(self):
+        return self.load_images()[0]
+
+    @property
+    def DOWN_PIPE_IMG(self):
+        return self.load_images()[1]
+
+    @property
+    def top_y(self):
+        return self.gap_y - self.DOWN_PIPE_IMG.get_height()
+
     def move(self):
         self.x -= PIPE_VELOCITY
         self.top_rect.x = self.x
         self.bottom_rect.x = self.x
-        
+
     def draw(self, screen):
         screen.blit(self.DOWN_PIPE_IMG, (self.x, self.top_y))
-        screen.blit(self.UP_PIPE_IMG, (self.x, self.bottom_y))
\ No newline at end of file
+        screen.blit(self.UP_PIPE_IMG, (self.x, self.bottom_y))
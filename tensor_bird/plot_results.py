@@ -1,14 +1,16 @@
-import json
 import matplotlib.pyplot as plt
 import numpy as np
+from results_store import ResultsStore
 
-def plot_training_results():
-    # Load the results
-    with open('training_results.json', 'r') as f:
-        results = json.load(f)
-    
-    # Extract generations data
-    generations = [r['generations'] for r in results]
+def plot_training_results(source='fast_chart'):
+    # Load only the generations column for this source from the results store.
+    # Older training_results.json files can be added with
+    # "python results_store.py import training_results.json"
+    with ResultsStore() as store:
+        generations = store.generations_for(source)
+    if not generations:
+        print(f"No '{source}' runs in the results store")
+        return
     
     # Calculate statistics
     avg_generations = np.mean(generations)
@@ -0,0 +1,303 @@
+# results_store.py
+import csv
+import json
+import os
+import random
+import sqlite3
+import statistics
+import sys
+from datetime import datetime
+
+DEFAULT_DB_PATH = 'results.sqlite'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS param_sets (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS param_values (
+    param_set_id INTEGER NOT NULL REFERENCES param_sets(id),
+    name TEXT NOT NULL,
+    value,
+    PRIMARY KEY (param_set_id, name)
+);
+CREATE INDEX IF NOT EXISTS param_values_by_name ON param_values(name, value);
+
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    param_set_id INTEGER REFERENCES param_sets(id),
+    started_at TEXT NOT NULL,
+    generations INTEGER,
+    max_fitness REAL,
+    target_reached INTEGER
+);
+CREATE INDEX IF NOT EXISTS runs_by_source ON runs(source, generations);
+CREATE INDEX IF NOT EXISTS runs_by_params ON runs(param_set_id, generations);
+
+CREATE TABLE IF NOT EXISTS generation_stats (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    generation INTEGER NOT NULL,
+    best_fitness REAL,
+    mean_fitness REAL,
+    pipes_cleared INTEGER,
+    PRIMARY KEY (run_id, generation)
+);
+
+CREATE TABLE IF NOT EXISTS seeds (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    name TEXT NOT NULL,
+    value INTEGER NOT NULL,
+    PRIMARY KEY (run_id, name)
+);
+CREATE INDEX IF NOT EXISTS seeds_by_value ON seeds(name, value);
+"""
+
+class _Median:
+    """SQLite aggregate so queries can rank parameter sets by median"""
+    def __init__(self):
+        self.values = []
+
+    def step(self, value):
+        if value is not None:
+            self.values.append(value)
+
+    def finalize(self):
+        return statistics.median(self.values) if self.values else None
+
+def _param_key(params):
+    return json.dumps(params, sort_keys=True)
+
+def _clean(value):
+    # numpy scalars from hyper_tester's parameter grids are stored as plain numbers
+    return value.item() if hasattr(value, 'item') else value
+
+def config_params(config, course=None):
+    """The NEAT settings, and course if any, a trainer run is filed under"""
+    genome_config = config.genome_config
+    params = {
+        'pop_size': config.pop_size,
+        'bias_init_stdev': genome_config.bias_init_stdev,
+        'bias_range': genome_config.bias_max_value,
+        'bias_mutate_power': genome_config.bias_mutate_power,
+    }
+    if course is not None:
+        params['course'] = type(course).__name__
+    return params
+
+def seed_session():
+    """Seed the global random module with a fresh seed and return it, so the run can be replayed"""
+    seed = random.randrange(2**32)
+    random.seed(seed)
+    return seed
+
+def run_seeds(session_seed=None, course=None):
+    """The seeds a run is filed under, leaving out any that weren't set"""
+    seeds = {'session': session_seed, 'course': getattr(course, 'seed', None)}
+    return {name: seed for name, seed in seeds.items() if seed is not None}
+
+class ResultsStore:
+    """
+    Local SQLite store shared by the trainers, hyper_tester.py and fast_chart.py.
+
+    Every record_run() call writes a run with its parameters, seeds and
+    per-generation stats in a single transaction.
+    """
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        # WAL lets a plotting script read while a trainer is writing
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.create_aggregate('median', 1, _Median)
+        with self.conn:
+            self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _param_set_id(self, params):
+        params = {name: _clean(value) for name, value in params.items()}
+        key = _param_key(params)
+        row = self.conn.execute('SELECT id FROM param_sets WHERE key = ?', (key,)).fetchone()
+        if row:
+            return row['id']
+        param_set_id = self.conn.execute('INSERT INTO param_sets (key) VALUES (?)', (key,)).lastrowid
+        self.conn.executemany(
+            'INSERT INTO param_values (param_set_id, name, value) VALUES (?, ?, ?)',
+            [(param_set_id, name, value) for name, value in params.items()]
+        )
+        return param_set_id
+
+    def _insert_run(self, run):
+        param_set_id = self._param_set_id(run.get('params', {}))
+        run_id = self.conn.execute(
+            'INSERT INTO runs (source, param_set_id, started_at, generations, max_fitness, target_reached) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            (run['source'], param_set_id,
+             run.get('started_at') or datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+             run.get('generations'), run.get('max_fitness'),
+             None if run.get('target_reached') is None else int(run['target_reached']))
+        ).lastrowid
+        self.conn.executemany(
+            'INSERT INTO generation_stats (run_id, generation, best_fitness, mean_fitness, pipes_cleared) '
+            'VALUES (?, ?, ?, ?, ?)',
+            [(run_id, stat['generation'], stat.get('best_fitness'), stat.get('mean_fitness'),
+              stat.get('pipes_cleared')) for stat in run.get('generation_stats', [])]
+        )
+        self.conn.executemany(
+            'INSERT INTO seeds (run_id, name, value) VALUES (?, ?, ?)',
+            [(run_id, name, value) for name, value in run.get('seeds', {}).items()]
+        )
+        return run_id
+
+    def record_runs(self, runs):
+        """
+        Write many runs in one transaction.
+
+        Each run is a dict with 'source' and optionally 'params', 'started_at',
+        'generations', 'max_fitness', 'target_reached', 'seeds' (name -> int)
+        and 'generation_stats' (list of dicts keyed like the table columns).
+        Returns the new run ids.
+        """
+        with self.conn:
+            return [self._insert_run(run) for run in runs]
+
+    def record_run(self, source, params=None, generations=None, max_fitness=None,
+                   target_reached=None, seeds=None, generation_stats=None):
+        """Write a single run in one transaction and return its id"""
+        return self.record_runs([{
+            'source': source,
+            'params': params or {},
+            'generations': generations,
+            'max_fitness': max_fitness,
+            'target_reached': target_reached,
+            'seeds': seeds or {},
+            'generation_stats': generation_stats or [],
+        }])[0]
+
+    def run_params(self, run_id):
+        rows = self.conn.execute(
+            'SELECT pv.name, pv.value FROM runs r '
+            'JOIN param_values pv ON pv.param_set_id = r.param_set_id WHERE r.id = ?',
+            (run_id,)
+        )
+        return {row['name']: row['value'] for row in rows}
+
+    def best_params_by_median_generations(self, source=None, min_runs=1, limit=10):
+        """Parameter sets ranked by the median generations their runs needed"""
+        query = ('SELECT param_set_id, median(generations) AS median_generations, '
+                 'COUNT(*) AS runs, MAX(max_fitness) AS max_fitness FROM runs '
+                 'WHERE generations IS NOT NULL')
+        args = []
+        if source:
+            query += ' AND source = ?'
+            args.append(source)
+        query += (' GROUP BY param_set_id HAVING COUNT(*) >= ? '
+                  'ORDER BY median_generations ASC, max_fitness DESC LIMIT ?')
+        args += [min_runs, limit]
+
+        results = []
+        for row in self.conn.execute(query, args).fetchall():
+            params = self.conn.execute(
+                'SELECT name, value FROM param_values WHERE param_set_id = ?',
+                (row['param_set_id'],)
+            )
+            results.append({
+                'params': {p['name']: p['value'] for p in params},
+                'median_generations': row['median_generations'],
+                'runs': row['runs'],
+                'max_fitness': row['max_fitness'],
+            })
+        return results
+
+    def runs_with_param(self, name, op, value, source=None):
+        """All runs whose parameter name compares to value, e.g. ('bias_range', '>=', 5)"""
+        if op not in ('=', '!=', '<', '<=', '>', '>='):
+            raise ValueError(f"Unsupported comparison: {op}")
+        query = ('SELECT r.* FROM param_values pv JOIN runs r ON r.param_set_id = pv.param_set_id '
+                 f'WHERE pv.name = ? AND pv.value {op} ?')
+        args = [name, value]
+        if source:
+            query += ' AND r.source = ?'
+            args.append(source)
+        return [dict(row) for row in self.conn.execute(query, args)]
+
+    def generations_for(self, source):
+        """Generations needed by every run from source, e.g. for a histogram"""
+        rows = self.conn.execute(
+            'SELECT generations FROM runs WHERE source = ? AND generations IS NOT NULL', (source,)
+        )
+        return [row['generations'] for row in rows]
+
+    def import_param_csv(self, path, source='hyper_tester'):
+        """Import a bias_param_results_*.csv written by older hyper_tester runs"""
+        runs = []
+        with open(path, 'r', newline='') as f:
+            for row in csv.DictReader(f):
+                generations = row.pop('generations_to_target')
+                max_fitness = row.pop('max_fitness_achieved')
+                started_at = row.pop('timestamp', None)
+                runs.append({
+                    'source': source,
+                    'params': {name: float(value) for name, value in row.items()},
+                    'started_at': started_at,
+                    'generations': int(generations),
+                    'max_fitness': float(max_fitness),
+                })
+        return self.record_runs(runs)
+
+    def import_training_json(self, path, source='fast_chart'):
+        """Import a training_results.json written by older fast_chart runs"""
+        with open(path, 'r') as f:
+            results = json.load(f)
+        started_at = datetime.fromtimestamp(os.path.getmtime(path)).strftime('%Y-%m-%d %H:%M:%S')
+        return self.record_runs([{
+            'source': source,
+            'started_at': started_at,
+            'generations': result['generations'],
+            'max_fitness': result['fitness'],
+        } for result in results])
+
+def import_files(store, paths):
+    """Import legacy result files, picking the importer from the extension"""
+    for path in paths:
+        if path.endswith('.csv'):
+            ids = store.import_param_csv(path)
+        elif path.endswith('.json'):
+            ids = store.import_training_json(path)
+        else:
+            print(f"Skipping {path}: unknown result file type")
+            continue
+        print(f"Imported {len(ids)} runs from {path}")
+
+if __name__ == "__main__":
+    # python results_store.py import bias_param_results_*.csv training_results.json
+    # python results_store.py best [source]
+    # python results_store.py where bias_range '>=' 5
+    if len(sys.argv) < 2:
+        print("Usage: results_store.py import FILES... | best [SOURCE] | where NAME OP VALUE")
+        sys.exit(1)
+
+    with ResultsStore() as store:
+        command = sys.argv[1]
+        if command == 'import':
+            import_files(store, sys.argv[2:])
+        elif command == 'best':
+            source = sys.argv[2] if len(sys.argv) > 2 else None
+            for result in store.best_params_by_median_generations(source):
+                print(f"{result['median_generations']:>6} gens over {result['runs']} runs: {result['params']}")
+        elif command == 'where':
+            name, op, value = sys.argv[2:5]
+            for run in store.runs_with_param(name, op, float(value)):
+                print(run)
+        else:
+            print(f"Unknown command: {command}")
+            sys.exit(1)